@@ -0,0 +1,354 @@
+# backend/app/ai_assessment.py
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from . import globals as app_globals
+from .feedback_cache import feedback_cache
+from .llm_admission import (
+    llm_admission, estimate_tokens, LLMOverloadedError, PRIORITY_ANSWER_FEEDBACK, PRIORITY_FINAL_ASSESSMENT,
+    PRIORITY_BATCH_FEEDBACK, FEEDBACK_OUTPUT_TOKENS_ESTIMATE, ASSESSMENT_OUTPUT_TOKENS_ESTIMATE
+)
+from .json_repair import IncrementalJSONExtractor, parse_extracted_object, parse_json_object_lenient
+from .llm_providers import LLMBlockedError, LLMProviderError
+from .models import AnswerWithFeedback, InterviewInDB, OverallAssessment, StrengthWeaknessDetail
+from .transcript import render_transcript
+
+
+# Bump whenever the per-answer prompt changes so cached feedback is not reused.
+ANSWER_FEEDBACK_PROMPT_VERSION = "v1"
+
+FEEDBACK_ERROR_TEXT = "Lỗi khi AI xử lý câu trả lời này."
+
+
+def build_answer_feedback_prompt(question_text: str, answer_text: str) -> str:
+    return f"""Phân tích câu trả lời phỏng vấn sau đây một cách ngắn gọn (1-2 câu), tập trung vào sự rõ ràng và liên quan đến câu hỏi:
+Câu hỏi: "{question_text}"
+Câu trả lời của ứng viên: "{answer_text}"
+Nhận xét của bạn:"""
+
+
+async def generate_answer_feedback(question_id: Any, question_text: str, answer_text: str) -> str:
+    if not app_globals.llm_router:
+        print("WARNING: LLM provider not available for individual feedback.")
+        return "Phản hồi từ AI hiện không khả dụng."
+
+    cache_key = feedback_cache.make_key(question_id, question_text, answer_text, ANSWER_FEEDBACK_PROMPT_VERSION)
+    cached_feedback = await feedback_cache.get(cache_key)
+    if cached_feedback is not None:
+        return cached_feedback
+
+    try:
+        prompt_for_individual_feedback = build_answer_feedback_prompt(question_text, answer_text)
+        async with llm_admission.admit(PRIORITY_ANSWER_FEEDBACK,
+                                       estimate_tokens(prompt_for_individual_feedback,
+                                                       FEEDBACK_OUTPUT_TOKENS_ESTIMATE)):
+            feedback_text = await app_globals.llm_router.generate_text(prompt_for_individual_feedback,
+                                                                       purpose="feedback")
+        if feedback_text:
+            await feedback_cache.set(cache_key, feedback_text)
+            return feedback_text
+        return "AI không thể đưa ra nhận xét cho câu trả lời này."
+    except LLMBlockedError as blocked:
+        return f"Phản hồi AI bị chặn: {blocked.reason}"
+    except LLMOverloadedError:
+        raise
+    except Exception as e:
+        print(f"ERROR calling LLM for individual answer feedback: {str(e)}")
+        return FEEDBACK_ERROR_TEXT
+
+
+async def stream_answer_feedback(question_id: Any, question_text: str, answer_text: str) -> AsyncIterator[str]:
+    # Yields feedback text deltas as the model generates them. Errors are raised
+    # to the caller, which decides what fallback text to persist.
+    if not app_globals.llm_router:
+        print("WARNING: LLM provider not available for individual feedback.")
+        yield "Phản hồi từ AI hiện không khả dụng."
+        return
+
+    cache_key = feedback_cache.make_key(question_id, question_text, answer_text, ANSWER_FEEDBACK_PROMPT_VERSION)
+    cached_feedback = await feedback_cache.get(cache_key)
+    if cached_feedback is not None:
+        yield cached_feedback
+        return
+
+    prompt_for_individual_feedback = build_answer_feedback_prompt(question_text, answer_text)
+    feedback_chunks = []
+    try:
+        async with llm_admission.admit(PRIORITY_ANSWER_FEEDBACK,
+                                       estimate_tokens(prompt_for_individual_feedback,
+                                                       FEEDBACK_OUTPUT_TOKENS_ESTIMATE)):
+            async for chunk in app_globals.llm_router.stream_text(prompt_for_individual_feedback,
+                                                                  purpose="feedback"):
+                feedback_chunks.append(chunk)
+                yield chunk
+    except LLMBlockedError as blocked:
+        yield f"Phản hồi AI bị chặn: {blocked.reason}"
+        return
+
+    feedback_text = "".join(feedback_chunks).strip()
+    if feedback_text:
+        await feedback_cache.set(cache_key, feedback_text)
+
+
+DEFERRED_FEEDBACK_PLACEHOLDER = "Phản hồi AI sẽ được tổng hợp khi kết thúc phần phỏng vấn này."
+FEEDBACK_PENDING_PLACEHOLDER = "Đang tạo phản hồi AI cho câu trả lời này."
+
+
+def build_batch_feedback_prompt(answers: List[AnswerWithFeedback]) -> str:
+    answers_block = ""
+    for i, item in enumerate(answers):
+        answers_block += f"[{i + 1}] Câu hỏi: \"{item.question_text}\"\n    Câu trả lời của ứng viên: \"{item.candidate_answer}\"\n\n"
+
+    return f"""Phân tích từng câu trả lời phỏng vấn dưới đây một cách ngắn gọn (1-2 câu cho mỗi câu), tập trung vào sự rõ ràng và liên quan đến câu hỏi.
+
+{answers_block}Hãy trả về một JSON object hợp lệ theo định dạng sau, với đúng {len(answers)} phần tử theo thứ tự:
+{{
+  "feedback": [
+    {{"index": 1, "feedback": "Nhận xét cho câu trả lời số 1"}}
+  ]
+}}
+
+JSON Output:
+"""
+
+
+async def generate_batch_feedback(answers: List[AnswerWithFeedback]) -> List[str]:
+    # One structured-JSON call producing feedback for every answer of a phase.
+    # Raises on provider/format errors so the background job can retry.
+    if not answers:
+        return []
+    if not app_globals.llm_router:
+        print("WARNING: LLM provider not available for batch feedback.")
+        return ["Phản hồi từ AI hiện không khả dụng."] * len(answers)
+
+    prompt_for_batch_feedback = build_batch_feedback_prompt(answers)
+    try:
+        async with llm_admission.admit(PRIORITY_BATCH_FEEDBACK,
+                                       estimate_tokens(prompt_for_batch_feedback,
+                                                       FEEDBACK_OUTPUT_TOKENS_ESTIMATE * len(answers)),
+                                       background=True):
+            raw_json_text = await app_globals.llm_router.generate_json(prompt_for_batch_feedback,
+                                                                       purpose="assessment")
+    except LLMBlockedError as blocked:
+        return [f"Phản hồi AI bị chặn: {blocked.reason}"] * len(answers)
+
+    parsed_feedback, _ = parse_json_object_lenient(raw_json_text)
+    if parsed_feedback is None:
+        raise ValueError(f"No JSON object in batch feedback response: {raw_json_text[:200]}")
+    feedback_items = parsed_feedback.get("feedback", [])
+    if not isinstance(feedback_items, list):
+        feedback_items = []
+
+    feedback_by_index = {}
+    for position, item in enumerate(feedback_items):
+        if isinstance(item, dict):
+            index = item.get("index", position + 1)
+            text = item.get("feedback")
+        else:
+            index, text = position + 1, item
+        if isinstance(index, int) and isinstance(text, str) and text.strip():
+            feedback_by_index[index] = text.strip()
+
+    return [feedback_by_index.get(i + 1, "AI không thể đưa ra nhận xét cho câu trả lời này.")
+            for i in range(len(answers))]
+
+
+def build_final_assessment_prompt(interview: InterviewInDB, full_transcript: str) -> str:
+    final_assessment_field = interview.selected_field if interview.selected_field != "none" else "Chung"
+    final_desired_position = interview.desired_position_in_field or "Chưa rõ"
+
+    return f"""Bạn là một chuyên gia tuyển dụng AI giàu kinh nghiệm. Nhiệm vụ của bạn là phân tích kỹ lưỡng TOÀN BỘ buổi phỏng vấn dưới đây và đưa ra đánh giá chi tiết, khách quan.
+Buổi phỏng vấn bao gồm:
+1. Phần câu hỏi chung.
+2. Phần câu hỏi chuyên môn cho lĩnh vực: '{final_assessment_field}'.
+Ứng viên mong muốn ứng tuyển vào vị trí: '{final_desired_position}'.
+
+Đây là toàn bộ nội dung buổi phỏng vấn (chỉ bao gồm câu hỏi và câu trả lời của ứng viên):
+--- BEGIN INTERVIEW TRANSCRIPT ---
+{full_transcript}
+--- END INTERVIEW TRANSCRIPT ---
+
+YÊU CẦU PHÂN TÍCH VÀ ĐÁNH GIÁ:
+Hãy xem xét TẤT CẢ các câu trả lời của ứng viên từ ĐẦU ĐẾN CUỐI buổi phỏng vấn.
+Đối với mỗi nhận định về điểm mạnh hoặc điểm yếu, hãy cố gắng chỉ ra nó được thể hiện qua câu trả lời cho câu hỏi nào hoặc qua tình huống nào trong buổi phỏng vấn.
+
+Hãy đưa ra đánh giá của bạn theo định dạng JSON sau. Đảm bảo output là một JSON object hợp lệ:
+
+{{
+  "overall_summary_comment": "Một đoạn nhận xét tổng quan (3-5 câu) về phong thái chung, khả năng giao tiếp, sự tự tin, và tư duy phản biện của ứng viên xuyên suốt buổi phỏng vấn. Nhận xét này phải dựa trên cảm nhận từ toàn bộ quá trình, không chỉ một vài câu hỏi.",
+  "strengths_analysis": [
+    {{
+      "point": "Mô tả điểm mạnh cụ thể (ví dụ: Kiến thức chuyên môn sâu về Java Spring Boot).",
+      "evidence": "Thể hiện qua câu trả lời cho câu hỏi về [Nêu tên/nội dung câu hỏi] ở phần [Chung/Chuyên môn], nơi ứng viên đã [Mô tả cách ứng viên trả lời, ví dụ: giải thích chi tiết về cách sử dụng annotation XYZ, hoặc đưa ra ví dụ dự án thực tế]."
+    }}
+  ],
+  "weaknesses_analysis": [
+    {{
+      "point": "Mô tả điểm yếu/cần cải thiện (ví dụ: Kinh nghiệm thực tế với Kubernetes còn hạn chế).",
+      "evidence": "Qua câu trả lời cho câu hỏi về [Nêu tên/nội dung câu hỏi], ứng viên có vẻ chưa tự tin hoặc kiến thức còn ở mức lý thuyết."
+    }}
+  ],
+  "status": "Đạt",
+  "suitability_for_field": "Phù hợp với lĩnh vực '{final_assessment_field}' do [lý do ngắn gọn dựa trên phân tích]",
+  "suggested_positions": ["Vị trí gợi ý 1 (cụ thể hơn nếu có thể, ví dụ: Junior Java Developer with Spring Focus)"],
+  "suggestions_if_not_pass": "Nếu không đạt, ứng viên nên tập trung vào [Nêu cụ thể kỹ năng/kiến thức cần cải thiện dựa trên điểm yếu đã phân tích]"
+}}
+
+JSON Output:
+"""
+
+
+# Fields the completion retry is asked for when the first response lacks them.
+ASSESSMENT_REQUIRED_FIELDS = ("status", "overall_summary_comment", "suitability_for_field")
+
+_ASSESSMENT_LIST_ITEM_TYPES = {
+    "strengths_analysis": StrengthWeaknessDetail,
+    "weaknesses_analysis": StrengthWeaknessDetail,
+    "suggested_positions": str,
+}
+
+
+def validate_assessment_fields(assessment_dict: Dict[str, Any]) -> Dict[str, Any]:
+    # Validates OverallAssessment field by field so one bad field (or list item)
+    # does not throw away the rest of an expensive response.
+    valid_fields: Dict[str, Any] = {}
+    for field_name, field_info in OverallAssessment.model_fields.items():
+        if field_name == "raw_ai_summary_text" or assessment_dict.get(field_name) is None:
+            continue
+        value = assessment_dict[field_name]
+        try:
+            valid_fields[field_name] = TypeAdapter(field_info.annotation).validate_python(value)
+            continue
+        except ValidationError:
+            pass
+
+        item_type = _ASSESSMENT_LIST_ITEM_TYPES.get(field_name)
+        if item_type is not None and isinstance(value, list):
+            item_adapter = TypeAdapter(item_type)
+            valid_items = []
+            for item in value:
+                try:
+                    valid_items.append(item_adapter.validate_python(item))
+                except ValidationError:
+                    continue
+            valid_fields[field_name] = valid_items
+        else:
+            print(f"WARNING: Dropping invalid final assessment field '{field_name}': {str(value)[:200]}")
+    return valid_fields
+
+
+def missing_required_assessment_fields(valid_fields: Dict[str, Any]) -> List[str]:
+    return [field_name for field_name in ASSESSMENT_REQUIRED_FIELDS
+            if not (isinstance(valid_fields.get(field_name), str) and valid_fields[field_name].strip())]
+
+
+def build_assessment_completion_prompt(partial_assessment: Dict[str, Any], missing_fields: List[str],
+                                       interview: InterviewInDB) -> str:
+    final_assessment_field = interview.selected_field if interview.selected_field != "none" else "Chung"
+    partial_json = TypeAdapter(Dict[str, Any]).dump_json(partial_assessment).decode("utf-8")
+    missing_fields_json = ", ".join(f'"{field_name}": "..."' for field_name in missing_fields)
+
+    return f"""Dưới đây là một bản đánh giá ứng viên phỏng vấn (lĩnh vực: '{final_assessment_field}') ở dạng JSON nhưng còn thiếu một số trường.
+--- BEGIN PARTIAL ASSESSMENT ---
+{partial_json}
+--- END PARTIAL ASSESSMENT ---
+
+Dựa trên nội dung đã có, hãy bổ sung CHỈ các trường còn thiếu: {", ".join(missing_fields)}.
+Trường "status" chỉ nhận "Đạt" hoặc "Không đạt".
+Trả về một JSON object hợp lệ chỉ gồm các trường đó:
+{{{missing_fields_json}}}
+
+JSON Output:
+"""
+
+
+async def stream_assessment_json(prompt: str, expected_output_tokens: int) -> Tuple[Optional[Dict[str, Any]], str]:
+    # Streams the response through the incremental extractor and stops reading
+    # as soon as the first JSON object is complete.
+    extractor = IncrementalJSONExtractor()
+    raw_chunks: List[str] = []
+    async with llm_admission.admit(PRIORITY_FINAL_ASSESSMENT,
+                                   estimate_tokens(prompt, expected_output_tokens),
+                                   background=True):
+        response_stream = app_globals.llm_router.stream_json(prompt, purpose="assessment")
+        try:
+            async for chunk in response_stream:
+                raw_chunks.append(chunk)
+                if extractor.feed(chunk):
+                    break
+        finally:
+            await response_stream.aclose()
+
+    raw_text = "".join(raw_chunks)
+    parsed, was_repaired = parse_extracted_object(extractor)
+    if parsed is not None and was_repaired:
+        print(f"WARNING: Repaired malformed/truncated JSON from LLM final assessment "
+              f"({len(raw_text)} characters received).")
+    return parsed, raw_text
+
+
+async def complete_missing_assessment_fields(interview: InterviewInDB, valid_fields: Dict[str, Any],
+                                             missing_fields: List[str]) -> Dict[str, Any]:
+    completion_prompt = build_assessment_completion_prompt(valid_fields, missing_fields, interview)
+    try:
+        completion_dict, _ = await stream_assessment_json(completion_prompt, FEEDBACK_OUTPUT_TOKENS_ESTIMATE)
+    except LLMBlockedError as blocked:
+        print(f"WARNING: Final assessment completion blocked: {blocked.reason}")
+        return valid_fields
+    if not completion_dict:
+        return valid_fields
+
+    completed_fields = validate_assessment_fields(completion_dict)
+    merged_fields = dict(valid_fields)
+    for field_name in missing_fields:
+        if field_name in completed_fields:
+            merged_fields[field_name] = completed_fields[field_name]
+    return merged_fields
+
+
+async def generate_final_assessment(interview: InterviewInDB) -> OverallAssessment:
+    if not app_globals.llm_router:
+        print("WARNING: LLM provider not available for final assessment.")
+        return OverallAssessment(status="Model AI không sẵn sàng để đánh giá cuối.")
+
+    full_transcript = render_transcript(interview)
+    prompt_for_final_assessment = build_final_assessment_prompt(interview, full_transcript)
+
+    raw_json_text_from_ai_for_error = "AI response not captured yet for error logging."
+    try:
+        assessment_dict, raw_json_text = await stream_assessment_json(prompt_for_final_assessment,
+                                                                      ASSESSMENT_OUTPUT_TOKENS_ESTIMATE)
+        if not raw_json_text.strip():
+            return OverallAssessment(status="AI không thể tạo đánh giá cuối cùng",
+                                     raw_ai_summary_text="No content returned by AI for final assessment.")
+        raw_json_text_from_ai_for_error = raw_json_text
+        if assessment_dict is None:
+            print(f"ERROR: No JSON object in LLM final assessment. Raw text: {raw_json_text_from_ai_for_error}")
+            return OverallAssessment(status="Lỗi định dạng JSON từ AI",
+                                     raw_ai_summary_text=f"JSON Decode Error. Raw text: {raw_json_text_from_ai_for_error}")
+
+        valid_fields = validate_assessment_fields(assessment_dict)
+        missing_fields = missing_required_assessment_fields(valid_fields)
+        if missing_fields:
+            print(f"WARNING: Final assessment is missing {missing_fields}; requesting completion.")
+            try:
+                valid_fields = await complete_missing_assessment_fields(interview, valid_fields, missing_fields)
+            except Exception as e:
+                # The partial assessment is still worth keeping.
+                print(f"ERROR completing final assessment fields: {str(e)}")
+
+        if "status" in missing_required_assessment_fields(valid_fields):
+            valid_fields["status"] = "Đánh giá chưa đầy đủ từ AI"
+        return OverallAssessment(**valid_fields, raw_ai_summary_text=raw_json_text_from_ai_for_error)
+    except LLMProviderError:
+        # Provider outage / open circuit: let the assessment job retry later
+        # instead of persisting an error assessment.
+        raise
+    except LLMBlockedError as blocked:
+        return OverallAssessment(status=f"Đánh giá bị chặn: {blocked.reason}",
+                                 raw_ai_summary_text=f"Blocked: {blocked.reason}")
+    except Exception as e:
+        print(f"ERROR calling LLM for final assessment: {str(e)}")
+        return OverallAssessment(status="Lỗi gọi AI đánh giá cuối",
+                                 raw_ai_summary_text=str(e))
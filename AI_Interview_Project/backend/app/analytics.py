@@ -0,0 +1,235 @@
+# backend/app/analytics.py
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
+
+from .interview_archive import INTERVIEW_COLLECTION, INTERVIEW_COLLECTIONS
+from .models import (
+    AnalyticsDailyVolume, InterviewAnalyticsResponse
+)
+
+ROLLUP_COLLECTION = "interview_daily_rollups"
+# Per-interview markers of the transitions already counted (stage -> time).
+RECORDED_TRANSITIONS_FIELD = "analytics_recorded"
+
+# Funnel stages in order; an interview is counted once per stage it reached.
+FUNNEL_STAGES = ["info_submitted", "general_in_progress", "awaiting_specialization",
+                 "specialized_in_progress", "completed"]
+
+# Durations are kept as a per-minute histogram so medians can be merged across days.
+DURATION_BUCKET_CAP_MINUTES = 240
+
+
+# Every rollup is keyed by the UTC day the interview started (its cohort), so a
+# rebuild from the interviews collection lands every count on the same day the
+# incremental updates did.
+def rollup_day(start_time: Optional[datetime]) -> str:
+    if start_time is None:
+        start_time = datetime.now(timezone.utc)
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(timezone.utc)
+    return start_time.strftime("%Y-%m-%d")
+
+
+def _safe_key(value: Any) -> str:
+    # Assessment statuses are free text from the LLM; "." and "$" are not allowed in field paths.
+    key = str(value) if value not in (None, "") else "unknown"
+    return key.replace(".", "_").replace("$", "_")
+
+
+def duration_bucket(start_time: Optional[datetime], end_time: Optional[datetime]) -> Optional[str]:
+    if start_time is None or end_time is None:
+        return None
+    minutes = max(0.0, (end_time - start_time).total_seconds() / 60.0)
+    return str(min(int(minutes), DURATION_BUCKET_CAP_MINUTES))
+
+
+def stage_increments(stage: str, count: int = 1) -> Dict[str, int]:
+    return {f"funnel.{stage}": count}
+
+
+def completion_increments(start_time: Optional[datetime], end_time: Optional[datetime]) -> Dict[str, int]:
+    increments = stage_increments("completed")
+    bucket = duration_bucket(start_time, end_time)
+    if bucket is not None:
+        increments[f"durations_minutes.{bucket}"] = 1
+    return increments
+
+
+def assessment_increments(selected_field: Optional[str], assessment_status: Optional[str]) -> Dict[str, int]:
+    return {f"assessments.{_safe_key(selected_field)}.{_safe_key(assessment_status)}": 1}
+
+
+async def record_rollup(db: AsyncIOMotorDatabase, start_time: Optional[datetime], increments: Dict[str, int]):
+    # Analytics must never fail a candidate request or an assessment job.
+    try:
+        await db.get_collection(ROLLUP_COLLECTION).update_one(
+            {"_id": rollup_day(start_time)},
+            {"$inc": increments, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"WARNING: Could not update interview analytics rollup: {str(e)}")
+
+
+async def record_rollup_once(db: AsyncIOMotorDatabase, interview_oid: Any, transition: str,
+                             start_time: Optional[datetime], increments: Dict[str, int]):
+    # An interview restarted through start-general goes through the same
+    # transitions again; only the first one is counted. The marker survives the
+    # restart, so the increment stays a one-off even across workers.
+    marker_field = f"{RECORDED_TRANSITIONS_FIELD}.{transition}"
+    try:
+        marker_result = await db.get_collection(INTERVIEW_COLLECTION).update_one(
+            {"_id": interview_oid, marker_field: {"$exists": False}},
+            {"$set": {marker_field: datetime.now(timezone.utc)}}
+        )
+    except Exception as e:
+        print(f"WARNING: Could not mark interview analytics transition '{transition}': {str(e)}")
+        return
+    if marker_result.modified_count:
+        await record_rollup(db, start_time, increments)
+
+
+async def rebuild_rollups(db: AsyncIOMotorDatabase) -> int:
+    # Recomputes every day from the interviews and archive collections with
+    # grouping pipelines. Stages an interview has passed are inferred from its
+    # current fields, the same facts the incremental updates record at each
+    # transition. Counts from the two collections are simply added up.
+    day_expression = {"$dateToString": {"format": "%Y-%m-%d", "date": "$start_time"}}
+    specialized_chosen = {"$in": ["$selected_field", ["developer", "designer"]]}
+    completed = {"$eq": ["$lifecycle_status", "completed"]}
+
+    def count_if(condition: Dict[str, Any]) -> Dict[str, Any]:
+        return {"$sum": {"$cond": [condition, 1, 0]}}
+
+    rollups: Dict[str, Dict[str, Any]] = {}
+
+    def rollup_for(day: str) -> Dict[str, Any]:
+        return rollups.setdefault(day, {"_id": day, "funnel": {}, "assessments": {}, "durations_minutes": {}})
+
+    def add_count(counts: Dict[str, int], key: str, count: int):
+        if count:
+            counts[key] = counts.get(key, 0) + count
+
+    funnel_pipeline = [
+        {"$match": {"start_time": {"$ne": None}}},
+        {"$group": {
+            "_id": day_expression,
+            "info_submitted": {"$sum": 1},
+            "general_in_progress": count_if({"$ne": [{"$ifNull": ["$general_question_set_id_name", None]}, None]}),
+            "awaiting_specialization": count_if({"$or": [
+                {"$in": ["$lifecycle_status", ["awaiting_specialization", "specialized_in_progress", "completed"]]},
+                {"$eq": ["$abandoned_from_status", "awaiting_specialization"]},
+                specialized_chosen,
+            ]}),
+            "specialized_in_progress": count_if({"$or": [specialized_chosen, completed]}),
+            "completed": count_if(completed),
+            "abandoned": count_if({"$eq": ["$lifecycle_status", "abandoned"]}),
+        }},
+    ]
+
+    completed_match = {"$match": {"lifecycle_status": "completed", "start_time": {"$ne": None}}}
+    duration_pipeline = [
+        completed_match,
+        {"$match": {"end_time": {"$ne": None}}},
+        {"$group": {
+            "_id": {"day": day_expression, "minute": {"$min": [
+                {"$max": [{"$floor": {"$divide": [{"$subtract": ["$end_time", "$start_time"]}, 60000]}}, 0]},
+                DURATION_BUCKET_CAP_MINUTES,
+            ]}},
+            "count": {"$sum": 1},
+        }},
+    ]
+
+    assessment_pipeline = [
+        completed_match,
+        # Failed jobs store a synthetic error status, not an outcome.
+        {"$match": {"overall_assessment.status": {"$nin": [None, ""]}, "assessment_job_status": {"$ne": "failed"}}},
+        {"$group": {
+            "_id": {"day": day_expression, "field": "$selected_field", "status": "$overall_assessment.status"},
+            "count": {"$sum": 1},
+        }},
+    ]
+
+    for collection_name in INTERVIEW_COLLECTIONS:
+        interview_collection = db.get_collection(collection_name)
+        async for day_doc in interview_collection.aggregate(funnel_pipeline):
+            day_funnel = rollup_for(day_doc["_id"])["funnel"]
+            for stage in FUNNEL_STAGES + ["abandoned"]:
+                add_count(day_funnel, stage, day_doc.get(stage, 0))
+        async for group_doc in interview_collection.aggregate(duration_pipeline):
+            add_count(rollup_for(group_doc["_id"]["day"])["durations_minutes"],
+                      str(int(group_doc["_id"]["minute"])), group_doc["count"])
+        async for group_doc in interview_collection.aggregate(assessment_pipeline):
+            group_key = group_doc["_id"]
+            field_counts = rollup_for(group_key["day"])["assessments"].setdefault(_safe_key(group_key.get("field")), {})
+            add_count(field_counts, _safe_key(group_key["status"]), group_doc["count"])
+
+    rollup_collection = db.get_collection(ROLLUP_COLLECTION)
+    rebuilt_at = datetime.now(timezone.utc)
+    operations = [ReplaceOne({"_id": day}, {**rollup, "updated_at": rebuilt_at}, upsert=True)
+                  for day, rollup in rollups.items()]
+    if operations:
+        await rollup_collection.bulk_write(operations, ordered=False)
+    await rollup_collection.delete_many({"_id": {"$nin": list(rollups)}})
+    return len(rollups)
+
+
+def _median_from_histogram(histogram: Dict[str, int]) -> Optional[float]:
+    total = sum(histogram.values())
+    if not total:
+        return None
+    running = 0
+    for minute in sorted(histogram, key=int):
+        running += histogram[minute]
+        if running * 2 >= total:
+            return float(minute)
+    return None
+
+
+async def summarize_rollups(db: AsyncIOMotorDatabase, days: int) -> InterviewAnalyticsResponse:
+    # Reads one small document per day: the cost depends on `days`, not on
+    # how many interviews there are.
+    today = datetime.now(timezone.utc).date()
+    from_day = (today - timedelta(days=days - 1)).isoformat()
+    to_day = today.isoformat()
+
+    funnel: Dict[str, int] = {}
+    pass_fail: Dict[str, Dict[str, int]] = {}
+    durations: Dict[str, int] = {}
+    daily_volumes: List[AnalyticsDailyVolume] = []
+
+    rollup_cursor = db.get_collection(ROLLUP_COLLECTION).find({"_id": {"$gte": from_day, "$lte": to_day}}).sort("_id", 1)
+    async for rollup in rollup_cursor:
+        day_funnel = rollup.get("funnel", {})
+        for stage, count in day_funnel.items():
+            funnel[stage] = funnel.get(stage, 0) + count
+        for selected_field, status_counts in rollup.get("assessments", {}).items():
+            field_totals = pass_fail.setdefault(selected_field, {})
+            for assessment_status, count in status_counts.items():
+                field_totals[assessment_status] = field_totals.get(assessment_status, 0) + count
+        for minute, count in rollup.get("durations_minutes", {}).items():
+            durations[minute] = durations.get(minute, 0) + count
+        daily_volumes.append(AnalyticsDailyVolume(
+            day=rollup["_id"],
+            started=day_funnel.get("info_submitted", 0),
+            completed=day_funnel.get("completed", 0),
+        ))
+
+    by_status: Dict[str, int] = {}
+    for status_counts in pass_fail.values():
+        for assessment_status, count in status_counts.items():
+            by_status[assessment_status] = by_status.get(assessment_status, 0) + count
+
+    return InterviewAnalyticsResponse(
+        from_day=from_day,
+        to_day=to_day,
+        funnel={stage: funnel.get(stage, 0) for stage in FUNNEL_STAGES + ["abandoned"]},
+        assessment_status_counts=by_status,
+        assessment_status_by_field=pass_fail,
+        median_duration_minutes=_median_from_histogram(durations),
+        completed_with_duration=sum(durations.values()),
+        daily_volumes=daily_volumes,
+    )
@@ -0,0 +1,259 @@
+# backend/app/assessment_jobs.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from .ai_assessment import (
+    generate_final_assessment, generate_batch_feedback, DEFERRED_FEEDBACK_PLACEHOLDER, FEEDBACK_ERROR_TEXT,
+    FEEDBACK_PENDING_PLACEHOLDER
+)
+from .config import settings
+from .analytics import record_rollup_once, assessment_increments
+from .models import InterviewInDB, OverallAssessment
+from .question_set_cache import resolve_question_references
+from .search_index import SEARCH_ENTRIES_FIELD, assessment_search_entries, feedback_search_entries
+
+JOB_FINAL_ASSESSMENT = "assessment"
+JOB_BATCH_FEEDBACK_GENERAL = "batch_feedback:general"
+JOB_BATCH_FEEDBACK_SPECIALIZED = "batch_feedback:specialized"
+
+# Job kind -> (status, attempts, claimed_at, next_attempt_at) field paths on the
+# interview document.
+JOB_STATE_FIELDS: Dict[str, tuple] = {
+    JOB_FINAL_ASSESSMENT: ("assessment_job_status", "assessment_job_attempts", "assessment_job_claimed_at",
+                           "assessment_job_next_attempt_at"),
+    JOB_BATCH_FEEDBACK_GENERAL: ("batch_feedback_jobs.general.status",
+                                 "batch_feedback_jobs.general.attempts",
+                                 "batch_feedback_jobs.general.claimed_at",
+                                 "batch_feedback_jobs.general.next_attempt_at"),
+    JOB_BATCH_FEEDBACK_SPECIALIZED: ("batch_feedback_jobs.specialized.status",
+                                     "batch_feedback_jobs.specialized.attempts",
+                                     "batch_feedback_jobs.specialized.claimed_at",
+                                     "batch_feedback_jobs.specialized.next_attempt_at"),
+}
+
+BATCH_FEEDBACK_ANSWER_FIELDS = {
+    JOB_BATCH_FEEDBACK_GENERAL: "general_answers_and_feedback",
+    JOB_BATCH_FEEDBACK_SPECIALIZED: "specialized_answers_and_feedback",
+}
+
+
+def batch_feedback_job_kind(phase: str) -> str:
+    return JOB_BATCH_FEEDBACK_GENERAL if phase == "general" else JOB_BATCH_FEEDBACK_SPECIALIZED
+
+
+def _answers_awaiting_feedback(answers: List[Any]) -> List[int]:
+    # Indexes still holding a placeholder: the whole phase in deferred mode, or a
+    # per-answer feedback that could not be generated in the request.
+    return [i for i, answer in enumerate(answers)
+            if answer.ai_feedback_per_answer in (DEFERRED_FEEDBACK_PLACEHOLDER, FEEDBACK_PENDING_PLACEHOLDER)]
+
+
+def _get_dotted(doc: Dict[str, Any], dotted_path: str) -> Any:
+    value: Any = doc
+    for key in dotted_path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class AssessmentJobManager:
+    # In-process queue + bounded worker pool for the LLM work done after answers
+    # are saved: final assessments and deferred per-phase feedback batches. Job
+    # state lives on the interview document, so a job is claimed atomically and
+    # pending/stale jobs can be re-queued after a restart.
+
+    def __init__(self):
+        self.database: Optional[AsyncIOMotorDatabase] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.workers)
+
+    async def start(self, db_instance: AsyncIOMotorDatabase):
+        if self.is_running:
+            print("Assessment job workers already running.")
+            return
+
+        self.database = db_instance
+        self.queue = asyncio.Queue()
+        worker_count = max(1, settings.ASSESSMENT_WORKER_CONCURRENCY)
+        self.workers = [asyncio.create_task(self._worker_loop(i)) for i in range(worker_count)]
+        print(f"Started {worker_count} assessment job worker(s).")
+
+        await self.requeue_pending_jobs()
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.queue = None
+        self.database = None
+        print("Assessment job workers stopped.")
+
+    def enqueue(self, interview_id: str, job_kind: str = JOB_FINAL_ASSESSMENT):
+        if not self.is_running:
+            print(f"WARNING: Assessment workers not running. Job '{job_kind}' for interview {interview_id} "
+                  f"stays pending in DB.")
+            return
+        self.queue.put_nowait((job_kind, interview_id))
+
+    async def requeue_stale_jobs(self) -> int:
+        # Recovers jobs whose in-memory queue entry was lost with a dead worker.
+        # Called at startup and periodically by the interview sweeper, so a crash
+        # does not wait for the next deploy:
+        # - "running" jobs claimed longer ago than ASSESSMENT_JOB_STALE_SECONDS go
+        #   back to pending and into this worker's queue;
+        # - "pending" jobs still unclaimed that long after their next_attempt_at
+        #   (a retry or the initial enqueue never ran) are queued again.
+        # A job queued twice is harmless: only one worker can claim it.
+        interview_collection = self.database.get_collection("interviews")
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=settings.ASSESSMENT_JOB_STALE_SECONDS)
+
+        requeued_total = 0
+        for job_kind, (status_field, _, claimed_at_field, next_attempt_field) in JOB_STATE_FIELDS.items():
+            stale_query = {status_field: "running", claimed_at_field: {"$lt": stale_before}}
+            requeued_count = 0
+            async for doc in interview_collection.find(stale_query, {"_id": 1}):
+                reset_result = await interview_collection.update_one(
+                    {"_id": doc["_id"], **stale_query},
+                    {"$set": {status_field: "pending", next_attempt_field: now}}
+                )
+                if reset_result.modified_count:
+                    self.enqueue(str(doc["_id"]), job_kind)
+                    requeued_count += 1
+            if requeued_count:
+                print(f"Reset {requeued_count} stale running '{job_kind}' job(s) to pending.")
+
+            # $not also matches pending jobs written before next_attempt_at existed.
+            overdue_query = {status_field: "pending", next_attempt_field: {"$not": {"$gte": stale_before}}}
+            overdue_count = 0
+            async for doc in interview_collection.find(overdue_query, {"_id": 1}):
+                self.enqueue(str(doc["_id"]), job_kind)
+                overdue_count += 1
+            if overdue_count:
+                print(f"Re-queued {overdue_count} overdue pending '{job_kind}' job(s).")
+            requeued_total += requeued_count + overdue_count
+        return requeued_total
+
+    async def requeue_pending_jobs(self):
+        interview_collection = self.database.get_collection("interviews")
+        for job_kind, (status_field, _, _, _) in JOB_STATE_FIELDS.items():
+            requeued_count = 0
+            async for doc in interview_collection.find({status_field: "pending"}, {"_id": 1}):
+                self.enqueue(str(doc["_id"]), job_kind)
+                requeued_count += 1
+            if requeued_count:
+                print(f"Re-queued {requeued_count} pending '{job_kind}' job(s) from DB.")
+
+        # After the pending scan, so reset jobs are only queued once (overdue
+        # pending ones are queued twice, which the atomic claim makes harmless).
+        await self.requeue_stale_jobs()
+
+    async def _worker_loop(self, worker_index: int):
+        while True:
+            job_kind, interview_id = await self.queue.get()
+            try:
+                await self._run_job(job_kind, interview_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"ERROR in assessment worker {worker_index} for '{job_kind}' job "
+                      f"(interview {interview_id}): {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    async def _compute_result(self, job_kind: str, interview: InterviewInDB) -> Dict[str, Any]:
+        if job_kind == JOB_FINAL_ASSESSMENT:
+            final_assessment = await generate_final_assessment(interview)
+            return {"overall_assessment": final_assessment.model_dump()}
+
+        answers_field = BATCH_FEEDBACK_ANSWER_FIELDS[job_kind]
+        answers = getattr(interview, answers_field)
+        answer_indexes = _answers_awaiting_feedback(answers)
+        feedback_texts = await generate_batch_feedback([answers[i] for i in answer_indexes])
+        return {f"{answers_field}.{i}.ai_feedback_per_answer": text for i, text in zip(answer_indexes, feedback_texts)}
+
+    def _failure_result(self, job_kind: str, interview: InterviewInDB, error: Exception) -> Dict[str, Any]:
+        if job_kind == JOB_FINAL_ASSESSMENT:
+            final_assessment = OverallAssessment(status="Lỗi gọi AI đánh giá cuối", raw_ai_summary_text=str(error))
+            return {"overall_assessment": final_assessment.model_dump()}
+
+        answers_field = BATCH_FEEDBACK_ANSWER_FIELDS[job_kind]
+        return {f"{answers_field}.{i}.ai_feedback_per_answer": FEEDBACK_ERROR_TEXT
+                for i in _answers_awaiting_feedback(getattr(interview, answers_field))}
+
+    def _search_entries(self, job_kind: str, result_fields: Dict[str, Any]) -> List[str]:
+        if job_kind == JOB_FINAL_ASSESSMENT:
+            return assessment_search_entries(result_fields["overall_assessment"])
+        return feedback_search_entries(result_fields.values())
+
+    async def _run_job(self, job_kind: str, interview_id: str):
+        interview_collection = self.database.get_collection("interviews")
+        interview_oid = ObjectId(interview_id)
+        status_field, attempts_field, claimed_at_field, next_attempt_field = JOB_STATE_FIELDS[job_kind]
+
+        claimed_doc = await interview_collection.find_one_and_update(
+            {"_id": interview_oid, status_field: "pending"},
+            {
+                "$set": {status_field: "running", claimed_at_field: datetime.now(timezone.utc)},
+                "$inc": {attempts_field: 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        if not claimed_doc:
+            # Already claimed by another worker/process, or finished.
+            return
+
+        interview = InterviewInDB(**await resolve_question_references(self.database, claimed_doc))
+        try:
+            result_fields = await self._compute_result(job_kind, interview)
+            job_status = "done"
+        except Exception as e:
+            print(f"ERROR running '{job_kind}' job for interview {interview_id}: {str(e)}")
+            if (_get_dotted(claimed_doc, attempts_field) or 0) < settings.ASSESSMENT_JOB_MAX_ATTEMPTS:
+                # next_attempt_at lets requeue_stale_jobs pick the retry up if this
+                # worker dies before the call_later below fires.
+                retry_delay = settings.ASSESSMENT_JOB_RETRY_DELAY_SECONDS
+                await interview_collection.update_one(
+                    {"_id": interview_oid, status_field: "running"},
+                    {"$set": {status_field: "pending",
+                              next_attempt_field: datetime.now(timezone.utc) + timedelta(seconds=retry_delay)}}
+                )
+                # Give an open circuit breaker time to recover before retrying.
+                asyncio.get_running_loop().call_later(retry_delay, self.enqueue, interview_id, job_kind)
+                return
+            result_fields = self._failure_result(job_kind, interview, e)
+            job_status = "failed"
+
+        job_update: Dict[str, Any] = {"$set": {
+            **result_fields,
+            status_field: job_status,
+            "updated_at": datetime.now(timezone.utc)
+        }}
+        if job_status == "done":
+            new_search_entries = self._search_entries(job_kind, result_fields)
+            if new_search_entries:
+                job_update["$push"] = {SEARCH_ENTRIES_FIELD: {"$each": new_search_entries}}
+        update_result = await interview_collection.update_one(
+            {"_id": interview_oid, status_field: "running"},
+            job_update
+        )
+        if job_kind == JOB_FINAL_ASSESSMENT and job_status == "done" and update_result.modified_count:
+            await record_rollup_once(self.database, interview_oid, "assessment", interview.start_time,
+                                     assessment_increments(interview.selected_field,
+                                                           result_fields["overall_assessment"].get("status")))
+
+
+assessment_job_manager = AssessmentJobManager()
@@ -0,0 +1,64 @@
+# backend/app/concurrency.py
+import asyncio
+from typing import Any, Awaitable, Dict, Optional, Sequence
+
+
+class TaskOutcome:
+    def __init__(self, name: str, result: Any = None, error: Optional[BaseException] = None):
+        self.name = name
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def gather_isolated(awaitables: Dict[str, Awaitable], timeout: Optional[float] = None,
+                          fail_fast: Sequence[str] = ()) -> Dict[str, TaskOutcome]:
+    # Runs independent awaitables concurrently and returns one outcome per name.
+    # A failure in one child does not cancel its siblings, unless that child is
+    # named in `fail_fast`: then every child still running is cancelled (outcome
+    # error: CancelledError). Children still running at `timeout` are cancelled
+    # (outcome error: TimeoutError), and cancelling the caller cancels and awaits
+    # every child so nothing outlives the request.
+    loop = asyncio.get_running_loop()
+    tasks = {name: asyncio.ensure_future(awaitable) for name, awaitable in awaitables.items()}
+    deadline = None if timeout is None else loop.time() + timeout
+    failed_name: Optional[str] = None
+    try:
+        pending = set(tasks.values())
+        while pending:
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining,
+                return_when=asyncio.FIRST_COMPLETED if fail_fast else asyncio.ALL_COMPLETED
+            )
+            failed_name = next((name for name in fail_fast
+                                if tasks.get(name) in done and not tasks[name].cancelled()
+                                and tasks[name].exception() is not None), None)
+            if failed_name is not None or not done or not fail_fast:
+                break
+    finally:
+        pending = [task for task in tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    outcomes: Dict[str, TaskOutcome] = {}
+    for name, task in tasks.items():
+        if task.cancelled() and failed_name is not None:
+            outcomes[name] = TaskOutcome(name, error=asyncio.CancelledError(f"'{name}' cancelled: '{failed_name}' failed."))
+        elif task.cancelled():
+            outcomes[name] = TaskOutcome(name, error=asyncio.TimeoutError(f"'{name}' did not finish in time."))
+        elif task.exception() is not None:
+            outcomes[name] = TaskOutcome(name, error=task.exception())
+        else:
+            outcomes[name] = TaskOutcome(name, result=task.result())
+    return outcomes
@@ -1,14 +1,34 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 import os
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = ""
-    GOOGLE_AI_API_KEY: str
+    GOOGLE_AI_API_KEY: Optional[str] = ""
     MONGODB_URL: str
     DATABASE_NAME: str
+    # Pool limits are per process: with 4 gunicorn workers the server sees up to 4x MONGO_MAX_POOL_SIZE.
+    MONGO_MAX_POOL_SIZE: int = 25
+    MONGO_MIN_POOL_SIZE: int = 2
+    MONGO_MAX_IDLE_TIME_MS: int = 300000
+    MONGO_MAX_CONNECTING: int = 2
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    # Comma separated, e.g. "zstd,snappy,zlib"; zstd needs `zstandard`, snappy needs `python-snappy`.
+    MONGO_COMPRESSORS: str = ""
+    MONGO_READ_PREFERENCE: Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"] = "primary"
+    MONGO_COMMAND_MONITORING_ENABLED: bool = True
+    # Prometheus scrape target per gunicorn worker (metrics_exporter.py): worker
+    # i serves GET /metrics on one port of METRICS_EXPORTER_BASE_PORT ..
+    # + WEB_CONCURRENCY - 1, so configure every port of that range as a target.
+    # Bound to localhost by default; if another host is set, also set
+    # METRICS_SCRAPE_TOKEN (sent as "Authorization: Bearer <token>").
+    METRICS_EXPORTER_ENABLED: bool = False
+    METRICS_EXPORTER_HOST: str = "127.0.0.1"
+    METRICS_EXPORTER_BASE_PORT: int = 9400
+    METRICS_SCRAPE_TOKEN: str = ""
 
     ADMIN_USERNAME: str
     ADMIN_PASSWORD_HASH: str
@@ -22,6 +42,68 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ADMIN_ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
 
+    LLM_PROVIDERS: str = "gemini,openai"
+    GEMINI_MODEL_NAME: str = "gemini-1.5-flash-latest"
+    OPENAI_MODEL_NAME: str = "gpt-4o-mini"
+    LLM_FEEDBACK_TIMEOUT_SECONDS: float = 20.0
+    LLM_ASSESSMENT_TIMEOUT_SECONDS: float = 60.0
+    LLM_FEEDBACK_DEADLINE_SECONDS: float = 30.0
+    LLM_ASSESSMENT_DEADLINE_SECONDS: float = 180.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 4.0
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    LLM_STATS_WINDOW_SIZE: int = 100
+    LLM_UNHEALTHY_ERROR_RATE: float = 0.5
+    LLM_MIN_SAMPLES_FOR_HEALTH: int = 5
+    # Number of gunicorn workers (Procfile -w). LLM_MAX_CONCURRENCY and the
+    # per-minute limits below are for the whole deployment; each worker enforces
+    # its 1/WEB_CONCURRENCY share (see llm_admission.py).
+    WEB_CONCURRENCY: int = 4
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_REQUESTS_PER_MINUTE: int = 300
+    LLM_TOKENS_PER_MINUTE: int = 1000000
+    LLM_ADMISSION_QUEUE_SIZE: int = 50
+    LLM_ADMISSION_MAX_WAIT_SECONDS: float = 15.0
+
+    ASSESSMENT_WORKER_CONCURRENCY: int = 2
+    ASSESSMENT_JOB_MAX_ATTEMPTS: int = 3
+    ASSESSMENT_JOB_STALE_SECONDS: int = 300
+    ASSESSMENT_JOB_RETRY_DELAY_SECONDS: float = 30.0
+
+    DEFAULT_FEEDBACK_MODE: Literal["per_answer", "deferred"] = "per_answer"
+
+    FEEDBACK_CACHE_ENABLED: bool = True
+    FEEDBACK_CACHE_MAX_ENTRIES: int = 2000
+    FEEDBACK_CACHE_TTL_SECONDS: int = 86400
+    FEEDBACK_CACHE_USE_MONGO: bool = False
+
+    DB_APPLY_INDEXES_ON_STARTUP: bool = True
+
+    DEFAULT_QSET_CONFIG_CACHE_TTL_SECONDS: float = 300.0
+    DEFAULT_QSET_CONFIG_VERSION_CHECK_SECONDS: float = 5.0
+    QUESTION_SET_CACHE_MAX_ENTRIES: int = 64
+    QUESTION_SET_VERSION_CHECK_SECONDS: float = 5.0
+    QUESTION_SET_BULK_BATCH_SIZE: int = 200
+    QUESTION_SET_BULK_MAX_LINE_BYTES: int = 1_000_000
+    INTERVIEW_EXPORT_BATCH_SIZE: int = 500
+
+    INTERVIEW_SWEEPER_ENABLED: bool = True
+    INTERVIEW_SWEEPER_INTERVAL_SECONDS: float = 300.0
+    INTERVIEW_SWEEPER_LEASE_SECONDS: float = 900.0
+    INTERVIEW_ABANDON_AFTER_MINUTES: int = 1440
+    INTERVIEW_ARCHIVE_AFTER_DAYS: int = 90
+    INTERVIEW_ARCHIVE_BATCH_SIZE: int = 200
+
+    IDEMPOTENCY_MAX_ENTRIES: int = 2000
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_SECONDS: float = 120.0
+    IDEMPOTENCY_WAIT_SECONDS: float = 40.0
+    IDEMPOTENCY_USE_MONGO: bool = True
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -0,0 +1,108 @@
+# backend/app/config_cache.py
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .config import settings
+from .models import DEFAULT_SETTINGS_ID
+
+
+class DefaultQuestionSetConfigCache:
+    # Per-worker copy of the default question set configuration. Writers bump a
+    # `version` field on the settings document; every worker re-checks that
+    # version (a tiny _id lookup) at most every `version_check_seconds`, and
+    # the TTL forces a full reload even if a writer forgot to bump it.
+
+    def __init__(self, ttl_seconds: float, version_check_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self.config_doc: Optional[Dict[str, Any]] = None
+        self.version: Optional[int] = None
+        self.loaded_at = 0.0
+        self.checked_at = 0.0
+        self._load_lock = asyncio.Lock()
+        self._load_count = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self.stale_reloads = 0
+        self.ttl_reloads = 0
+        self.last_staleness_seconds: Optional[float] = None
+        self.max_staleness_seconds: Optional[float] = None
+
+    def invalidate(self):
+        self.config_doc = None
+
+    async def _load(self, db: AsyncIOMotorDatabase):
+        config_doc = await db.get_collection("settings").find_one({"_id": DEFAULT_SETTINGS_ID})
+        now = time.monotonic()
+        self.config_doc = config_doc or {}
+        self.version = self.config_doc.get("version", 0)
+        self.loaded_at = now
+        self.checked_at = now
+        self._load_count += 1
+
+    def _record_staleness(self, changed_at: Optional[datetime]):
+        if not isinstance(changed_at, datetime):
+            return
+        if changed_at.tzinfo is None:
+            changed_at = changed_at.replace(tzinfo=timezone.utc)
+        staleness = max(0.0, (datetime.now(timezone.utc) - changed_at).total_seconds())
+        self.last_staleness_seconds = round(staleness, 3)
+        self.max_staleness_seconds = max(self.max_staleness_seconds or 0.0, self.last_staleness_seconds)
+
+    async def get(self, db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+        now = time.monotonic()
+        if self.config_doc is not None and now - self.loaded_at < self.ttl_seconds:
+            if now - self.checked_at < self.version_check_seconds:
+                self.hits += 1
+                return self.config_doc
+
+            self.version_checks += 1
+            self.checked_at = now
+            version_doc = await db.get_collection("settings").find_one(
+                {"_id": DEFAULT_SETTINGS_ID}, {"version": 1, "updated_at": 1}
+            )
+            if (version_doc or {}).get("version", 0) == self.version:
+                self.hits += 1
+                return self.config_doc
+            self.stale_reloads += 1
+            self._record_staleness((version_doc or {}).get("updated_at"))
+        elif self.config_doc is not None:
+            self.ttl_reloads += 1
+
+        self.misses += 1
+        load_count_before_wait = self._load_count
+        async with self._load_lock:
+            # Concurrent misses share the reload done by whoever got the lock first.
+            if self._load_count == load_count_before_wait:
+                await self._load(db)
+        return self.config_doc
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "cached": self.config_doc is not None,
+            "version": self.version,
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.config_doc is not None else None,
+            "ttl_seconds": self.ttl_seconds,
+            "version_check_seconds": self.version_check_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "version_checks": self.version_checks,
+            "stale_reloads": self.stale_reloads,
+            "ttl_reloads": self.ttl_reloads,
+            "last_staleness_seconds": self.last_staleness_seconds,
+            "max_staleness_seconds": self.max_staleness_seconds,
+        }
+
+
+default_qset_config_cache = DefaultQuestionSetConfigCache(
+    ttl_seconds=settings.DEFAULT_QSET_CONFIG_CACHE_TTL_SECONDS,
+    version_check_seconds=settings.DEFAULT_QSET_CONFIG_VERSION_CHECK_SECONDS,
+)
@@ -1,9 +1,11 @@
 # backend/app/db.py
+from typing import Any, Dict
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo.errors import ConnectionFailure
 
 from .config import settings
+from .db_monitoring import mongo_metrics
 
 class MongoDBConnectionManager:
     client: AsyncIOMotorClient = None
@@ -11,26 +13,49 @@ class MongoDBConnectionManager:
 
 db_manager = MongoDBConnectionManager()
 
+
+def mongo_client_options() -> Dict[str, Any]:
+    client_options: Dict[str, Any] = {
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "maxConnecting": settings.MONGO_MAX_CONNECTING,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "readPreference": settings.MONGO_READ_PREFERENCE,
+    }
+    compressors = [c.strip() for c in settings.MONGO_COMPRESSORS.split(",") if c.strip()]
+    if compressors:
+        client_options["compressors"] = compressors
+    if settings.MONGO_COMMAND_MONITORING_ENABLED:
+        client_options["event_listeners"] = [mongo_metrics]
+    return client_options
+
+def mongo_connection_uri() -> str:
+    separator = '&' if '?' in settings.MONGODB_URL else '?'
+    return f"{settings.MONGODB_URL}{separator}uuidRepresentation=standard&tz_aware=true"
+
 async def connect_to_mongo():
     if db_manager.client and db_manager.database:
         print("MongoDB connection already established.")
         return
 
-    separator = '&' if '?' in settings.MONGODB_URL else '?'
-    connection_uri = f"{settings.MONGODB_URL}{separator}uuidRepresentation=standard&tz_aware=true"
+    connection_uri = mongo_connection_uri()
 
     print(f"Attempting to connect to MongoDB with URI: {connection_uri}")
     try:
         db_manager.client = AsyncIOMotorClient(
             connection_uri, # Sử dụng URI đã bổ sung tùy chọn
-            serverSelectionTimeoutMS=5000
+            **mongo_client_options()
         )
 
         await db_manager.client.admin.command('ping')
         db_manager.database = db_manager.client[settings.DATABASE_NAME]
 
         print(f"Successfully connected to MongoDB database: '{settings.DATABASE_NAME}' "
-              f"with options from URI (uuidRepresentation=standard, tz_aware=true).")
+              f"with options from URI (uuidRepresentation=standard, tz_aware=true), "
+              f"maxPoolSize={settings.MONGO_MAX_POOL_SIZE}, readPreference={settings.MONGO_READ_PREFERENCE}, "
+              f"compressors={settings.MONGO_COMPRESSORS or 'none'}.")
 
     except ConnectionFailure as ce:
         print(f"MongoDB Connection Failure: Could not connect to server. URI: '{connection_uri}'. Error: {ce}")
@@ -0,0 +1,246 @@
+# backend/app/db_indexes.py
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+
+from .config import settings
+from .feedback_cache import FEEDBACK_CACHE_COLLECTION
+from .idempotency import IDEMPOTENCY_COLLECTION
+from .interview_archive import INTERVIEW_ARCHIVE_COLLECTION
+from .search_index import SEARCH_ENTRIES_FIELD, SEARCH_PROFILE_FIELD
+
+IndexKeys = List[Tuple[str, Union[int, str]]]
+
+
+def _normalize_keys(keys: List[Tuple[str, Any]]) -> List[Tuple[str, Union[int, str]]]:
+    return [(field, direction if isinstance(direction, str) else int(direction)) for field, direction in keys]
+
+
+class IndexSpec:
+    def __init__(self, collection: str, keys: IndexKeys, name: str, unique: bool = False,
+                 sparse: bool = False, expire_after_seconds: Optional[int] = None,
+                 partial_filter: Optional[Dict[str, Any]] = None, weights: Optional[Dict[str, int]] = None,
+                 default_language: Optional[str] = None, enabled: bool = True, reason: str = ""):
+        self.collection = collection
+        self.keys = keys
+        self.name = name
+        self.unique = unique
+        self.sparse = sparse
+        self.expire_after_seconds = expire_after_seconds
+        self.partial_filter = partial_filter
+        self.weights = weights
+        self.default_language = default_language
+        self.enabled = enabled
+        self.reason = reason
+
+    def create_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        if self.partial_filter:
+            options["partialFilterExpression"] = self.partial_filter
+        if self.weights:
+            options["weights"] = self.weights
+        if self.default_language:
+            options["default_language"] = self.default_language
+        return options
+
+    @property
+    def is_text(self) -> bool:
+        return any(direction == TEXT for _, direction in self.keys)
+
+    def matches(self, index_info: Dict[str, Any]) -> bool:
+        if self.is_text:
+            # Text indexes report their fields as weights (the key is _fts/_ftsx).
+            expected_weights = self.weights or {field: 1 for field, direction in self.keys if direction == TEXT}
+            return dict(index_info.get("weights", {})) == expected_weights \
+                and index_info.get("default_language", "english") == (self.default_language or "english")
+        existing_keys = _normalize_keys(index_info.get("key", []))
+        return existing_keys == self.keys \
+            and bool(index_info.get("unique", False)) == self.unique \
+            and bool(index_info.get("sparse", False)) == self.sparse \
+            and index_info.get("expireAfterSeconds") == self.expire_after_seconds \
+            and (index_info.get("partialFilterExpression") or None) == (self.partial_filter or None)
+
+
+# The indexes every query path relies on. Settings documents are only ever
+# read by _id, so that collection needs nothing beyond the default index.
+INDEX_REGISTRY: List[IndexSpec] = [
+    IndexSpec("interviews", [("lifecycle_status", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)],
+              name="lifecycle_status_updated_at",
+              reason="Admin interview list filtered by lifecycle status, keyset-paginated newest first; "
+                     "also the sweeper's idle and archivable interview scans."),
+    IndexSpec("interviews", [("overall_assessment.status", ASCENDING), ("updated_at", DESCENDING),
+                             ("_id", DESCENDING)],
+              name="assessment_status_updated_at",
+              reason="Admin interview list filtered by assessment result."),
+    IndexSpec("interviews", [("updated_at", DESCENDING), ("_id", DESCENDING)],
+              name="updated_at",
+              reason="Admin interview list with all statuses."),
+    IndexSpec("interviews", [("assessment_job_status", ASCENDING)],
+              name="assessment_job_status", sparse=True,
+              reason="Re-queueing pending/stale final assessment jobs at startup."),
+    IndexSpec("interviews", [("batch_feedback_jobs.general.status", ASCENDING)],
+              name="batch_feedback_general_status", sparse=True,
+              reason="Re-queueing deferred general feedback jobs."),
+    IndexSpec("interviews", [("batch_feedback_jobs.specialized.status", ASCENDING)],
+              name="batch_feedback_specialized_status", sparse=True,
+              reason="Re-queueing deferred specialized feedback jobs."),
+    IndexSpec("interviews", [(SEARCH_PROFILE_FIELD, TEXT), (SEARCH_ENTRIES_FIELD, TEXT)],
+              name="interview_search_text", weights={SEARCH_PROFILE_FIELD: 3, SEARCH_ENTRIES_FIELD: 1},
+              default_language="none",
+              reason="Admin interview search; a collection can only have one text index."),
+    IndexSpec(INTERVIEW_ARCHIVE_COLLECTION, [("updated_at", DESCENDING), ("_id", DESCENDING)],
+              name="updated_at",
+              reason="Admin interview list falls back to the archive, same order as the hot collection."),
+    IndexSpec(INTERVIEW_ARCHIVE_COLLECTION, [("lifecycle_status", ASCENDING), ("updated_at", DESCENDING),
+                                             ("_id", DESCENDING)],
+              name="lifecycle_status_updated_at",
+              reason="Archived completed/abandoned list filters."),
+    IndexSpec(INTERVIEW_ARCHIVE_COLLECTION, [("overall_assessment.status", ASCENDING), ("updated_at", DESCENDING),
+                                             ("_id", DESCENDING)],
+              name="assessment_status_updated_at",
+              reason="Archived list filtered by assessment status."),
+    IndexSpec(INTERVIEW_ARCHIVE_COLLECTION, [(SEARCH_PROFILE_FIELD, TEXT), (SEARCH_ENTRIES_FIELD, TEXT)],
+              name="interview_search_text", weights={SEARCH_PROFILE_FIELD: 3, SEARCH_ENTRIES_FIELD: 1},
+              default_language="none",
+              reason="Admin interview search over archived interviews."),
+    IndexSpec("question_sets", [("id_name", ASCENDING)],
+              name="id_name_unique", unique=True,
+              reason="Every question set route looks sets up by id_name."),
+    IndexSpec(FEEDBACK_CACHE_COLLECTION, [("expires_at", ASCENDING)],
+              name="expires_at_ttl", expire_after_seconds=0, enabled=settings.FEEDBACK_CACHE_USE_MONGO,
+              reason="Mongo TTL monitor removes expired shared feedback cache entries."),
+    IndexSpec(IDEMPOTENCY_COLLECTION, [("expires_at", ASCENDING)],
+              name="expires_at_ttl", expire_after_seconds=0, enabled=settings.IDEMPOTENCY_USE_MONGO,
+              reason="Mongo TTL monitor removes expired Idempotency-Key records."),
+]
+
+# Indexes this registry used to create and no longer wants; apply drops them.
+RETIRED_INDEXES: List[Tuple[str, str]] = [
+    # question_sets is a few hundred documents reached through id_name_unique;
+    # the extra index only cost writes.
+    ("question_sets", "field_type"),
+]
+
+
+def registry_by_collection() -> Dict[str, List[IndexSpec]]:
+    specs_by_collection: Dict[str, List[IndexSpec]] = {}
+    for spec in INDEX_REGISTRY:
+        if spec.enabled:
+            specs_by_collection.setdefault(spec.collection, []).append(spec)
+    return specs_by_collection
+
+
+async def apply_index_registry(db_instance: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    # Idempotent: existing matching indexes are left alone, a managed index whose
+    # definition changed is rebuilt, and only RETIRED_INDEXES are dropped; other
+    # indexes not in the registry are left alone.
+    result: Dict[str, List[str]] = {"created": [], "rebuilt": [], "unchanged": [], "dropped": [], "failed": []}
+    if db_instance is None:
+        return result
+
+    for collection_name, specs in registry_by_collection().items():
+        collection = db_instance.get_collection(collection_name)
+        try:
+            existing_indexes = await collection.index_information()
+        except OperationFailure:
+            existing_indexes = {}
+
+        for spec in specs:
+            qualified_name = f"{collection_name}.{spec.name}"
+            existing = existing_indexes.get(spec.name)
+            try:
+                if existing is not None and spec.matches(existing):
+                    result["unchanged"].append(qualified_name)
+                    continue
+                if existing is not None:
+                    print(f"Index '{qualified_name}' definition changed; rebuilding.")
+                    await collection.drop_index(spec.name)
+                    await collection.create_index(spec.keys, **spec.create_options())
+                    result["rebuilt"].append(qualified_name)
+                    continue
+                same_keys = [name for name, info in existing_indexes.items()
+                             if _normalize_keys(info.get("key", [])) == spec.keys
+                             or (spec.is_text and "_fts" in dict(info.get("key", [])))]
+                if same_keys:
+                    print(f"WARNING: Index '{qualified_name}' not created: same keys already indexed as {same_keys}.")
+                    result["failed"].append(qualified_name)
+                    continue
+                await collection.create_index(spec.keys, **spec.create_options())
+                result["created"].append(qualified_name)
+            except Exception as e:
+                # e.g. duplicate id_name values blocking the unique index; keep starting up.
+                print(f"ERROR creating index '{qualified_name}': {str(e)}")
+                result["failed"].append(qualified_name)
+
+    for collection_name, index_name in RETIRED_INDEXES:
+        qualified_name = f"{collection_name}.{index_name}"
+        collection = db_instance.get_collection(collection_name)
+        try:
+            if index_name in await collection.index_information():
+                await collection.drop_index(index_name)
+                result["dropped"].append(qualified_name)
+        except Exception as e:
+            print(f"ERROR dropping retired index '{qualified_name}': {str(e)}")
+            result["failed"].append(qualified_name)
+
+    print(f"Index registry applied: {len(result['created'])} created, {len(result['rebuilt'])} rebuilt, "
+          f"{len(result['unchanged'])} unchanged, {len(result['dropped'])} dropped, {len(result['failed'])} failed.")
+    return result
+
+
+async def _index_usage(collection) -> Optional[Dict[str, Dict[str, Any]]]:
+    try:
+        usage: Dict[str, Dict[str, Any]] = {}
+        async for stats_doc in collection.aggregate([{"$indexStats": {}}]):
+            accesses = stats_doc.get("accesses", {})
+            usage[stats_doc["name"]] = {"ops": int(accesses.get("ops", 0)), "since": accesses.get("since")}
+        return usage
+    except Exception as e:
+        print(f"WARNING: $indexStats not available for '{collection.name}': {str(e)}")
+        return None
+
+
+async def build_index_report(db_instance: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    # Usage counters ($indexStats) reset on server restart and are per mongod
+    # node, so "unused" means unused since `since` on the node that answered.
+    report: Dict[str, Any] = {}
+    for collection_name, specs in registry_by_collection().items():
+        collection = db_instance.get_collection(collection_name)
+        try:
+            existing_indexes = await collection.index_information()
+        except OperationFailure:
+            existing_indexes = {}
+        usage = await _index_usage(collection)
+        specs_by_name = {spec.name: spec for spec in specs}
+
+        indexes = []
+        for index_name, index_info in existing_indexes.items():
+            spec = specs_by_name.get(index_name)
+            indexes.append({
+                "name": index_name,
+                "keys": [[field, direction] for field, direction in index_info.get("key", [])],
+                "managed": spec is not None,
+                "definition_matches": spec.matches(index_info) if spec else None,
+                "ops": usage.get(index_name, {}).get("ops") if usage is not None else None,
+                "since": usage.get(index_name, {}).get("since") if usage is not None else None,
+            })
+
+        report[collection_name] = {
+            "indexes": indexes,
+            "missing": [{"name": spec.name, "keys": [[f, d] for f, d in spec.keys], "reason": spec.reason}
+                        for spec in specs if spec.name not in existing_indexes],
+            "unused": [entry["name"] for entry in indexes
+                       if entry["name"] != "_id_" and entry["ops"] == 0],
+            "unmanaged": [entry["name"] for entry in indexes
+                          if entry["name"] != "_id_" and not entry["managed"]],
+            "usage_available": usage is not None,
+        }
+    return report
@@ -0,0 +1,175 @@
+# backend/app/db_monitoring.py
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from pymongo import monitoring
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.bucket_counts: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        # Upper bound of the bucket holding the percentile (an over-estimate by design).
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        running = 0
+        for bucket_index, bucket_count in enumerate(self.bucket_counts):
+            running += bucket_count
+            if running >= target:
+                return LATENCY_BUCKETS_MS[bucket_index] if bucket_index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class MongoMetricsListener(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    # pymongo calls listeners synchronously from whatever thread runs the
+    # operation (Motor uses a thread pool), so every update takes the lock.
+    # Counts are per gunicorn worker; the Prometheus output labels them by pid.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.command_latency: Dict[str, LatencyHistogram] = {}
+        self.command_failures: Counter = Counter()
+        self.checkout_wait = LatencyHistogram()
+        self.checkout_failures: Counter = Counter()
+        self.connections_created = 0
+        self.connections_closed: Counter = Counter()
+        self.pools_cleared = 0
+        self.checked_out = 0
+
+    # CommandListener
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        with self._lock:
+            self.command_latency.setdefault(event.command_name, LatencyHistogram()) \
+                .observe(event.duration_micros / 1000.0)
+
+    def failed(self, event):
+        with self._lock:
+            self.command_latency.setdefault(event.command_name, LatencyHistogram()) \
+                .observe(event.duration_micros / 1000.0)
+            self.command_failures[event.command_name] += 1
+
+    # ConnectionPoolListener
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed[event.reason] += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures[event.reason] += 1
+            self.checkout_wait.observe(getattr(event, "duration", 0.0) * 1000.0)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checked_out += 1
+            self.checkout_wait.observe(getattr(event, "duration", 0.0) * 1000.0)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "commands": {name: histogram.snapshot() for name, histogram in sorted(self.command_latency.items())},
+                "command_failures": dict(self.command_failures),
+                "pool": {
+                    "checked_out": self.checked_out,
+                    "checkout_wait": self.checkout_wait.snapshot(),
+                    "checkout_failures": dict(self.checkout_failures),
+                    "connections_created": self.connections_created,
+                    "connections_closed": dict(self.connections_closed),
+                    "pools_cleared": self.pools_cleared,
+                },
+            }
+
+    def prometheus_text(self) -> str:
+        worker = f'pid="{os.getpid()}"'
+        lines: List[str] = []
+
+        def histogram_lines(metric: str, labels: str, histogram: LatencyHistogram):
+            running = 0
+            for upper_bound, bucket_count in zip(LATENCY_BUCKETS_MS + (float("inf"),), histogram.bucket_counts):
+                running += bucket_count
+                le = "+Inf" if upper_bound == float("inf") else f"{upper_bound / 1000.0:g}"
+                lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {running}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.sum_ms / 1000.0:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+        with self._lock:
+            lines.append("# TYPE mongo_command_duration_seconds histogram")
+            for name, histogram in sorted(self.command_latency.items()):
+                histogram_lines("mongo_command_duration_seconds", f'{worker},command="{name}"', histogram)
+            lines.append("# TYPE mongo_command_failures_total counter")
+            for name, failures in sorted(self.command_failures.items()):
+                lines.append(f'mongo_command_failures_total{{{worker},command="{name}"}} {failures}')
+            lines.append("# TYPE mongo_pool_checkout_wait_seconds histogram")
+            histogram_lines("mongo_pool_checkout_wait_seconds", worker, self.checkout_wait)
+            lines.append("# TYPE mongo_pool_checkout_failures_total counter")
+            for reason, failures in sorted(self.checkout_failures.items()):
+                lines.append(f'mongo_pool_checkout_failures_total{{{worker},reason="{reason}"}} {failures}')
+            lines.append("# TYPE mongo_pool_checked_out_connections gauge")
+            lines.append(f"mongo_pool_checked_out_connections{{{worker}}} {self.checked_out}")
+            lines.append("# TYPE mongo_pool_connections_created_total counter")
+            lines.append(f"mongo_pool_connections_created_total{{{worker}}} {self.connections_created}")
+            lines.append("# TYPE mongo_pool_connections_closed_total counter")
+            for reason, closed in sorted(self.connections_closed.items()):
+                lines.append(f'mongo_pool_connections_closed_total{{{worker},reason="{reason}"}} {closed}')
+            lines.append("# TYPE mongo_pool_cleared_total counter")
+            lines.append(f"mongo_pool_cleared_total{{{worker}}} {self.pools_cleared}")
+        return "\n".join(lines) + "\n"
+
+
+mongo_metrics = MongoMetricsListener()
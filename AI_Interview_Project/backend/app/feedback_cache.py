@@ -0,0 +1,129 @@
+# backend/app/feedback_cache.py
+import hashlib
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+from .config import settings
+from .db import db_manager
+
+FEEDBACK_CACHE_COLLECTION = "feedback_cache"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_answer_text(answer_text: str) -> str:
+    normalized = unicodedata.normalize("NFC", answer_text).casefold()
+    normalized = _WHITESPACE_RE.sub(" ", normalized)
+    return normalized.strip(" .,!?;:\"'")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class FeedbackCache:
+    # Per-worker LRU + TTL cache of per-answer AI feedback, optionally backed by a
+    # shared Mongo collection so hits are reused across gunicorn workers.
+
+    def __init__(self, max_entries: int, ttl_seconds: int, enabled: bool = True, use_mongo: bool = False):
+        self.enabled = enabled
+        self.use_mongo = use_mongo
+        self.ttl_seconds = ttl_seconds
+        self.local_cache: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+        self.local_hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def make_key(question_id: Any, question_text: str, answer_text: str, prompt_version: str) -> str:
+        return _sha256("|".join([
+            prompt_version,
+            str(question_id),
+            _sha256(question_text),
+            _sha256(normalize_answer_text(answer_text)),
+        ]))
+
+    def _mongo_collection(self):
+        if not self.use_mongo or db_manager.database is None:
+            return None
+        return db_manager.database.get_collection(FEEDBACK_CACHE_COLLECTION)
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        cached_feedback = self.local_cache.get(key)
+        if cached_feedback is not None:
+            self.local_hits += 1
+            return cached_feedback
+
+        collection = self._mongo_collection()
+        if collection is not None:
+            try:
+                doc = await collection.find_one(
+                    {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+                    {"feedback": 1}
+                )
+            except Exception as e:
+                print(f"ERROR reading feedback cache from MongoDB: {str(e)}")
+                doc = None
+            if doc:
+                self.mongo_hits += 1
+                self.local_cache[key] = doc["feedback"]
+                return doc["feedback"]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, feedback: str):
+        if not self.enabled:
+            return
+
+        self.local_cache[key] = feedback
+        self.stores += 1
+
+        collection = self._mongo_collection()
+        if collection is not None:
+            current_time = datetime.now(timezone.utc)
+            try:
+                await collection.update_one(
+                    {"_id": key},
+                    {"$set": {"feedback": feedback,
+                              "created_at": current_time,
+                              "expires_at": current_time + timedelta(seconds=self.ttl_seconds)}},
+                    upsert=True
+                )
+            except Exception as e:
+                print(f"ERROR writing feedback cache to MongoDB: {str(e)}")
+
+    def clear(self):
+        self.local_cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.mongo_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "use_mongo": self.use_mongo,
+            "size": len(self.local_cache),
+            "max_entries": self.local_cache.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "local_hits": self.local_hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": round((self.local_hits + self.mongo_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+feedback_cache = FeedbackCache(
+    max_entries=settings.FEEDBACK_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.FEEDBACK_CACHE_TTL_SECONDS,
+    enabled=settings.FEEDBACK_CACHE_ENABLED,
+    use_mongo=settings.FEEDBACK_CACHE_USE_MONGO,
+)
+
@@ -1,2 +1,2 @@
 # backend/app/globals.py
-gemini_model = None
\ No newline at end of file
+llm_router = None
\ No newline at end of file
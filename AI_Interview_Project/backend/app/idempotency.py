@@ -0,0 +1,211 @@
+# backend/app/idempotency.py
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+from uuid import uuid4
+
+from cachetools import TTLCache
+from fastapi import HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from .config import settings
+
+IDEMPOTENCY_COLLECTION = "idempotency_keys"
+IDEMPOTENCY_POLL_SECONDS = 0.25
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    # Replays the stored response for a retried request carrying the same
+    # Idempotency-Key instead of running it (and the LLM call) again.
+    # - Finished responses: per-worker TTL cache, backed by a Mongo record that
+    #   expires through a TTL index.
+    # - Duplicates in the same worker wait on the in-flight future.
+    # - Duplicates in other workers find the Mongo claim and poll it until the
+    #   owner stores the response, or take it over once its lock expires.
+    # Failed requests release the key, so the retry runs again.
+
+    def __init__(self, max_entries: int, ttl_seconds: int, lock_seconds: float, wait_seconds: float,
+                 use_mongo: bool = True):
+        self.use_mongo = use_mongo
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.wait_seconds = wait_seconds
+        self.local_responses: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+        self.in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self.local_replays = 0
+        self.mongo_replays = 0
+        self.coalesced = 0
+        self.executions = 0
+        self.conflicts = 0
+
+    @staticmethod
+    def make_record_id(scope: str, idempotency_key: str) -> str:
+        return _sha256(f"{scope}|{idempotency_key}")
+
+    @staticmethod
+    def _retry_later(detail: str) -> HTTPException:
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail, headers={"Retry-After": "1"})
+
+    def _mismatch(self) -> HTTPException:
+        self.conflicts += 1
+        return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                             detail="Idempotency-Key was already used for a different request.")
+
+    async def run(self, db: AsyncIOMotorDatabase, scope: str, idempotency_key: str, fingerprint: str,
+                  response_model: Type[ResponseModel],
+                  compute: Callable[[], Awaitable[ResponseModel]]) -> ResponseModel:
+        record_id = self.make_record_id(scope, idempotency_key)
+
+        cached = self.local_responses.get(record_id)
+        if cached is not None:
+            cached_fingerprint, response_data = cached
+            if cached_fingerprint != fingerprint:
+                raise self._mismatch()
+            self.local_replays += 1
+            return response_model(**response_data)
+
+        running = self.in_flight.get(record_id)
+        if running is not None:
+            running_fingerprint, running_future = running
+            if running_fingerprint != fingerprint:
+                raise self._mismatch()
+            self.coalesced += 1
+            return await asyncio.shield(running_future)
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[record_id] = (fingerprint, future)
+        try:
+            response = await self._run_once(db, record_id, fingerprint, response_model, compute)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            # The owner's client went away; duplicates waiting on it were not
+            # cancelled, so they get a retryable error instead.
+            future.set_exception(self._retry_later("The original request with this Idempotency-Key was "
+                                                   "interrupted; please retry."))
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved so asyncio does not warn when nobody else was waiting.
+            future.exception()
+            raise
+        finally:
+            self.in_flight.pop(record_id, None)
+
+    async def _run_once(self, db: AsyncIOMotorDatabase, record_id: str, fingerprint: str,
+                        response_model: Type[ResponseModel],
+                        compute: Callable[[], Awaitable[ResponseModel]]) -> ResponseModel:
+        collection = db.get_collection(IDEMPOTENCY_COLLECTION) if self.use_mongo and db is not None else None
+        owner = uuid4().hex
+
+        if collection is not None:
+            try:
+                stored_response = await self._wait_for_claim(collection, record_id, fingerprint, owner)
+            except HTTPException:
+                raise
+            except Exception as e:
+                # Losing cross-worker dedupe is better than failing the candidate's request.
+                print(f"ERROR claiming idempotency key in MongoDB: {str(e)}")
+                collection = None
+                stored_response = None
+            if stored_response is not None:
+                self.mongo_replays += 1
+                self.local_responses[record_id] = (fingerprint, stored_response)
+                return response_model(**stored_response)
+
+        self.executions += 1
+        try:
+            response = await compute()
+        except BaseException:
+            if collection is not None:
+                try:
+                    await collection.delete_one({"_id": record_id, "owner": owner})
+                except Exception as e:
+                    print(f"ERROR releasing idempotency key in MongoDB: {str(e)}")
+            raise
+
+        response_data = response.model_dump(mode="json")
+        self.local_responses[record_id] = (fingerprint, response_data)
+        if collection is not None:
+            try:
+                await collection.update_one(
+                    {"_id": record_id, "owner": owner},
+                    {"$set": {"status": "completed", "response": response_data,
+                              "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)}}
+                )
+            except Exception as e:
+                print(f"ERROR storing idempotent response in MongoDB: {str(e)}")
+        return response
+
+    async def _wait_for_claim(self, collection, record_id: str, fingerprint: str,
+                              owner: str) -> Optional[Dict[str, Any]]:
+        # Returns the stored response, or None once this call owns the key.
+        wait_deadline = time.monotonic() + self.wait_seconds
+        while True:
+            now = datetime.now(timezone.utc)
+            claim = {"owner": owner, "locked_until": now + timedelta(seconds=self.lock_seconds)}
+            try:
+                await collection.insert_one({
+                    "_id": record_id, "status": "in_progress", "fingerprint": fingerprint, **claim,
+                    "created_at": now, "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                })
+                return None
+            except DuplicateKeyError:
+                pass
+
+            # A missing record means the owner failed and released the key: it is
+            # claimed on the next loop, after the same wait as an in-progress one.
+            record = await collection.find_one({"_id": record_id})
+            if record is not None:
+                if record.get("fingerprint") != fingerprint:
+                    raise self._mismatch()
+                if record.get("status") == "completed":
+                    return record["response"]
+
+                # The owner died mid-request (worker killed): take the key over.
+                taken_over = await collection.find_one_and_update(
+                    {"_id": record_id, "status": "in_progress", "locked_until": {"$lt": now}},
+                    {"$set": claim},
+                    return_document=ReturnDocument.AFTER
+                )
+                if taken_over is not None:
+                    return None
+
+            if time.monotonic() >= wait_deadline:
+                self.conflicts += 1
+                raise self._retry_later("A request with this Idempotency-Key is still in progress.")
+            await asyncio.sleep(IDEMPOTENCY_POLL_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "use_mongo": self.use_mongo,
+            "size": len(self.local_responses),
+            "in_flight": len(self.in_flight),
+            "ttl_seconds": self.ttl_seconds,
+            "local_replays": self.local_replays,
+            "mongo_replays": self.mongo_replays,
+            "coalesced": self.coalesced,
+            "executions": self.executions,
+            "conflicts": self.conflicts,
+        }
+
+
+idempotency_store = IdempotencyStore(
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+    use_mongo=settings.IDEMPOTENCY_USE_MONGO,
+)
@@ -0,0 +1,31 @@
+# backend/app/interview_archive.py
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# Finished interviews are moved out of the hot collection by the sweeper
+# (see interview_sweeper.py). Documents keep their _id and shape, so admin reads
+# query the hot collection first and then the archive.
+INTERVIEW_COLLECTION = "interviews"
+INTERVIEW_ARCHIVE_COLLECTION = "interviews_archive"
+INTERVIEW_COLLECTIONS = (INTERVIEW_COLLECTION, INTERVIEW_ARCHIVE_COLLECTION)
+
+
+async def find_interview(db: AsyncIOMotorDatabase, query: Dict[str, Any],
+                         projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    for collection_name in INTERVIEW_COLLECTIONS:
+        interview_doc = await db.get_collection(collection_name).find_one(query, projection)
+        if interview_doc:
+            return interview_doc
+    return None
+
+
+async def iter_all_interviews(db: AsyncIOMotorDatabase,
+                              open_cursor: Callable[[Any], Any]) -> AsyncIterator[Dict[str, Any]]:
+    # Runs the same cursor over the hot collection, then the archive. Used for
+    # streams, so there is no dedupe: the sweeper removes an archive copy whose
+    # hot delete missed, and only a worker crash between its copy and delete
+    # leaves a document in both until the next pass.
+    for collection_name in INTERVIEW_COLLECTIONS:
+        async for interview_doc in open_cursor(db.get_collection(collection_name)):
+            yield interview_doc
@@ -0,0 +1,119 @@
+# backend/app/interview_export.py
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List
+from uuid import UUID
+
+from bson import ObjectId
+
+from .models import CandidateInfoPayload, OverallAssessment
+
+# Export column -> dotted path in the interview document. candidate_info_raw
+# and overall_assessment are flattened into one column per field.
+INTERVIEW_EXPORT_COLUMNS: Dict[str, str] = {
+    "id": "_id",
+    "lifecycle_status": "lifecycle_status",
+    "selected_field": "selected_field",
+    "desired_position_in_field": "desired_position_in_field",
+    "general_question_set_id_name": "general_question_set_id_name",
+    "specialized_question_set_id_name": "specialized_question_set_id_name",
+    "start_time": "start_time",
+    "updated_at": "updated_at",
+    "end_time": "end_time",
+    "is_completed": "is_completed",
+    "assessment_job_status": "assessment_job_status",
+    **{f"candidate_{name}": f"candidate_info_raw.{name}" for name in CandidateInfoPayload.model_fields},
+    **{f"assessment_{name}": f"overall_assessment.{name}" for name in OverallAssessment.model_fields
+       if name != "raw_ai_summary_text"},
+}
+
+
+def resolve_export_columns(fields: str) -> List[str]:
+    # Raises ValueError naming the unknown columns.
+    if not fields:
+        return list(INTERVIEW_EXPORT_COLUMNS)
+    columns = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown_columns = [name for name in columns if name not in INTERVIEW_EXPORT_COLUMNS]
+    if unknown_columns:
+        raise ValueError(f"Unknown export fields: {', '.join(unknown_columns)}.")
+    return columns
+
+
+def build_export_projection(columns: List[str]) -> Dict[str, int]:
+    projection = {INTERVIEW_EXPORT_COLUMNS[name]: 1 for name in columns}
+    if "_id" not in projection:
+        projection["_id"] = 0
+    return projection
+
+
+def _get_path(interview_doc: Dict[str, Any], dotted_path: str) -> Any:
+    value: Any = interview_doc
+    for key in dotted_path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (ObjectId, UUID)):
+        return str(value)
+    if isinstance(value, list):
+        return [_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    return value
+
+
+# Leading characters that make spreadsheet apps evaluate a cell as a formula.
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _neutralize_formula(cell: str) -> str:
+    # Candidate-controlled text opened by recruiters in Excel/Sheets (CSV injection).
+    return "'" + cell if cell.startswith(CSV_FORMULA_PREFIXES) else cell
+
+
+def _csv_value(value: Any) -> Any:
+    value = _json_value(value)
+    if value is None:
+        return ""
+    if isinstance(value, list) and all(not isinstance(item, (dict, list)) for item in value):
+        return _neutralize_formula("; ".join(str(item) for item in value))
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, str):
+        return _neutralize_formula(value)
+    return value
+
+
+def flatten_interview(interview_doc: Dict[str, Any], columns: List[str]) -> Dict[str, Any]:
+    return {name: _json_value(_get_path(interview_doc, INTERVIEW_EXPORT_COLUMNS[name])) for name in columns}
+
+
+async def iter_ndjson_rows(interview_cursor, columns: List[str]) -> AsyncIterator[str]:
+    async for interview_doc in interview_cursor:
+        yield json.dumps(flatten_interview(interview_doc, columns), ensure_ascii=False) + "\n"
+
+
+async def iter_csv_rows(interview_cursor, columns: List[str]) -> AsyncIterator[str]:
+    # One small buffer reused per row, so memory does not grow with the export.
+    row_buffer = io.StringIO()
+    writer = csv.writer(row_buffer)
+
+    def take_row() -> str:
+        row_text = row_buffer.getvalue()
+        row_buffer.seek(0)
+        row_buffer.truncate(0)
+        return row_text
+
+    # BOM so spreadsheet tools detect UTF-8 (Vietnamese names and comments).
+    writer.writerow(columns)
+    yield "\ufeff" + take_row()
+    async for interview_doc in interview_cursor:
+        writer.writerow([_csv_value(_get_path(interview_doc, INTERVIEW_EXPORT_COLUMNS[name])) for name in columns])
+        yield take_row()
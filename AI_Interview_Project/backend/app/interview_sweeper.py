@@ -0,0 +1,234 @@
+# backend/app/interview_sweeper.py
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import DuplicateKeyError
+
+from .analytics import record_rollup, rollup_day, stage_increments
+from .assessment_jobs import JOB_STATE_FIELDS, assessment_job_manager
+from .config import settings
+from .interview_archive import INTERVIEW_ARCHIVE_COLLECTION, INTERVIEW_COLLECTION
+
+LEASE_COLLECTION = "background_leases"
+SWEEPER_LEASE_ID = "interview_sweeper"
+
+ACTIVE_LIFECYCLE_STATUSES = ["info_submitted", "general_in_progress", "awaiting_specialization",
+                             "specialized_in_progress"]
+ARCHIVABLE_LIFECYCLE_STATUSES = ["completed", "abandoned"]
+
+
+class MongoLease:
+    # Leader election across gunicorn workers (and hosts): one document per
+    # lease, owned until expires_at. The holder renews it on every pass; if it
+    # dies, another worker takes over once the lease expires.
+
+    def __init__(self, lease_id: str, lease_seconds: float):
+        self.lease_id = lease_id
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+    async def acquire(self, db: AsyncIOMotorDatabase) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            # Matches only a free, expired or already owned lease; otherwise the
+            # upsert collides on _id and someone else is leader.
+            await db.get_collection(LEASE_COLLECTION).update_one(
+                {"_id": self.lease_id, "$or": [{"expires_at": {"$lte": now}}, {"owner": self.owner}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.lease_seconds),
+                          "renewed_at": now}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def release(self, db: AsyncIOMotorDatabase):
+        await db.get_collection(LEASE_COLLECTION).update_one(
+            {"_id": self.lease_id, "owner": self.owner},
+            {"$set": {"expires_at": datetime.now(timezone.utc)}}
+        )
+
+
+class InterviewSweeper:
+    # Periodic task started from main.lifespan in every worker; only the lease
+    # holder does the work. Each pass re-queues assessment/feedback jobs stuck in
+    # "running", marks interviews idle past INTERVIEW_ABANDON_AFTER_MINUTES as
+    # abandoned, then moves completed and abandoned interviews older than
+    # INTERVIEW_ARCHIVE_AFTER_DAYS to the archive.
+
+    def __init__(self):
+        self.database: Optional[AsyncIOMotorDatabase] = None
+        self.task: Optional[asyncio.Task] = None
+        self.lease = MongoLease(SWEEPER_LEASE_ID, settings.INTERVIEW_SWEEPER_LEASE_SECONDS)
+        self.is_leader = False
+        self.passes = 0
+        self.abandoned_total = 0
+        self.archived_total = 0
+        self.requeued_jobs_total = 0
+        self.last_pass_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.task is not None
+
+    async def start(self, db_instance: AsyncIOMotorDatabase):
+        if not settings.INTERVIEW_SWEEPER_ENABLED:
+            print("Interview sweeper disabled.")
+            return
+        if self.is_running:
+            print("Interview sweeper already running.")
+            return
+        self.database = db_instance
+        self.task = asyncio.create_task(self._sweep_loop())
+        print(f"Started interview sweeper (lease owner {self.lease.owner}).")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        self.task = None
+        if self.is_leader:
+            try:
+                await self.lease.release(self.database)
+            except Exception as e:
+                print(f"WARNING: Could not release interview sweeper lease: {str(e)}")
+            self.is_leader = False
+        self.database = None
+        print("Interview sweeper stopped.")
+
+    async def _sweep_loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"ERROR in interview sweeper: {str(e)}")
+            await asyncio.sleep(settings.INTERVIEW_SWEEPER_INTERVAL_SECONDS)
+
+    async def run_once(self) -> Dict[str, int]:
+        self.is_leader = await self.lease.acquire(self.database)
+        if not self.is_leader:
+            return {"abandoned": 0, "archived": 0}
+
+        if assessment_job_manager.is_running:
+            self.requeued_jobs_total += await assessment_job_manager.requeue_stale_jobs()
+        now = datetime.now(timezone.utc)
+        abandoned_count = await self.mark_abandoned(now)
+        archived_count = await self.archive_finished(now)
+        self.passes += 1
+        self.abandoned_total += abandoned_count
+        self.archived_total += archived_count
+        self.last_pass_at = now
+        self.last_error = None
+        if abandoned_count or archived_count:
+            print(f"Interview sweeper: {abandoned_count} abandoned, {archived_count} archived.")
+        return {"abandoned": abandoned_count, "archived": archived_count}
+
+    async def mark_abandoned(self, now: datetime) -> int:
+        interview_collection = self.database.get_collection(INTERVIEW_COLLECTION)
+        batch_size = max(1, settings.INTERVIEW_ARCHIVE_BATCH_SIZE)
+        stale_query = {
+            "lifecycle_status": {"$in": ACTIVE_LIFECYCLE_STATUSES},
+            "updated_at": {"$lt": now - timedelta(minutes=settings.INTERVIEW_ABANDON_AFTER_MINUTES)},
+        }
+
+        abandoned_count = 0
+        while True:
+            stale_docs = await interview_collection.find(stale_query, {"start_time": 1, "lifecycle_status": 1}) \
+                .limit(batch_size).to_list(length=batch_size)
+            if not stale_docs:
+                break
+
+            # One update per (start-day cohort, status), so the analytics rollup
+            # gets one $inc per day and the status the interview stopped in can be
+            # kept for rebuilds. The status and idle cutoff are matched again so an
+            # interview the candidate touched since it was read is left alone.
+            ids_by_group: Dict[Tuple[str, str], Tuple[Optional[datetime], List[Any]]] = {}
+            for stale_doc in stale_docs:
+                start_time = stale_doc.get("start_time")
+                group_key = (rollup_day(start_time), stale_doc["lifecycle_status"])
+                ids_by_group.setdefault(group_key, (start_time, []))[1].append(stale_doc["_id"])
+
+            batch_modified = 0
+            for (_, previous_status), (start_time, interview_ids) in ids_by_group.items():
+                update_result = await interview_collection.update_many(
+                    {**stale_query, "lifecycle_status": previous_status, "_id": {"$in": interview_ids}},
+                    {"$set": {"lifecycle_status": "abandoned", "abandoned_from_status": previous_status,
+                              "abandoned_at": now, "updated_at": now}}
+                )
+                if update_result.modified_count:
+                    await record_rollup(self.database, start_time,
+                                        stage_increments("abandoned", update_result.modified_count))
+                batch_modified += update_result.modified_count
+
+            abandoned_count += batch_modified
+            if len(stale_docs) < batch_size or not batch_modified:
+                break
+        return abandoned_count
+
+    async def archive_finished(self, now: datetime) -> int:
+        interview_collection = self.database.get_collection(INTERVIEW_COLLECTION)
+        archive_collection = self.database.get_collection(INTERVIEW_ARCHIVE_COLLECTION)
+        batch_size = max(1, settings.INTERVIEW_ARCHIVE_BATCH_SIZE)
+        # Interviews with assessment or feedback work still queued stay until it is done.
+        archivable_query = {
+            "lifecycle_status": {"$in": ARCHIVABLE_LIFECYCLE_STATUSES},
+            "updated_at": {"$lt": now - timedelta(days=settings.INTERVIEW_ARCHIVE_AFTER_DAYS)},
+            **{status_field: {"$nin": ["pending", "running"]} for status_field, _, _, _ in JOB_STATE_FIELDS.values()},
+        }
+
+        archived_count = 0
+        while True:
+            finished_docs = await interview_collection.find(archivable_query) \
+                .limit(batch_size).to_list(length=batch_size)
+            if not finished_docs:
+                break
+
+            # Copy first, then delete: a crash in between leaves a duplicate the
+            # next pass overwrites, never a lost interview. The delete matches
+            # updated_at so a document written since it was copied stays put,
+            # and its now stale archive copy is removed.
+            finished_ids = [doc["_id"] for doc in finished_docs]
+            await archive_collection.bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in finished_docs], ordered=False
+            )
+            delete_result = await interview_collection.bulk_write(
+                [DeleteOne({"_id": doc["_id"], "updated_at": doc.get("updated_at")}) for doc in finished_docs],
+                ordered=False
+            )
+            if delete_result.deleted_count < len(finished_docs):
+                still_hot_ids = [doc["_id"] async for doc in
+                                 interview_collection.find({"_id": {"$in": finished_ids}}, {"_id": 1})]
+                if still_hot_ids:
+                    await archive_collection.delete_many({"_id": {"$in": still_hot_ids}})
+
+            archived_count += delete_result.deleted_count
+            if len(finished_docs) < batch_size or not delete_result.deleted_count:
+                break
+        return archived_count
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "is_leader": self.is_leader,
+            "lease_owner": self.lease.owner,
+            "passes": self.passes,
+            "abandoned_total": self.abandoned_total,
+            "archived_total": self.archived_total,
+            "requeued_jobs_total": self.requeued_jobs_total,
+            "last_pass_at": self.last_pass_at.isoformat() if self.last_pass_at else None,
+            "last_error": self.last_error,
+        }
+
+
+interview_sweeper = InterviewSweeper()
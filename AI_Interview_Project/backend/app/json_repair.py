@@ -0,0 +1,133 @@
+# backend/app/json_repair.py
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def strip_trailing_commas(json_text: str) -> str:
+    # Removes `,` directly before `}` / `]` (outside of strings).
+    result: List[str] = []
+    in_string = False
+    escaped = False
+    for char in json_text:
+        if in_string:
+            result.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "}]":
+            while result and result[-1].isspace():
+                result.pop()
+            if result and result[-1] == ",":
+                result.pop()
+        result.append(char)
+    return "".join(result)
+
+
+class IncrementalJSONExtractor:
+    # Consumes (streamed) LLM output chunk by chunk and captures the first
+    # balanced top-level JSON object, ignoring prose or ``` fences around it.
+    # If the stream ends early, the truncated object can still be closed.
+
+    def __init__(self):
+        self.buffer: List[str] = []
+        self.stack: List[str] = []
+        self.in_string = False
+        self.escaped = False
+        self.complete = False
+        # (buffer length, open containers) at every point where cutting the
+        # buffer leaves only complete values: after an opener or before a comma.
+        self._cut_points: List[Tuple[int, Tuple[str, ...]]] = []
+
+    @property
+    def started(self) -> bool:
+        return bool(self.buffer)
+
+    @property
+    def text(self) -> str:
+        return "".join(self.buffer)
+
+    def feed(self, chunk: str) -> bool:
+        for char in chunk:
+            if self.complete:
+                break
+            if not self.started:
+                if char == "{":
+                    self.buffer.append(char)
+                    self.stack.append(char)
+                    self._cut_points.append((1, ("{",)))
+                continue
+
+            self.buffer.append(char)
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in _CLOSERS:
+                self.stack.append(char)
+                self._cut_points.append((len(self.buffer), tuple(self.stack)))
+            elif char in "}]":
+                if self.stack:
+                    self.stack.pop()
+                if not self.stack:
+                    self.complete = True
+            elif char == ",":
+                self._cut_points.append((len(self.buffer) - 1, tuple(self.stack)))
+        return self.complete
+
+    def candidates(self) -> Iterator[str]:
+        # Best-effort texts to try with json.loads, most complete first.
+        if not self.started:
+            return
+        if self.complete:
+            yield self.text
+            yield strip_trailing_commas(self.text)
+            return
+
+        text = self.text
+        if self.in_string:
+            closed_string = text[:-1] if self.escaped else text
+            yield self._close(closed_string + '"', self.stack)
+        yield self._close(text, self.stack)
+        for cut_length, open_containers in reversed(self._cut_points):
+            yield self._close(text[:cut_length], list(open_containers))
+
+    @staticmethod
+    def _close(fragment: str, open_containers: List[str]) -> str:
+        fragment = fragment.rstrip()
+        while fragment.endswith((",", ":")):
+            fragment = fragment[:-1].rstrip()
+        closing = "".join(_CLOSERS[container] for container in reversed(open_containers))
+        return strip_trailing_commas(fragment + closing)
+
+
+def parse_json_object_lenient(raw_text: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    # Returns (object or None, whether a repair was needed).
+    extractor = IncrementalJSONExtractor()
+    extractor.feed(raw_text)
+    return parse_extracted_object(extractor)
+
+
+def parse_extracted_object(extractor: IncrementalJSONExtractor) -> Tuple[Optional[Dict[str, Any]], bool]:
+    for attempt_index, candidate in enumerate(extractor.candidates()):
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed, attempt_index > 0 or not extractor.complete
+    return None, False
@@ -0,0 +1,228 @@
+# backend/app/llm_admission.py
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional
+
+from .config import settings
+
+PRIORITY_FINAL_ASSESSMENT = 0
+PRIORITY_BATCH_FEEDBACK = 5
+PRIORITY_ANSWER_FEEDBACK = 10
+
+FEEDBACK_OUTPUT_TOKENS_ESTIMATE = 200
+ASSESSMENT_OUTPUT_TOKENS_ESTIMATE = 1500
+
+
+class LLMOverloadedError(Exception):
+    def __init__(self, reason: str, retry_after_seconds: int = 5):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+def estimate_tokens(prompt: str, expected_output_tokens: int) -> int:
+    # Rough 4 characters/token heuristic; good enough for rate-limit budgeting.
+    return len(prompt) // 4 + expected_output_tokens
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.available = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def seconds_until_available(self, amount: float) -> float:
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        # A single request larger than the bucket may proceed once it is full.
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float):
+        if self.enabled:
+            self._refill()
+            self.available -= min(amount, self.capacity)
+
+
+class _Waiter:
+    def __init__(self, priority: int, sequence: int, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.sequence = sequence
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class LLMAdmissionController:
+    # Gates every outbound LLM call: at most `max_concurrency` in flight, within
+    # requests/min and tokens/min budgets, with a bounded priority wait queue.
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int, tokens_per_minute: int,
+                 max_queue_size: int, max_wait_seconds: float, metrics_window_size: int = 200):
+        self.max_concurrency = max(1, max_concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_queue_size = max_queue_size
+        self.max_wait_seconds = max_wait_seconds
+
+        self.in_flight = 0
+        self.waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._wakeup_handle: Optional[asyncio.TimerHandle] = None
+
+        self.admitted_total = 0
+        self.rejected_queue_full_total = 0
+        self.rejected_timeout_total = 0
+        self.max_queue_depth_seen = 0
+        self.wait_times: Deque[float] = deque(maxlen=metrics_window_size)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self.waiters if not waiter.future.done())
+
+    def ensure_capacity(self):
+        if self.queue_depth >= self.max_queue_size:
+            self.rejected_queue_full_total += 1
+            raise LLMOverloadedError("LLM admission queue is full.")
+
+    def _seconds_until_admissible(self, tokens: int) -> float:
+        return max(self.request_bucket.seconds_until_available(1),
+                   self.token_bucket.seconds_until_available(tokens))
+
+    def _dispatch(self):
+        self._wakeup_handle = None
+        while self.waiters and self.in_flight < self.max_concurrency:
+            head = self.waiters[0]
+            if head.future.done():
+                heapq.heappop(self.waiters)
+                continue
+            wait_seconds = self._seconds_until_admissible(head.tokens)
+            if wait_seconds > 0:
+                loop = asyncio.get_running_loop()
+                self._wakeup_handle = loop.call_later(wait_seconds, self._dispatch)
+                return
+            heapq.heappop(self.waiters)
+            self._admit(head.tokens)
+            head.future.set_result(None)
+
+    def _admit(self, tokens: int):
+        self.request_bucket.consume(1)
+        self.token_bucket.consume(tokens)
+        self.in_flight += 1
+        self.admitted_total += 1
+
+    async def acquire(self, priority: int, estimated_tokens: int, background: bool = False):
+        # Background callers (assessment jobs) are already bounded by their worker
+        # pool, so they wait for capacity instead of being rejected.
+        if self.queue_depth == 0 and self.in_flight < self.max_concurrency and \
+                self._seconds_until_admissible(estimated_tokens) == 0:
+            self._admit(estimated_tokens)
+            self.wait_times.append(0.0)
+            return
+
+        if not background:
+            self.ensure_capacity()
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, next(self._sequence), estimated_tokens, loop.create_future())
+        heapq.heappush(self.waiters, waiter)
+        self.max_queue_depth_seen = max(self.max_queue_depth_seen, self.queue_depth)
+        if self._wakeup_handle is None:
+            self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future),
+                                   timeout=None if background else self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            if waiter.future.done():
+                # Admitted at the very moment the timeout fired; keep the slot.
+                self.wait_times.append(time.monotonic() - waiter.enqueued_at)
+                return
+            waiter.future.cancel()
+            self.rejected_timeout_total += 1
+            raise LLMOverloadedError("Timed out waiting for LLM capacity.")
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release()
+            else:
+                waiter.future.cancel()
+            raise
+        self.wait_times.append(time.monotonic() - waiter.enqueued_at)
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+        if self._wakeup_handle is None:
+            self._dispatch()
+
+    @asynccontextmanager
+    async def admit(self, priority: int, estimated_tokens: int, background: bool = False):
+        await self.acquire(priority, estimated_tokens, background)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _wait_percentile(self, pct: float) -> Optional[float]:
+        if not self.wait_times:
+            return None
+        ordered = sorted(self.wait_times)
+        return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self._wait_percentile(50)
+        p95 = self._wait_percentile(95)
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "max_queue_depth_seen": self.max_queue_depth_seen,
+            "admitted_total": self.admitted_total,
+            "rejected_queue_full_total": self.rejected_queue_full_total,
+            "rejected_timeout_total": self.rejected_timeout_total,
+            "wait_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "wait_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "wait_max_ms": round(max(self.wait_times) * 1000, 1) if self.wait_times else None,
+            "requests_available": round(self.request_bucket.available, 1) if self.request_bucket.enabled else None,
+            "tokens_available": round(self.token_bucket.available) if self.token_bucket.enabled else None,
+        }
+
+
+# The limiter state is per process, so each gunicorn worker gets an equal share
+# of the deployment-wide limits; together they stay within the provider quota.
+_worker_count = max(1, settings.WEB_CONCURRENCY)
+
+
+def worker_share(deployment_limit: int) -> int:
+    # 0 (disabled) stays disabled; a positive limit never rounds down to 0.
+    return deployment_limit if deployment_limit <= 0 else max(1, deployment_limit // _worker_count)
+
+
+llm_admission = LLMAdmissionController(
+    max_concurrency=worker_share(settings.LLM_MAX_CONCURRENCY),
+    requests_per_minute=worker_share(settings.LLM_REQUESTS_PER_MINUTE),
+    tokens_per_minute=worker_share(settings.LLM_TOKENS_PER_MINUTE),
+    max_queue_size=settings.LLM_ADMISSION_QUEUE_SIZE,
+    max_wait_seconds=settings.LLM_ADMISSION_MAX_WAIT_SECONDS,
+)
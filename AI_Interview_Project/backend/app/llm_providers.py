@@ -0,0 +1,589 @@
+# backend/app/llm_providers.py
+import abc
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Literal, Optional
+
+from .config import Settings
+from .llm_resilience import CircuitBreaker, jittered_backoff
+
+LLMCallKind = Literal["text", "json"]
+
+
+class LLMProviderError(Exception):
+    pass
+
+
+class LLMCircuitOpenError(LLMProviderError):
+    pass
+
+
+class LLMDeadlineExceededError(LLMProviderError):
+    # The per-purpose deadline ran out: transient, so callers retry it like an outage.
+    pass
+
+
+class LLMBlockedError(Exception):
+    # Raised when a provider refuses the prompt (safety filters). Not a health
+    # problem of the backend, so the router does not fail over on it.
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class LLMProvider(abc.ABC):
+    name: str = "base"
+
+    @abc.abstractmethod
+    async def generate_text(self, prompt: str) -> str:
+        ...
+
+    @abc.abstractmethod
+    async def generate_json(self, prompt: str) -> str:
+        ...
+
+    async def stream_text(self, prompt: str) -> AsyncIterator[str]:
+        # Providers without native streaming emit the whole answer as one chunk.
+        yield await self.generate_text(prompt)
+
+    async def stream_json(self, prompt: str) -> AsyncIterator[str]:
+        yield await self.generate_json(prompt)
+
+
+class GeminiProvider(LLMProvider):
+    def __init__(self, api_key: str, model_name: str):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.name = f"gemini:{model_name}"
+        self.model = genai.GenerativeModel(model_name=model_name)
+
+    @staticmethod
+    def _raise_if_blocked(response):
+        if response.prompt_feedback and response.prompt_feedback.block_reason:
+            raise LLMBlockedError(response.prompt_feedback.block_reason_message or "Safety reasons")
+
+    async def generate_text(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        if response.parts:
+            return response.text.strip()
+        self._raise_if_blocked(response)
+        return ""
+
+    async def generate_json(self, prompt: str) -> str:
+        from google.generativeai.types import GenerationConfig
+
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=GenerationConfig(response_mime_type="application/json")
+        )
+        if response.parts:
+            return response.text.strip()
+        self._raise_if_blocked(response)
+        return ""
+
+    async def _stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        response_stream = await self.model.generate_content_async(prompt, stream=True, **kwargs)
+        async for chunk in response_stream:
+            if chunk.parts:
+                yield chunk.text
+            else:
+                self._raise_if_blocked(chunk)
+
+    async def stream_text(self, prompt: str) -> AsyncIterator[str]:
+        async for chunk in self._stream(prompt):
+            yield chunk
+
+    async def stream_json(self, prompt: str) -> AsyncIterator[str]:
+        from google.generativeai.types import GenerationConfig
+
+        async for chunk in self._stream(prompt,
+                                        generation_config=GenerationConfig(response_mime_type="application/json")):
+            yield chunk
+
+
+class OpenAIProvider(LLMProvider):
+    def __init__(self, api_key: str, model_name: str):
+        from openai import AsyncOpenAI
+
+        self.name = f"openai:{model_name}"
+        self.model_name = model_name
+        self.client = AsyncOpenAI(api_key=api_key)
+
+    async def _complete(self, prompt: str, **kwargs) -> str:
+        completion = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
+        )
+        choice = completion.choices[0]
+        if choice.finish_reason == "content_filter":
+            raise LLMBlockedError("Content filter")
+        return (choice.message.content or "").strip()
+
+    async def generate_text(self, prompt: str) -> str:
+        return await self._complete(prompt)
+
+    async def generate_json(self, prompt: str) -> str:
+        return await self._complete(prompt, response_format={"type": "json_object"})
+
+    async def _stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        response_stream = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            **kwargs
+        )
+        async for chunk in response_stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.finish_reason == "content_filter":
+                raise LLMBlockedError("Content filter")
+            if choice.delta and choice.delta.content:
+                yield choice.delta.content
+
+    async def stream_text(self, prompt: str) -> AsyncIterator[str]:
+        async for chunk in self._stream(prompt):
+            yield chunk
+
+    async def stream_json(self, prompt: str) -> AsyncIterator[str]:
+        async for chunk in self._stream(prompt, response_format={"type": "json_object"}):
+            yield chunk
+
+
+class FakeLLMProvider(LLMProvider):
+    # In-process provider for offline runs and tests (LLM_PROVIDERS=fake).
+
+    def __init__(self, name: str = "fake", text_response: str = "Câu trả lời rõ ràng và liên quan đến câu hỏi.",
+                 json_response: str = '{"status": "Đạt", "overall_summary_comment": "Đánh giá giả lập."}',
+                 latency_seconds: float = 0.0, fail: bool = False):
+        self.name = name
+        self.text_response = text_response
+        self.json_response = json_response
+        self.latency_seconds = latency_seconds
+        self.fail = fail
+        self.calls = 0
+
+    async def _respond(self, response_text: str) -> str:
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        if self.fail:
+            raise LLMProviderError(f"{self.name} configured to fail")
+        return response_text
+
+    async def generate_text(self, prompt: str) -> str:
+        return await self._respond(self.text_response)
+
+    async def generate_json(self, prompt: str) -> str:
+        return await self._respond(self.json_response)
+
+    async def stream_text(self, prompt: str) -> AsyncIterator[str]:
+        text = await self._respond(self.text_response)
+        for word in text.split(" "):
+            yield word + " "
+
+    async def stream_json(self, prompt: str) -> AsyncIterator[str]:
+        text = await self._respond(self.json_response)
+        for start in range(0, len(text), 16):
+            yield text[start:start + 16]
+
+
+class ProviderStats:
+    def __init__(self, window_size: int):
+        self.latencies: Deque[float] = deque(maxlen=window_size)
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.total_calls = 0
+        self.total_errors = 0
+
+    def record(self, latency_seconds: float, success: bool):
+        self.total_calls += 1
+        self.outcomes.append(success)
+        if success:
+            self.latencies.append(latency_seconds)
+        else:
+            self.total_errors += 1
+
+    @property
+    def sample_count(self) -> int:
+        return len(self.outcomes)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "samples": self.sample_count,
+            "error_rate": round(self.error_rate, 4),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "total_calls": self.total_calls,
+            "total_errors": self.total_errors,
+        }
+
+
+class LLMRouter:
+    # Holds several providers, tracks rolling latency/error stats per provider and
+    # call kind, and tries them fastest-healthy-first. Each call gets an overall
+    # deadline, bounded jittered retries, optional hedging and per-provider
+    # circuit breakers.
+
+    def __init__(self, providers: List[LLMProvider], timeouts: Dict[str, float],
+                 deadlines: Optional[Dict[str, float]] = None, window_size: int = 100,
+                 unhealthy_error_rate: float = 0.5, min_samples_for_health: int = 5,
+                 max_retries: int = 0, retry_base_delay_seconds: float = 0.5, retry_max_delay_seconds: float = 4.0,
+                 hedging_enabled: bool = False, hedge_min_delay_seconds: float = 1.0,
+                 circuit_failure_threshold: int = 5, circuit_reset_seconds: float = 30.0):
+        self.providers = providers
+        self.timeouts = timeouts
+        self.deadlines = deadlines or {}
+        self.window_size = window_size
+        self.unhealthy_error_rate = unhealthy_error_rate
+        self.min_samples_for_health = min_samples_for_health
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay_seconds = retry_base_delay_seconds
+        self.retry_max_delay_seconds = retry_max_delay_seconds
+        self.hedging_enabled = hedging_enabled
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.stats: Dict[str, Dict[str, ProviderStats]] = {
+            provider.name: {"text": ProviderStats(window_size), "json": ProviderStats(window_size)}
+            for provider in providers
+        }
+        self.breakers: Dict[str, CircuitBreaker] = {
+            provider.name: CircuitBreaker(provider.name, circuit_failure_threshold, circuit_reset_seconds)
+            for provider in providers
+        }
+        self.retries_total = 0
+        self.hedged_requests_total = 0
+        self.hedge_wins_total = 0
+        self.short_circuited_calls_total = 0
+
+    def is_healthy(self, provider: LLMProvider, kind: LLMCallKind) -> bool:
+        provider_stats = self.stats[provider.name][kind]
+        if provider_stats.sample_count < self.min_samples_for_health:
+            return True
+        return provider_stats.error_rate < self.unhealthy_error_rate
+
+    def ordered_providers(self, kind: LLMCallKind) -> List[LLMProvider]:
+        def sort_key(indexed_provider):
+            index, provider = indexed_provider
+            p95 = self.stats[provider.name][kind].percentile(95)
+            # Unhealthy providers go last; providers without samples keep their
+            # configured order ahead of measured ones so they get explored.
+            return (not self.is_healthy(provider, kind), p95 is not None, p95 or 0.0, index)
+
+        return [provider for _, provider in sorted(enumerate(self.providers), key=sort_key)]
+
+    def available_providers(self, kind: LLMCallKind, purpose: str) -> List[LLMProvider]:
+        candidates = [p for p in self.ordered_providers(kind) if self.breakers[p.name].is_available()]
+        if not candidates:
+            self.short_circuited_calls_total += 1
+            raise LLMCircuitOpenError(f"All LLM provider circuits are open for {purpose}.")
+        return candidates
+
+    def timeout_for(self, purpose: str) -> float:
+        return self.timeouts.get(purpose, self.timeouts.get("default", 30.0))
+
+    def deadline_for(self, purpose: str) -> float:
+        return self.deadlines.get(purpose, self.deadlines.get("default", self.timeout_for(purpose)))
+
+    def hedge_delay_for(self, provider: LLMProvider, kind: LLMCallKind) -> Optional[float]:
+        if not self.hedging_enabled:
+            return None
+        provider_stats = self.stats[provider.name][kind]
+        if provider_stats.sample_count < self.min_samples_for_health:
+            return None
+        p95 = provider_stats.percentile(95)
+        if p95 is None:
+            return None
+        return max(self.hedge_min_delay_seconds, p95)
+
+    async def _attempt(self, provider: LLMProvider, kind: LLMCallKind, prompt: str, purpose: str,
+                       timeout: float) -> str:
+        breaker = self.breakers[provider.name]
+        if not breaker.allow_request():
+            raise LLMCircuitOpenError(f"Circuit for '{provider.name}' is open.")
+        started_at = time.monotonic()
+        try:
+            call = provider.generate_json(prompt) if kind == "json" else provider.generate_text(prompt)
+            result = await asyncio.wait_for(call, timeout=timeout)
+        except LLMBlockedError:
+            self.stats[provider.name][kind].record(time.monotonic() - started_at, True)
+            breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            breaker.release_trial()
+            raise
+        except Exception as e:
+            self.stats[provider.name][kind].record(time.monotonic() - started_at, False)
+            breaker.record_failure()
+            print(f"WARNING: LLM provider '{provider.name}' failed for {purpose} ({type(e).__name__}: {e}).")
+            raise
+        self.stats[provider.name][kind].record(time.monotonic() - started_at, True)
+        breaker.record_success()
+        return result
+
+    @staticmethod
+    async def _first_success(tasks: set) -> asyncio.Task:
+        pending = set(tasks)
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task
+                    if isinstance(error, LLMBlockedError):
+                        raise error
+                    last_error = error
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call_round(self, kind: LLMCallKind, prompt: str, purpose: str, deadline: float) -> str:
+        loop = asyncio.get_running_loop()
+        remaining_providers = self.available_providers(kind, purpose)
+        last_error: Optional[Exception] = None
+        while remaining_providers:
+            provider = remaining_providers.pop(0)
+            timeout = min(self.timeout_for(purpose), deadline - loop.time())
+            if timeout <= 0:
+                raise LLMDeadlineExceededError(f"Deadline exceeded for {purpose}.")
+
+            primary_task = asyncio.create_task(self._attempt(provider, kind, prompt, purpose, timeout))
+            tasks = {primary_task}
+            hedge_delay = self.hedge_delay_for(provider, kind)
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    hedge_provider = remaining_providers.pop(0) if remaining_providers else provider
+                    self.hedged_requests_total += 1
+                    tasks.add(asyncio.create_task(
+                        self._attempt(hedge_provider, kind, prompt, purpose, timeout - hedge_delay)
+                    ))
+            try:
+                winning_task = await self._first_success(tasks)
+            except LLMBlockedError:
+                raise
+            except Exception as e:
+                last_error = e
+                continue
+            if winning_task is not primary_task:
+                self.hedge_wins_total += 1
+            return winning_task.result()
+        raise last_error or LLMProviderError(f"No LLM provider available for {purpose}.")
+
+    async def _call(self, kind: LLMCallKind, prompt: str, purpose: str) -> str:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_for(purpose)
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                backoff = jittered_backoff(attempt - 1, self.retry_base_delay_seconds, self.retry_max_delay_seconds)
+                if loop.time() + backoff >= deadline:
+                    break
+                self.retries_total += 1
+                await asyncio.sleep(backoff)
+            try:
+                return await self._call_round(kind, prompt, purpose, deadline)
+            except (LLMBlockedError, LLMCircuitOpenError, LLMDeadlineExceededError):
+                raise
+            except Exception as e:
+                last_error = e
+        raise LLMProviderError(f"All LLM providers failed for {purpose}: {last_error}")
+
+    async def generate_text(self, prompt: str, purpose: str = "feedback") -> str:
+        return await self._call("text", prompt, purpose)
+
+    async def generate_json(self, prompt: str, purpose: str = "assessment") -> str:
+        return await self._call("json", prompt, purpose)
+
+    def stream_text(self, prompt: str, purpose: str = "feedback") -> AsyncIterator[str]:
+        return self._stream("text", prompt, purpose)
+
+    def stream_json(self, prompt: str, purpose: str = "assessment") -> AsyncIterator[str]:
+        return self._stream("json", prompt, purpose)
+
+    async def _stream(self, kind: LLMCallKind, prompt: str, purpose: str) -> AsyncIterator[str]:
+        # Retries and failover are only possible until the first chunk has been sent.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_for(purpose)
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                backoff = jittered_backoff(attempt - 1, self.retry_base_delay_seconds, self.retry_max_delay_seconds)
+                if loop.time() + backoff >= deadline:
+                    break
+                self.retries_total += 1
+                await asyncio.sleep(backoff)
+
+            for provider in self.available_providers(kind, purpose):
+                timeout = min(self.timeout_for(purpose), deadline - loop.time())
+                if timeout <= 0:
+                    raise LLMDeadlineExceededError(f"Deadline exceeded for {purpose}.")
+                breaker = self.breakers[provider.name]
+                if not breaker.allow_request():
+                    continue
+                started_at = time.monotonic()
+                provider_stream = provider.stream_json(prompt) if kind == "json" else provider.stream_text(prompt)
+                chunk_iterator = provider_stream.__aiter__()
+                try:
+                    first_chunk = await asyncio.wait_for(chunk_iterator.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    self.stats[provider.name][kind].record(time.monotonic() - started_at, True)
+                    breaker.record_success()
+                    await self._close_stream(provider_stream)
+                    return
+                except LLMBlockedError:
+                    self.stats[provider.name][kind].record(time.monotonic() - started_at, True)
+                    breaker.record_success()
+                    await self._close_stream(provider_stream)
+                    raise
+                except asyncio.CancelledError:
+                    breaker.release_trial()
+                    await self._close_stream(provider_stream)
+                    raise
+                except Exception as e:
+                    self.stats[provider.name][kind].record(time.monotonic() - started_at, False)
+                    breaker.record_failure()
+                    print(f"WARNING: LLM provider '{provider.name}' failed to stream {purpose} "
+                          f"({type(e).__name__}: {e}).")
+                    # Close the failed stream now rather than leaving its HTTP response open until GC.
+                    await self._close_stream(provider_stream)
+                    last_error = e
+                    continue
+
+                # The outcome is recorded once the stream ends, so a provider that
+                # stalls after its first chunk counts as failed, not as fast.
+                first_chunk_latency = time.monotonic() - started_at
+                stream_error: Optional[Exception] = None
+                stream_cancelled = False
+                try:
+                    yield first_chunk
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunk_iterator.__anext__(),
+                                                           timeout=max(0.001, deadline - loop.time()))
+                        except StopAsyncIteration:
+                            return
+                        except LLMBlockedError:
+                            raise
+                        except asyncio.TimeoutError as e:
+                            stream_error = e
+                            raise LLMDeadlineExceededError(f"Deadline exceeded while streaming {purpose}.") from e
+                        except asyncio.CancelledError:
+                            stream_cancelled = True
+                            raise
+                        except Exception as e:
+                            stream_error = e
+                            raise
+                        yield chunk
+                finally:
+                    if stream_error is not None:
+                        self.stats[provider.name][kind].record(time.monotonic() - started_at, False)
+                        breaker.record_failure()
+                        print(f"WARNING: LLM provider '{provider.name}' failed mid-stream for {purpose} "
+                              f"({type(stream_error).__name__}: {stream_error}).")
+                    elif stream_cancelled:
+                        breaker.release_trial()
+                    else:
+                        # Includes consumers stopping early (e.g. once a JSON object is complete).
+                        self.stats[provider.name][kind].record(first_chunk_latency, True)
+                        breaker.record_success()
+                    await provider_stream.aclose()
+        raise LLMProviderError(f"All LLM providers failed to stream {purpose}: {last_error}")
+
+    @staticmethod
+    async def _close_stream(provider_stream: AsyncIterator[str]):
+        try:
+            await provider_stream.aclose()
+        except Exception as e:
+            print(f"WARNING: Could not close LLM provider stream: {str(e)}")
+
+    def circuit_snapshot(self) -> Dict[str, Any]:
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "providers": {
+                provider.name: {
+                    **{kind: {**self.stats[provider.name][kind].snapshot(),
+                              "healthy": self.is_healthy(provider, kind)}
+                       for kind in ("text", "json")},
+                    "circuit": self.breakers[provider.name].snapshot(),
+                }
+                for provider in self.providers
+            },
+            "retries_total": self.retries_total,
+            "hedged_requests_total": self.hedged_requests_total,
+            "hedge_wins_total": self.hedge_wins_total,
+            "short_circuited_calls_total": self.short_circuited_calls_total,
+        }
+
+
+def build_llm_router(app_settings: Settings) -> Optional[LLMRouter]:
+    providers: List[LLMProvider] = []
+    for provider_key in [p.strip().lower() for p in app_settings.LLM_PROVIDERS.split(",") if p.strip()]:
+        try:
+            if provider_key == "gemini":
+                if not app_settings.GOOGLE_AI_API_KEY:
+                    print("WARNING: GOOGLE_AI_API_KEY is not set. Skipping Gemini provider.")
+                    continue
+                providers.append(GeminiProvider(app_settings.GOOGLE_AI_API_KEY, app_settings.GEMINI_MODEL_NAME))
+            elif provider_key == "openai":
+                if not app_settings.OPENAI_API_KEY:
+                    print("WARNING: OPENAI_API_KEY is not set. Skipping OpenAI provider.")
+                    continue
+                providers.append(OpenAIProvider(app_settings.OPENAI_API_KEY, app_settings.OPENAI_MODEL_NAME))
+            elif provider_key == "fake":
+                providers.append(FakeLLMProvider())
+            else:
+                print(f"WARNING: Unknown LLM provider '{provider_key}' in LLM_PROVIDERS. Skipping.")
+                continue
+            print(f"Configured LLM provider: {providers[-1].name}")
+        except Exception as e:
+            print(f"ERROR initializing LLM provider '{provider_key}': {str(e)}")
+
+    if not providers:
+        return None
+
+    return LLMRouter(
+        providers,
+        timeouts={
+            "feedback": app_settings.LLM_FEEDBACK_TIMEOUT_SECONDS,
+            "assessment": app_settings.LLM_ASSESSMENT_TIMEOUT_SECONDS,
+            "default": app_settings.LLM_FEEDBACK_TIMEOUT_SECONDS,
+        },
+        deadlines={
+            "feedback": app_settings.LLM_FEEDBACK_DEADLINE_SECONDS,
+            "assessment": app_settings.LLM_ASSESSMENT_DEADLINE_SECONDS,
+            "default": app_settings.LLM_FEEDBACK_DEADLINE_SECONDS,
+        },
+        window_size=app_settings.LLM_STATS_WINDOW_SIZE,
+        unhealthy_error_rate=app_settings.LLM_UNHEALTHY_ERROR_RATE,
+        min_samples_for_health=app_settings.LLM_MIN_SAMPLES_FOR_HEALTH,
+        max_retries=app_settings.LLM_MAX_RETRIES,
+        retry_base_delay_seconds=app_settings.LLM_RETRY_BASE_DELAY_SECONDS,
+        retry_max_delay_seconds=app_settings.LLM_RETRY_MAX_DELAY_SECONDS,
+        hedging_enabled=app_settings.LLM_HEDGING_ENABLED,
+        hedge_min_delay_seconds=app_settings.LLM_HEDGE_MIN_DELAY_SECONDS,
+        circuit_failure_threshold=app_settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        circuit_reset_seconds=app_settings.LLM_CIRCUIT_RESET_SECONDS,
+    )
@@ -0,0 +1,82 @@
+# backend/app/llm_resilience.py
+import random
+import time
+from typing import Any, Dict, Literal, Optional
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+def jittered_backoff(attempt: int, base_delay_seconds: float, max_delay_seconds: float) -> float:
+    # "Full jitter": a random delay in [0, min(cap, base * 2^attempt)].
+    return random.uniform(0, min(max_delay_seconds, base_delay_seconds * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    # Opens after `failure_threshold` consecutive failures, rejects calls for
+    # `reset_timeout_seconds`, then lets a single trial call through (half-open).
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state: CircuitState = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self.short_circuited_total = 0
+
+    def is_available(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            return time.monotonic() - self.opened_at >= self.reset_timeout_seconds
+        return not self.trial_in_flight
+
+    def allow_request(self) -> bool:
+        # Called right before a call is made; claims the half-open trial slot.
+        if not self.is_available():
+            self.short_circuited_total += 1
+            return False
+        if self.state == "open":
+            self.state = "half_open"
+        if self.state == "half_open":
+            self.trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+        if self.state != "closed":
+            print(f"Circuit breaker '{self.name}' closed.")
+        self.state = "closed"
+        self.opened_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                print(f"WARNING: Circuit breaker '{self.name}' opened after "
+                      f"{self.consecutive_failures} consecutive failure(s).")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        # A half-open trial that was cancelled (e.g. lost a hedge race) proves nothing.
+        self.trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == "open" and self.opened_at is not None:
+            retry_in = max(0.0, round(self.reset_timeout_seconds - (time.monotonic() - self.opened_at), 1))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout_seconds": self.reset_timeout_seconds,
+            "retry_in_seconds": retry_in,
+            "times_opened": self.times_opened,
+            "short_circuited_total": self.short_circuited_total,
+        }
@@ -2,23 +2,28 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-import google.generativeai as genai
 
 from .config import settings
 from .db import connect_to_mongo, close_mongo_connection, get_database
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from .models import QuestionSetInDB, Question, DefaultQuestionSetSettings
+from .models import QuestionSetInDB, Question, DefaultQuestionSetSettings, DEFAULT_SETTINGS_ID
 from .sample_data import (
     INITIAL_DEFAULT_GENERAL_QSET_ID, SAMPLE_GENERAL_QUESTIONS,
     INITIAL_DEFAULT_DEVELOPER_QSET_ID, SAMPLE_DEVELOPER_QUESTIONS,
     INITIAL_DEFAULT_DESIGNER_QSET_ID, SAMPLE_DESIGNER_QUESTIONS
 )
 
-from .routers import admin_auth, candidate_routes, admin_question_sets_routes, admin_interviews_routes
+from .assessment_jobs import assessment_job_manager
+from .db_indexes import apply_index_registry
+from .interview_sweeper import interview_sweeper
+from .llm_providers import build_llm_router
+from .metrics_exporter import worker_metrics_exporter
+from .routers import (
+    admin_auth, candidate_routes, admin_question_sets_routes, admin_interviews_routes, admin_metrics_routes,
+    admin_analytics_routes
+)
 from . import globals as app_globals
 
-DEFAULT_SETTINGS_ID = "default_question_set_config"
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -29,26 +34,26 @@ async def lifespan(app: FastAPI):
     if db_instance is None:
         print("CRITICAL: Database connection failed at startup. Application might not work as expected.")
     else:
-        if not settings.GOOGLE_AI_API_KEY:
-            print("FATAL ERROR: GOOGLE_AI_API_KEY is not set. AI features will be disabled.")
-            app_globals.gemini_model = None
-        else:
-            try:
-                genai.configure(api_key=settings.GOOGLE_AI_API_KEY)
-                print("Successfully configured Google Generative AI API Key.")
-                selected_model_name = 'gemini-1.5-flash-latest'
-                app_globals.gemini_model = genai.GenerativeModel(model_name=selected_model_name)
-                print(f"Using Google Gemini model: {app_globals.gemini_model.model_name}")
-            except Exception as e:
-                print(f"ERROR configuring Google Generative AI or initializing model: {str(e)}")
-                app_globals.gemini_model = None
+        app_globals.llm_router = build_llm_router(settings)
+        if app_globals.llm_router is None:
+            print("FATAL ERROR: No LLM provider could be configured. AI features will be disabled.")
 
         await initial_data_setup(db_instance)
         await initialize_default_qset_config(db_instance)
+        if settings.DB_APPLY_INDEXES_ON_STARTUP:
+            await apply_index_registry(db_instance)
+        await assessment_job_manager.start(db_instance)
+        await interview_sweeper.start(db_instance)
+
+    if settings.METRICS_EXPORTER_ENABLED:
+        await worker_metrics_exporter.start()
 
     print("Application startup complete.")
     yield
     print("Application shutting down...")
+    await worker_metrics_exporter.stop()
+    await interview_sweeper.stop()
+    await assessment_job_manager.stop()
     await close_mongo_connection()
     print("Application shutdown complete.")
 
@@ -66,6 +71,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 
@@ -181,6 +187,10 @@ app.include_router(admin_question_sets_routes.router,
                    prefix=API_V1_PREFIX)
 app.include_router(admin_interviews_routes.router,
                    prefix=API_V1_PREFIX)
+app.include_router(admin_metrics_routes.router,
+                   prefix=API_V1_PREFIX)
+app.include_router(admin_analytics_routes.router,
+                   prefix=API_V1_PREFIX)
 
 
 @app.get("/")
@@ -0,0 +1,23 @@
+# backend/app/metrics.py
+from collections import Counter
+from typing import Any, Dict
+
+
+class AppCounters:
+    # Process-wide event counters surfaced by GET /admin/metrics. Each gunicorn
+    # worker keeps its own counts.
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def increment(self, name: str, amount: int = 1):
+        self.counts[name] += amount
+
+    def get(self, name: str) -> int:
+        return self.counts.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(sorted(self.counts.items()))
+
+
+app_counters = AppCounters()
@@ -0,0 +1,115 @@
+# backend/app/metrics_exporter.py
+import asyncio
+import hmac
+from typing import Any, Dict, Optional
+
+from .config import settings
+from .db_monitoring import mongo_metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+REQUEST_HEAD_TIMEOUT_SECONDS = 5.0
+
+
+class WorkerMetricsExporter:
+    # Metrics are kept per gunicorn worker, and a scrape through the app port
+    # lands on a random worker. So each worker serves its own Prometheus target:
+    # it binds the first free port in METRICS_EXPORTER_BASE_PORT ..
+    # + WEB_CONCURRENCY - 1 and answers GET /metrics there. Prometheus scrapes
+    # every port of the range as a separate target.
+    # Access control is network based (METRICS_EXPORTER_HOST, localhost by
+    # default), plus a bearer token when METRICS_SCRAPE_TOKEN is set.
+
+    def __init__(self, host: str, base_port: int, port_count: int, scrape_token: str = ""):
+        self.host = host
+        self.base_port = base_port
+        self.port_count = max(1, port_count)
+        self.scrape_token = scrape_token
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.port: Optional[int] = None
+        self.scrapes_total = 0
+        self.rejected_total = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self.server is not None
+
+    async def start(self):
+        if self.is_running:
+            return
+        for port in range(self.base_port, self.base_port + self.port_count):
+            try:
+                self.server = await asyncio.start_server(self._handle, self.host, port)
+            except OSError:
+                # Taken by another worker of this server.
+                continue
+            self.port = port
+            print(f"Serving worker metrics on http://{self.host}:{port}/metrics.")
+            return
+        print(f"WARNING: No free metrics port in {self.base_port}-{self.base_port + self.port_count - 1}; "
+              f"this worker's metrics are not exported.")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.server.close()
+        await self.server.wait_closed()
+        self.server = None
+        self.port = None
+
+    def _authorized(self, authorization: str) -> bool:
+        if not self.scrape_token:
+            return True
+        return hmac.compare_digest(authorization.encode(), f"Bearer {self.scrape_token}".encode())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), REQUEST_HEAD_TIMEOUT_SECONDS)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            writer.close()
+            return
+
+        request_line, *header_lines = request_head.decode("latin-1").split("\r\n")
+        request_parts = request_line.split(" ")
+        method = request_parts[0]
+        path = request_parts[1].split("?", 1)[0] if len(request_parts) > 1 else ""
+        headers: Dict[str, str] = {}
+        for header_line in header_lines:
+            name, separator, value = header_line.partition(":")
+            if separator:
+                headers[name.strip().lower()] = value.strip()
+
+        if method != "GET" or path != "/metrics":
+            status_line, body = "404 Not Found", "Not found.\n"
+        elif not self._authorized(headers.get("authorization", "")):
+            self.rejected_total += 1
+            status_line, body = "401 Unauthorized", "Missing or invalid scrape token.\n"
+        else:
+            self.scrapes_total += 1
+            status_line, body = "200 OK", mongo_metrics.prometheus_text()
+
+        body_bytes = body.encode("utf-8")
+        writer.write((f"HTTP/1.1 {status_line}\r\nContent-Type: {PROMETHEUS_CONTENT_TYPE}\r\n"
+                      f"Content-Length: {len(body_bytes)}\r\nConnection: close\r\n\r\n").encode("latin-1")
+                     + body_bytes)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "host": self.host,
+            "port": self.port,
+            "token_required": bool(self.scrape_token),
+            "scrapes_total": self.scrapes_total,
+            "rejected_total": self.rejected_total,
+        }
+
+
+worker_metrics_exporter = WorkerMetricsExporter(
+    host=settings.METRICS_EXPORTER_HOST,
+    base_port=settings.METRICS_EXPORTER_BASE_PORT,
+    port_count=settings.WEB_CONCURRENCY,
+    scrape_token=settings.METRICS_SCRAPE_TOKEN,
+)
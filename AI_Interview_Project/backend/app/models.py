@@ -29,12 +29,16 @@ class Question(BaseModel):
 
 SpecializedField = Literal["developer", "designer", "none"]
 
+FeedbackMode = Literal["per_answer", "deferred"]
+
 
 class QuestionSetBase(BaseModel):
     name: str
     questions: List[Question] = []
     field_type: SpecializedField = Field(default="none",
                                          description="Loại bộ câu hỏi: none (chung), developer, designer")
+    feedback_mode: Optional[FeedbackMode] = Field(default=None,
+                                                  description="per_answer: nhận xét từng câu; deferred: nhận xét gộp khi kết thúc phần. None: dùng cấu hình chung")
 
 
 class QuestionSetCreate(QuestionSetBase):
@@ -45,12 +49,14 @@ class QuestionSetUpdate(BaseModel):
     name: Optional[str] = None
     questions: Optional[List[Question]] = None
     field_type: Optional[SpecializedField] = None
+    feedback_mode: Optional[FeedbackMode] = None
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class QuestionSetInDB(QuestionSetBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     id_name: str
+    version: int = 0
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -65,6 +71,8 @@ class QuestionSetPublic(BaseModel):
     name: str
     questions: List[Question]
     field_type: SpecializedField
+    feedback_mode: Optional[FeedbackMode] = None
+    version: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -73,9 +81,25 @@ class QuestionSetPublic(BaseModel):
         from_attributes = True
 
 
+class QuestionSetBulkLineError(BaseModel):
+    line: int
+    id_name: Optional[str] = None
+    error: str
+
+
+class QuestionSetBulkImportResult(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[QuestionSetBulkLineError] = []
+
+
 class AnswerWithFeedback(BaseModel):
     question_id: UUID
-    question_text: str
+    # Not stored for interviews that reference a question set revision; filled
+    # in from the revision when the interview is read.
+    question_text: Optional[str] = None
     candidate_answer: str
     ai_feedback_per_answer: str
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -106,6 +130,15 @@ InterviewLifecycleStatus = Literal[
     "abandoned"
 ]
 
+AssessmentJobStatus = Literal["pending", "running", "done", "failed"]
+
+
+class BatchFeedbackJob(BaseModel):
+    status: AssessmentJobStatus = "pending"
+    attempts: int = 0
+    claimed_at: Optional[datetime] = None
+    next_attempt_at: Optional[datetime] = None
+
 
 class CandidateInfoPayload(BaseModel):
     full_name: str
@@ -136,12 +169,24 @@ class InterviewBase(BaseModel):
     selected_field: SpecializedField = Field(default="none")
     desired_position_in_field: Optional[str] = None
     general_question_set_id_name: Optional[str] = None
+    general_question_set_revision: Optional[str] = None
     general_questions_snapshot: List[Question] = []
     general_answers_and_feedback: List[AnswerWithFeedback] = []
+    general_feedback_mode: FeedbackMode = "per_answer"
     specialized_question_set_id_name: Optional[str] = None
+    specialized_question_set_revision: Optional[str] = None
     specialized_questions_snapshot: Optional[List[Question]] = None
     specialized_answers_and_feedback: List[AnswerWithFeedback] = []
+    specialized_feedback_mode: FeedbackMode = "per_answer"
+    batch_feedback_jobs: Dict[str, BatchFeedbackJob] = {}
+    transcript_segments: List[str] = []
+    search_profile_text: Optional[str] = None
+    search_entries: List[str] = []
     overall_assessment: Optional[OverallAssessment] = None
+    assessment_job_status: Optional[AssessmentJobStatus] = None
+    assessment_job_attempts: int = 0
+    assessment_job_claimed_at: Optional[datetime] = None
+    assessment_job_next_attempt_at: Optional[datetime] = None
     start_time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     end_time: Optional[datetime] = None
@@ -157,14 +202,39 @@ class InterviewInDB(InterviewBase):
         from_attributes = True
 
 
+# Partial views of an interview document, loaded with a projection by the
+# candidate endpoints that only need a few fields.
+class InterviewStatusView(BaseModel):
+    lifecycle_status: InterviewLifecycleStatus = "info_submitted"
+    is_completed: bool = False
+    start_time: Optional[datetime] = None
+
+
+class InterviewStartView(InterviewStatusView):
+    general_question_set_revision: Optional[str] = None
+    general_questions_snapshot: List[Question] = []
+
+
+class InterviewAnswerState(InterviewStatusView):
+    selected_field: SpecializedField = "none"
+    desired_position_in_field: Optional[str] = None
+    question_set_revision: Optional[str] = None
+    questions_snapshot: Optional[List[Question]] = None
+    answer_count: int = 0
+    feedback_mode: FeedbackMode = "per_answer"
+
+
 class InterviewPublic(BaseModel):
     id: str
     lifecycle_status: InterviewLifecycleStatus
     selected_field: SpecializedField
     desired_position_in_field: Optional[str]
     general_question_set_id_name: Optional[str]
+    general_question_set_revision: Optional[str] = None
     specialized_question_set_id_name: Optional[str]
+    specialized_question_set_revision: Optional[str] = None
     overall_assessment: Optional[OverallAssessment]
+    assessment_job_status: Optional[AssessmentJobStatus] = None
     start_time: datetime
     updated_at: datetime
     end_time: Optional[datetime]
@@ -178,6 +248,57 @@ class InterviewPublic(BaseModel):
         from_attributes = True
 
 
+class InterviewAssessmentSummary(BaseModel):
+    status: Optional[str] = None
+
+
+class InterviewListItem(BaseModel):
+    # Row of the admin interview list; loaded with INTERVIEW_LIST_PROJECTION so
+    # question snapshots, answers and the full assessment are never fetched.
+    id: str
+    candidate_info_raw: Optional[Dict[str, Any]] = None
+    lifecycle_status: InterviewLifecycleStatus
+    selected_field: SpecializedField = "none"
+    desired_position_in_field: Optional[str] = None
+    general_question_set_id_name: Optional[str] = None
+    specialized_question_set_id_name: Optional[str] = None
+    overall_assessment: Optional[InterviewAssessmentSummary] = None
+    assessment_job_status: Optional[AssessmentJobStatus] = None
+    start_time: datetime
+    updated_at: datetime
+    end_time: Optional[datetime] = None
+    is_completed: bool = False
+
+
+class InterviewSearchHit(InterviewListItem):
+    score: float
+
+
+INTERVIEW_LIST_PROJECTION = {
+    "candidate_info_raw": 1, "lifecycle_status": 1, "selected_field": 1, "desired_position_in_field": 1,
+    "general_question_set_id_name": 1, "specialized_question_set_id_name": 1, "overall_assessment.status": 1,
+    "assessment_job_status": 1, "start_time": 1, "updated_at": 1, "end_time": 1, "is_completed": 1,
+}
+
+
+class AnalyticsDailyVolume(BaseModel):
+    day: str
+    started: int = 0
+    completed: int = 0
+
+
+class InterviewAnalyticsResponse(BaseModel):
+    # Interviews are counted on the UTC day they started.
+    from_day: str
+    to_day: str
+    funnel: Dict[str, int]
+    assessment_status_counts: Dict[str, int]
+    assessment_status_by_field: Dict[str, Dict[str, int]]
+    median_duration_minutes: Optional[float] = None
+    completed_with_duration: int = 0
+    daily_volumes: List[AnalyticsDailyVolume] = []
+
+
 class SelectFieldPayload(BaseModel):
     interview_db_id: str
     field: SpecializedField
@@ -205,6 +326,14 @@ class AIFeedbackResponse(BaseModel):
     final_assessment: Optional[OverallAssessment] = None
 
 
+class FinalAssessmentStatusResponse(BaseModel):
+    interview_db_id: str
+    interview_lifecycle_status: InterviewLifecycleStatus
+    assessment_job_status: Optional[AssessmentJobStatus] = None
+    is_final_assessment_ready: bool = False
+    final_assessment: Optional[OverallAssessment] = None
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -213,8 +342,14 @@ class SubmitCandidateInfoResponse(BaseModel):
     interview_id: str
     message: str
 
+
+# _id of the single settings document holding the default question sets; the
+# config cache polls it and the admin routes write it.
+DEFAULT_SETTINGS_ID = "default_question_set_config"
+
+
 class DefaultQuestionSetSettings(BaseModel):
-    id: str = Field(alias="_id", default="default_question_set_config")
+    id: str = Field(alias="_id", default=DEFAULT_SETTINGS_ID)
     default_general_qset_id_name: Optional[str] = None
     default_developer_qset_id_name: Optional[str] = None
     default_designer_qset_id_name: Optional[str] = None
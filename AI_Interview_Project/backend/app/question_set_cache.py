@@ -0,0 +1,225 @@
+# backend/app/question_set_cache.py
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .config import settings
+from .models import FeedbackMode, Question, QuestionSetInDB, SpecializedField
+
+QUESTION_SET_REVISIONS_COLLECTION = "question_set_revisions"
+
+# Interview fields that reference a revision, and the snapshot / answers they stand in for.
+QUESTION_REFERENCE_FIELDS = {
+    "general_question_set_revision": ("general_questions_snapshot", "general_answers_and_feedback"),
+    "specialized_question_set_revision": ("specialized_questions_snapshot", "specialized_answers_and_feedback"),
+}
+
+
+def compute_revision_hash(questions: List[Question]) -> str:
+    canonical = json.dumps([{"id": str(q.id), "text": q.text, "order": q.order} for q in questions],
+                           ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class QuestionSetSnapshot:
+    # An immutable, already validated question set revision. `questions_for_db`
+    # is the form stored in the revisions collection and must be treated as
+    # read-only.
+
+    def __init__(self, question_set: QuestionSetInDB):
+        self.id_name = question_set.id_name
+        self.version = question_set.version
+        self.field_type: SpecializedField = question_set.field_type
+        self.feedback_mode: Optional[FeedbackMode] = question_set.feedback_mode
+        self.questions: Tuple[Question, ...] = tuple(question_set.questions)
+        self.questions_for_db: List[Dict[str, Any]] = [q.model_dump() for q in question_set.questions]
+        self.revision_hash = compute_revision_hash(question_set.questions)
+
+
+class QuestionSetSnapshotCache:
+    # Per-worker map of (id_name, version) -> QuestionSetSnapshot. Updating a
+    # question set bumps its `version`; other workers notice by re-reading just
+    # that field at most every `version_check_seconds`.
+
+    def __init__(self, max_entries: int, version_check_seconds: float):
+        self.max_entries = max_entries
+        self.version_check_seconds = version_check_seconds
+        self._snapshots: "OrderedDict[Tuple[str, int], QuestionSetSnapshot]" = OrderedDict()
+        # id_name -> (latest known version, monotonic time it was confirmed)
+        self._latest: Dict[str, Tuple[int, float]] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self.stale_reloads = 0
+
+    def invalidate(self, id_name: str):
+        self._latest.pop(id_name, None)
+
+    def _store(self, snapshot: QuestionSetSnapshot):
+        key = (snapshot.id_name, snapshot.version)
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        # Older revisions of the same set are never looked up again.
+        for old_key in [k for k in self._snapshots if k[0] == snapshot.id_name and k[1] < snapshot.version]:
+            del self._snapshots[old_key]
+        while len(self._snapshots) > self.max_entries:
+            evicted_key, _ = self._snapshots.popitem(last=False)
+            if self._latest.get(evicted_key[0], (None,))[0] == evicted_key[1]:
+                del self._latest[evicted_key[0]]
+        self._latest[snapshot.id_name] = (snapshot.version, time.monotonic())
+
+    async def _load(self, db: AsyncIOMotorDatabase, id_name: str) -> Optional[QuestionSetSnapshot]:
+        qset_doc = await db.get_collection("question_sets").find_one({"id_name": id_name})
+        if not qset_doc:
+            self.invalidate(id_name)
+            return None
+        snapshot = QuestionSetSnapshot(QuestionSetInDB(**qset_doc))
+        self._store(snapshot)
+        return snapshot
+
+    async def get(self, db: AsyncIOMotorDatabase, id_name: str) -> Optional[QuestionSetSnapshot]:
+        latest = self._latest.get(id_name)
+        if latest is not None:
+            version, checked_at = latest
+            snapshot = self._snapshots.get((id_name, version))
+            if snapshot is not None:
+                if time.monotonic() - checked_at < self.version_check_seconds:
+                    self.hits += 1
+                    self._snapshots.move_to_end((id_name, version))
+                    return snapshot
+
+                self.version_checks += 1
+                version_doc = await db.get_collection("question_sets").find_one(
+                    {"id_name": id_name}, {"version": 1}
+                )
+                if version_doc is not None and version_doc.get("version", 0) == version:
+                    self._latest[id_name] = (version, time.monotonic())
+                    self.hits += 1
+                    return snapshot
+                self.stale_reloads += 1
+
+        self.misses += 1
+        load_lock = self._load_locks.setdefault(id_name, asyncio.Lock())
+        async with load_lock:
+            # Whoever held the lock may already have loaded a fresh revision.
+            fresh = self._latest.get(id_name)
+            if fresh is not None and fresh != latest and (id_name, fresh[0]) in self._snapshots:
+                return self._snapshots[(id_name, fresh[0])]
+            return await self._load(db, id_name)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._snapshots),
+            "max_entries": self.max_entries,
+            "version_check_seconds": self.version_check_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "version_checks": self.version_checks,
+            "stale_reloads": self.stale_reloads,
+            "cached_versions": {id_name: version for id_name, version in self._snapshots},
+        }
+
+
+class QuestionSetRevisionCache:
+    # Revisions are content-addressed (`_id` is the hash of the questions) and
+    # never change, so entries need no invalidation; the cache is only bounded.
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._revisions: "OrderedDict[str, Tuple[Question, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, revision_hash: str, questions: Tuple[Question, ...]):
+        self._revisions[revision_hash] = questions
+        self._revisions.move_to_end(revision_hash)
+        while len(self._revisions) > self.max_entries:
+            self._revisions.popitem(last=False)
+
+    async def store(self, db: AsyncIOMotorDatabase, snapshot: QuestionSetSnapshot):
+        # A revision this worker has seen is known to exist in the collection.
+        if snapshot.revision_hash in self._revisions:
+            return
+        await db.get_collection(QUESTION_SET_REVISIONS_COLLECTION).update_one(
+            {"_id": snapshot.revision_hash},
+            {"$setOnInsert": {"questions": snapshot.questions_for_db,
+                              "source_id_name": snapshot.id_name,
+                              "created_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        self._remember(snapshot.revision_hash, snapshot.questions)
+
+    async def get(self, db: AsyncIOMotorDatabase, revision_hash: str) -> Optional[Tuple[Question, ...]]:
+        questions = self._revisions.get(revision_hash)
+        if questions is not None:
+            self.hits += 1
+            self._revisions.move_to_end(revision_hash)
+            return questions
+
+        self.misses += 1
+        revision_doc = await db.get_collection(QUESTION_SET_REVISIONS_COLLECTION).find_one({"_id": revision_hash})
+        if not revision_doc:
+            return None
+        questions = tuple(Question(**q) for q in revision_doc.get("questions", []))
+        self._remember(revision_hash, questions)
+        return questions
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._revisions),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+async def resolve_question_references(db: AsyncIOMotorDatabase, interview_doc: Dict[str, Any]) -> Dict[str, Any]:
+    # Fills an interview document loaded from Mongo back to its full shape:
+    # question snapshots from the referenced revisions and `question_text` on
+    # answers, which are stored without it. Legacy documents that still embed
+    # their snapshots are returned unchanged.
+    for revision_field, (snapshot_field, answers_field) in QUESTION_REFERENCE_FIELDS.items():
+        revision_hash = interview_doc.get(revision_field)
+        if not revision_hash:
+            continue
+        questions = await question_set_revision_cache.get(db, revision_hash)
+        if questions is None:
+            print(f"WARNING: Question set revision '{revision_hash}' not found for interview {interview_doc.get('_id')}.")
+            continue
+        if not interview_doc.get(snapshot_field):
+            interview_doc[snapshot_field] = [q.model_dump() for q in questions]
+        texts_by_id = {q.id: q.text for q in questions}
+        for answer in interview_doc.get(answers_field) or []:
+            if answer.get("question_text") is None:
+                answer["question_text"] = texts_by_id.get(_as_uuid(answer.get("question_id")), "")
+    return interview_doc
+
+
+def _as_uuid(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return UUID(value)
+        except ValueError:
+            return value
+    return value
+
+
+question_set_snapshot_cache = QuestionSetSnapshotCache(
+    max_entries=settings.QUESTION_SET_CACHE_MAX_ENTRIES,
+    version_check_seconds=settings.QUESTION_SET_VERSION_CHECK_SECONDS,
+)
+
+question_set_revision_cache = QuestionSetRevisionCache(max_entries=settings.QUESTION_SET_CACHE_MAX_ENTRIES)
@@ -0,0 +1,33 @@
+# backend/app/routers/admin_analytics_routes.py
+from fastapi import APIRouter, Depends, Query
+from typing import Dict, Any
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..analytics import rebuild_rollups, summarize_rollups
+from ..db import get_database
+from ..models import InterviewAnalyticsResponse
+from ..security import get_current_admin_user
+
+router = APIRouter(
+    prefix="/admin/analytics",
+    tags=["Admin - Analytics"],
+    dependencies=[Depends(get_current_admin_user)]
+)
+
+
+@router.get("", response_model=InterviewAnalyticsResponse)
+async def get_interview_analytics(
+        days: int = Query(30, ge=1, le=366, description="Number of days (UTC, by interview start) up to today."),
+        db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    return await summarize_rollups(db, days)
+
+
+@router.post("/rebuild")
+async def rebuild_interview_analytics(db: AsyncIOMotorDatabase = Depends(get_database)) -> Dict[str, Any]:
+    # Recomputes the daily rollups from all interviews; run after a migration
+    # or to correct drift (e.g. a completed interview restarted and not yet
+    # completed again is still counted as completed by the incremental updates).
+    rebuilt_days = await rebuild_rollups(db)
+    return {"rebuilt_days": rebuilt_days}
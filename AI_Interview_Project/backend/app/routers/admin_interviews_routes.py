@@ -1,11 +1,29 @@
 # backend/app/routers/admin_interviews_routes.py
-from fastapi import APIRouter, HTTPException, Depends, Query, status
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional, Dict, Any, Tuple
 from bson import ObjectId
+from datetime import datetime, timezone
+import base64
+import json
 
+from cachetools import TTLCache
+from pydantic import ValidationError
+
+from ..config import settings
 from ..db import get_database
+from ..interview_archive import INTERVIEW_COLLECTIONS, find_interview, iter_all_interviews
+from ..interview_export import (
+    resolve_export_columns, build_export_projection, iter_ndjson_rows, iter_csv_rows
+)
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from ..models import InterviewPublic, InterviewInDB, InterviewLifecycleStatus
+from ..metrics import app_counters
+from ..question_set_cache import resolve_question_references
+from ..search_index import fold_search_text
+from ..models import (
+    InterviewPublic, InterviewInDB, InterviewLifecycleStatus, InterviewListItem, InterviewSearchHit,
+    INTERVIEW_LIST_PROJECTION
+)
 from ..security import get_current_admin_user
 
 router = APIRouter(
@@ -14,9 +32,57 @@ router = APIRouter(
     dependencies=[Depends(get_current_admin_user)]
 )
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Filtered counts are exact but cached briefly; the unfiltered total uses the
+# collection metadata (estimated_document_count) and is effectively free.
+_filtered_count_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+
+
+def encode_interview_cursor(updated_at: datetime, interview_oid: ObjectId) -> str:
+    raw_cursor = json.dumps({"u": updated_at.isoformat(), "i": str(interview_oid)})
+    return base64.urlsafe_b64encode(raw_cursor.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_interview_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        padded_cursor = cursor + "=" * (-len(cursor) % 4)
+        raw_cursor = json.loads(base64.urlsafe_b64decode(padded_cursor.encode("ascii")))
+        return datetime.fromisoformat(raw_cursor["u"]), ObjectId(raw_cursor["i"])
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+
+async def count_interviews(interview_collection, query: Dict[str, Any]) -> int:
+    if not query:
+        return await interview_collection.estimated_document_count()
+    cache_key = interview_collection.name + ":" + json.dumps(query, sort_keys=True, default=str)
+    cached_total = _filtered_count_cache.get(cache_key)
+    if cached_total is None:
+        cached_total = await interview_collection.count_documents(query)
+        _filtered_count_cache[cache_key] = cached_total
+    return cached_total
+
+
+def build_interview_filter(lifecycle_status_filter: Optional[InterviewLifecycleStatus], show_all_statuses: bool,
+                           overall_assessment_status_filter: Optional[str]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {}
+
+    if not show_all_statuses:
+        if lifecycle_status_filter:
+            query["lifecycle_status"] = lifecycle_status_filter
+        else:
+            query["lifecycle_status"] = "completed"
+
+    if overall_assessment_status_filter:
+        query["overall_assessment.status"] = overall_assessment_status_filter
+    return query
+
 
-@router.get("", response_model=List[InterviewPublic])
+@router.get("", response_model=List[InterviewListItem])
 async def get_all_interviews(
+        response: Response,
         db: AsyncIOMotorDatabase = Depends(get_database),
         lifecycle_status_filter: Optional[InterviewLifecycleStatus] = Query(default=None,
                                                                             description="Filter by lifecycle status. If 'show_all_statuses' is false and this is null, defaults to 'completed'."),
@@ -25,50 +91,142 @@ async def get_all_interviews(
         overall_assessment_status_filter: Optional[str] = Query(default=None,
                                                                 description="Filter by the status string within overall_assessment (e.g., 'Đạt', 'Không đạt')."),
         limit: int = Query(20, ge=1, le=100),
-        skip: int = Query(0, ge=0)
+        skip: int = Query(0, ge=0, description="Offset pagination fallback; ignored when 'after' is given."),
+        after: Optional[str] = Query(default=None,
+                                     description="Opaque cursor from the X-Next-Cursor header of the previous page."),
+        include_total: bool = Query(default=False,
+                                    description="Return the (cached/estimated) total in the X-Total-Count header.")
 ):
-    interview_collection = db.get_collection("interviews")
-    query: Dict[str, Any] = {}
+    query = build_interview_filter(lifecycle_status_filter, show_all_statuses, overall_assessment_status_filter)
 
-    if not show_all_statuses:
-        if lifecycle_status_filter:
-            query["lifecycle_status"] = lifecycle_status_filter
-        else:
-            query["lifecycle_status"] = "completed"
+    if include_total:
+        total = 0
+        for collection_name in INTERVIEW_COLLECTIONS:
+            total += await count_interviews(db.get_collection(collection_name), query)
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
 
-    if overall_assessment_status_filter:
-        query["overall_assessment.status"] = overall_assessment_status_filter
+    # Keyset pagination on (updated_at, _id): stable under concurrent updates and
+    # index-backed at any depth, unlike skip().
+    page_query = dict(query)
+    if after:
+        after_updated_at, after_oid = decode_interview_cursor(after)
+        page_query["$or"] = [
+            {"updated_at": {"$lt": after_updated_at}},
+            {"updated_at": after_updated_at, "_id": {"$lt": after_oid}},
+        ]
+
+    # The same page is read from the hot collection and the archive and merged
+    # in (updated_at, _id) order, so cursors keep working across both.
+    page_skip = skip if not after else 0
+    page_docs: Dict[Any, Dict[str, Any]] = {}
+    for collection_name in INTERVIEW_COLLECTIONS:
+        interviews_cursor = db.get_collection(collection_name).find(page_query, INTERVIEW_LIST_PROJECTION) \
+            .sort([("updated_at", -1), ("_id", -1)]) \
+            .limit(page_skip + limit)
+        async for interview_doc in interviews_cursor:
+            page_docs.setdefault(interview_doc["_id"], interview_doc)
+    min_time = datetime.min.replace(tzinfo=timezone.utc)
+    merged_docs = sorted(page_docs.values(),
+                         key=lambda doc: (doc.get("updated_at") or min_time, doc["_id"]),
+                         reverse=True)[page_skip:page_skip + limit]
 
-    interviews_cursor = interview_collection.find(query).sort("updated_at", -1).skip(skip).limit(limit)
     interviews_list = []
-    async for interview_doc in interviews_cursor:
-        interview_doc_id_str = str(interview_doc["_id"])
+    page_doc_count = 0
+    last_doc = None
+    for interview_doc in merged_docs:
+        page_doc_count += 1
+        last_doc = interview_doc
         try:
-            validated_interview = InterviewInDB(**interview_doc)
-            public_data = validated_interview.model_dump()
-            public_data["id"] = interview_doc_id_str
-            public_data.pop("general_questions_snapshot", None)
-            public_data.pop("general_answers_and_feedback", None)
-            public_data.pop("specialized_questions_snapshot", None)
-            public_data.pop("specialized_answers_and_feedback", None)
-            interviews_list.append(InterviewPublic(**public_data))
-        except Exception as e:
-            print(f"Error validating/transforming interview doc {interview_doc_id_str} from DB for list view: {e}")
+            row_data = {key: value for key, value in interview_doc.items() if key != "_id"}
+            interviews_list.append(InterviewListItem(id=str(interview_doc["_id"]), **row_data))
+        except ValidationError:
+            app_counters.increment("admin_interview_list_validation_errors")
+
+    if page_doc_count == limit and last_doc is not None and last_doc.get("updated_at"):
+        response.headers[NEXT_CURSOR_HEADER] = encode_interview_cursor(last_doc["updated_at"], last_doc["_id"])
     return interviews_list
 
 
+@router.get("/export")
+async def export_interviews(
+        db: AsyncIOMotorDatabase = Depends(get_database),
+        format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+        fields: str = Query(default="",
+                            description="Comma separated export columns, e.g. 'id,candidate_full_name,assessment_status'. Empty: all columns."),
+        lifecycle_status_filter: Optional[InterviewLifecycleStatus] = Query(default=None),
+        show_all_statuses: bool = Query(default=False),
+        overall_assessment_status_filter: Optional[str] = Query(default=None),
+):
+    # Streams every matching interview straight from the cursor, one row per
+    # document; only the requested columns are fetched from Mongo.
+    try:
+        columns = resolve_export_columns(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    query = build_interview_filter(lifecycle_status_filter, show_all_statuses, overall_assessment_status_filter)
+    projection = build_export_projection(columns)
+    interviews_cursor = iter_all_interviews(
+        db, lambda collection: collection.find(query, projection)
+        .sort([("updated_at", -1), ("_id", -1)])
+        .batch_size(settings.INTERVIEW_EXPORT_BATCH_SIZE)
+    )
+
+    if format == "csv":
+        return StreamingResponse(iter_csv_rows(interviews_cursor, columns), media_type="text/csv; charset=utf-8",
+                                 headers={"Content-Disposition": 'attachment; filename="interviews.csv"'})
+    return StreamingResponse(iter_ndjson_rows(interviews_cursor, columns), media_type="application/x-ndjson",
+                             headers={"Content-Disposition": 'attachment; filename="interviews.ndjson"'})
+
+
+@router.get("/search", response_model=List[InterviewSearchHit])
+async def search_interviews(
+        db: AsyncIOMotorDatabase = Depends(get_database),
+        q: str = Query(..., min_length=1, max_length=200,
+                       description="Words to find in candidate info, answers, AI feedback and assessments. Accents are ignored; quote a phrase to match it exactly."),
+        limit: int = Query(20, ge=1, le=100),
+        skip: int = Query(0, ge=0),
+):
+    # Served by the interview_search_text index over the folded search fields
+    # (see search_index.py), best matches first.
+    search_text = fold_search_text(q)
+    if not search_text:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search query is empty.")
+
+    # Top skip + limit hits from the hot collection and the archive, merged by score.
+    score = {"$meta": "textScore"}
+    hit_docs: Dict[Any, Dict[str, Any]] = {}
+    for collection_name in INTERVIEW_COLLECTIONS:
+        interviews_cursor = db.get_collection(collection_name).find(
+            {"$text": {"$search": search_text}}, {**INTERVIEW_LIST_PROJECTION, "score": score}
+        ).sort([("score", score), ("_id", -1)]).limit(skip + limit)
+        async for interview_doc in interviews_cursor:
+            hit_docs.setdefault(interview_doc["_id"], interview_doc)
+    ranked_docs = sorted(hit_docs.values(), key=lambda doc: (doc.get("score", 0.0), doc["_id"]),
+                         reverse=True)[skip:skip + limit]
+
+    search_hits = []
+    for interview_doc in ranked_docs:
+        try:
+            row_data = {key: value for key, value in interview_doc.items() if key != "_id"}
+            search_hits.append(InterviewSearchHit(id=str(interview_doc["_id"]), **row_data))
+        except ValidationError:
+            app_counters.increment("admin_interview_list_validation_errors")
+    return search_hits
+
+
 @router.get("/{interview_db_id}", response_model=InterviewPublic)
 async def get_interview_by_id(interview_db_id: str, db: AsyncIOMotorDatabase = Depends(get_database)):
-    interview_collection = db.get_collection("interviews")
     try:
         oid = ObjectId(interview_db_id)
     except Exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid interview_db_id format.")
 
-    interview_doc = await interview_collection.find_one({"_id": oid})
+    interview_doc = await find_interview(db, {"_id": oid})
     if not interview_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interview not found.")
 
+    interview_doc = await resolve_question_references(db, interview_doc)
     try:
         interview_instance = InterviewInDB(**interview_doc)
         public_representation = InterviewPublic(
@@ -78,10 +236,13 @@ async def get_interview_by_id(interview_db_id: str, db: AsyncIOMotorDatabase = D
             selected_field=interview_instance.selected_field,
             desired_position_in_field=interview_instance.desired_position_in_field,
             general_question_set_id_name=interview_instance.general_question_set_id_name,
+            general_question_set_revision=interview_instance.general_question_set_revision,
             general_answers_and_feedback=interview_instance.general_answers_and_feedback,
             specialized_question_set_id_name=interview_instance.specialized_question_set_id_name,
+            specialized_question_set_revision=interview_instance.specialized_question_set_revision,
             specialized_answers_and_feedback=interview_instance.specialized_answers_and_feedback,
             overall_assessment=interview_instance.overall_assessment,
+            assessment_job_status=interview_instance.assessment_job_status,
             start_time=interview_instance.start_time,
             updated_at=interview_instance.updated_at,
             end_time=interview_instance.end_time,
@@ -0,0 +1,55 @@
+# backend/app/routers/admin_metrics_routes.py
+from fastapi import APIRouter, Depends
+from typing import Dict, Any
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .. import globals as app_globals
+from ..db import get_database
+from ..db_indexes import build_index_report
+from ..db_monitoring import mongo_metrics
+from ..config_cache import default_qset_config_cache
+from ..feedback_cache import feedback_cache
+from ..idempotency import idempotency_store
+from ..interview_sweeper import interview_sweeper
+from ..llm_admission import llm_admission
+from ..metrics import app_counters
+from ..metrics_exporter import worker_metrics_exporter
+from ..question_set_cache import question_set_snapshot_cache, question_set_revision_cache
+from ..security import get_current_admin_user
+
+router = APIRouter(
+    prefix="/admin/metrics",
+    tags=["Admin - Metrics"],
+    dependencies=[Depends(get_current_admin_user)]
+)
+
+
+@router.get("")
+async def get_metrics() -> Dict[str, Any]:
+    return {
+        "feedback_cache": feedback_cache.stats(),
+        "default_qset_config_cache": default_qset_config_cache.stats(),
+        "question_set_snapshot_cache": question_set_snapshot_cache.stats(),
+        "question_set_revision_cache": question_set_revision_cache.stats(),
+        "llm_admission": llm_admission.stats(),
+        "llm_providers": app_globals.llm_router.snapshot() if app_globals.llm_router else {},
+        "counters": app_counters.snapshot(),
+        "mongo": mongo_metrics.snapshot(),
+        "interview_sweeper": interview_sweeper.stats(),
+        "idempotency": idempotency_store.stats(),
+        "metrics_exporter": worker_metrics_exporter.stats(),
+    }
+
+
+@router.get("/circuit-breakers")
+async def get_circuit_breakers() -> Dict[str, Any]:
+    if not app_globals.llm_router:
+        return {}
+    return app_globals.llm_router.circuit_snapshot()
+
+
+@router.get("/indexes")
+async def get_index_report(db: AsyncIOMotorDatabase = Depends(get_database)) -> Dict[str, Any]:
+    return await build_index_report(db)
+
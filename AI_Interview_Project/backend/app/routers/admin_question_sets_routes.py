@@ -1,14 +1,23 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Body
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, status, Body
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import uuid4
 from datetime import datetime, timezone
 from bson import ObjectId
+import json
+from pydantic import ValidationError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
+from ..config import settings
+from ..config_cache import default_qset_config_cache
 from ..db import get_database
+from ..question_set_cache import question_set_snapshot_cache
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from ..models import (
     QuestionSetCreate, QuestionSetPublic, QuestionSetUpdate,
-    QuestionSetInDB, Question, DefaultQuestionSetSettings
+    QuestionSetInDB, Question, DefaultQuestionSetSettings, DEFAULT_SETTINGS_ID,
+    QuestionSetBulkImportResult, QuestionSetBulkLineError
 )
 from ..security import get_current_admin_user
 
@@ -18,8 +27,6 @@ router = APIRouter(
     dependencies=[Depends(get_current_admin_user)]
 )
 
-DEFAULT_SETTINGS_ID = "default_question_set_config"
-
 
 @router.post("", response_model=QuestionSetPublic, status_code=status.HTTP_201_CREATED)
 async def create_question_set(qset_data: QuestionSetCreate, db: AsyncIOMotorDatabase = Depends(get_database)):
@@ -40,13 +47,14 @@ async def create_question_set(qset_data: QuestionSetCreate, db: AsyncIOMotorData
     validated_qset_data = {k: v for k, v in new_qset_doc_data.items() if k in QuestionSetInDB.model_fields}
     validated_qset = QuestionSetInDB(**validated_qset_data, _id=ObjectId())
 
-    await question_set_collection.insert_one(validated_qset.model_dump(by_alias=True))
+    try:
+        await question_set_collection.insert_one(validated_qset.model_dump(by_alias=True))
+    except DuplicateKeyError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Question set with id_name '{validated_qset.id_name}' already exists.")
 
-    created_doc = await question_set_collection.find_one({"id_name": validated_qset.id_name})
-    if not created_doc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            detail="Failed to create and retrieve question set.")
-    return QuestionSetPublic(**QuestionSetInDB(**created_doc).model_dump())
+    # The inserted document is exactly `validated_qset`; no need to read it back.
+    return QuestionSetPublic(**validated_qset.model_dump())
 
 
 @router.get("", response_model=List[QuestionSetPublic])
@@ -61,6 +69,152 @@ async def get_all_question_sets(db: AsyncIOMotorDatabase = Depends(get_database)
     return qsets_list
 
 
+async def iter_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    # Yields (line number, raw line) from the streamed request body; an
+    # over-long line is yielded as None and skipped up to the next newline.
+    buffer = b""
+    line_number = 0
+    skipping_long_line = False
+    async for chunk in request.stream():
+        buffer += chunk
+        while b"\n" in buffer:
+            raw_line, buffer = buffer.split(b"\n", 1)
+            line_number += 1
+            if skipping_long_line:
+                skipping_long_line = False
+                yield line_number, None
+                continue
+            yield line_number, raw_line
+        if len(buffer) > settings.QUESTION_SET_BULK_MAX_LINE_BYTES:
+            buffer = b""
+            skipping_long_line = True
+    if skipping_long_line:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, buffer
+
+
+def parse_bulk_question_set_line(raw_line: bytes) -> QuestionSetInDB:
+    line_data = json.loads(raw_line)
+    if not isinstance(line_data, dict):
+        raise ValueError("Each line must be a JSON object.")
+    qset_data = QuestionSetCreate(**line_data)
+    if not qset_data.id_name:
+        qset_data.id_name = f"{qset_data.field_type}-{uuid4().hex[:6]}"
+    return QuestionSetInDB(**qset_data.model_dump())
+
+
+def bulk_upsert_operation(qset: QuestionSetInDB, current_time: datetime) -> UpdateOne:
+    # Pipeline update: updated_at and version only move when the content differs,
+    # so re-importing an unchanged set is a no-op and not counted as modified.
+    content = {
+        "name": qset.name,
+        "questions": [q.model_dump() for q in qset.questions],
+        "field_type": qset.field_type,
+        "feedback_mode": qset.feedback_mode,
+    }
+    # A missing field compares as null, so a legacy set without feedback_mode
+    # matches an import with feedback_mode None instead of bumping its version.
+    content_changed = {"$or": [{"$ne": [{"$ifNull": [f"${field}", None]}, {"$literal": value}]}
+                               for field, value in content.items()]}
+    return UpdateOne(
+        {"id_name": qset.id_name},
+        [
+            {"$set": {
+                "updated_at": {"$cond": [content_changed, current_time, "$updated_at"]},
+                "version": {"$cond": [content_changed, {"$add": [{"$ifNull": ["$version", 0]}, 1]}, "$version"]},
+                "created_at": {"$ifNull": ["$created_at", current_time]},
+            }},
+            {"$set": {field: {"$literal": value} for field, value in content.items()}},
+        ],
+        upsert=True
+    )
+
+
+@router.post("/bulk", response_model=QuestionSetBulkImportResult)
+async def bulk_import_question_sets(request: Request, db: AsyncIOMotorDatabase = Depends(get_database)):
+    # Body: NDJSON, one QuestionSetCreate per line (the format of GET /export).
+    # Sets are upserted by id_name; a bad line is reported and does not stop the import.
+    question_set_collection = db.get_collection("question_sets")
+    import_result = QuestionSetBulkImportResult()
+    pending_operations: List[UpdateOne] = []
+    pending_lines: List[Tuple[int, str]] = []
+
+    async def flush_pending():
+        if not pending_operations:
+            return
+        failed_indexes = set()
+        try:
+            write_result = await question_set_collection.bulk_write(pending_operations, ordered=False)
+            written_count = write_result.upserted_count + write_result.modified_count
+            import_result.inserted += write_result.upserted_count
+            import_result.updated += write_result.modified_count
+        except BulkWriteError as bwe:
+            details = bwe.details
+            written_count = details.get("nUpserted", 0) + details.get("nModified", 0)
+            import_result.inserted += details.get("nUpserted", 0)
+            import_result.updated += details.get("nModified", 0)
+            for write_error in details.get("writeErrors", []):
+                failed_indexes.add(write_error["index"])
+                line_number, id_name = pending_lines[write_error["index"]]
+                import_result.failed += 1
+                import_result.errors.append(QuestionSetBulkLineError(line=line_number, id_name=id_name,
+                                                                     error=write_error.get("errmsg", "Write error.")))
+        # The bulk result does not say which matched lines were modified, so a
+        # batch that wrote anything invalidates every line without a write
+        # error; a batch that changed nothing keeps the cache as it is.
+        if written_count:
+            for line_index, (_, id_name) in enumerate(pending_lines):
+                if line_index not in failed_indexes:
+                    question_set_snapshot_cache.invalidate(id_name)
+        pending_operations.clear()
+        pending_lines.clear()
+
+    current_time = datetime.now(timezone.utc)
+    async for line_number, raw_line in iter_ndjson_lines(request):
+        if raw_line is not None and not raw_line.strip():
+            continue
+        import_result.received += 1
+        if raw_line is None:
+            import_result.failed += 1
+            import_result.errors.append(QuestionSetBulkLineError(
+                line=line_number, error=f"Line longer than {settings.QUESTION_SET_BULK_MAX_LINE_BYTES} bytes."))
+            continue
+        try:
+            qset = parse_bulk_question_set_line(raw_line)
+        except (ValueError, ValidationError) as e:
+            # json.JSONDecodeError and UnicodeDecodeError are ValueErrors too.
+            import_result.failed += 1
+            import_result.errors.append(QuestionSetBulkLineError(line=line_number, error=str(e)))
+            continue
+
+        # Unordered bulk writes may apply a batch in any order, so a repeated
+        # id_name must land in a later batch.
+        if any(pending_id_name == qset.id_name for _, pending_id_name in pending_lines):
+            await flush_pending()
+        pending_operations.append(bulk_upsert_operation(qset, current_time))
+        pending_lines.append((line_number, qset.id_name))
+        if len(pending_operations) >= settings.QUESTION_SET_BULK_BATCH_SIZE:
+            await flush_pending()
+
+    await flush_pending()
+    return import_result
+
+
+@router.get("/export")
+async def export_question_sets(db: AsyncIOMotorDatabase = Depends(get_database)):
+    question_set_collection = db.get_collection("question_sets")
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        qsets_cursor = question_set_collection.find({}, {"is_default_general": 0}) \
+            .sort("id_name", 1).batch_size(settings.QUESTION_SET_BULK_BATCH_SIZE)
+        async for qset_doc in qsets_cursor:
+            yield QuestionSetPublic(**QuestionSetInDB(**qset_doc).model_dump()).model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson",
+                             headers={"Content-Disposition": 'attachment; filename="question_sets.ndjson"'})
+
+
 @router.get("/default-config", response_model=DefaultQuestionSetSettings)
 async def get_default_question_set_config(db: AsyncIOMotorDatabase = Depends(get_database)):
     settings_collection = db.get_collection("settings")
@@ -101,11 +255,13 @@ async def update_default_question_set_config(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail=f"Invalid default_designer_qset_id_name: '{update_data['default_designer_qset_id_name']}' not found or not a 'designer' type.")
 
+    # Bumping the version makes every worker's config cache reload on its next check.
     result = await settings_collection.update_one(
         {"_id": DEFAULT_SETTINGS_ID},
-        {"$set": update_data},
+        {"$set": update_data, "$inc": {"version": 1}},
         upsert=True
     )
+    default_qset_config_cache.invalidate()
 
     updated_config_doc = await settings_collection.find_one({"_id": DEFAULT_SETTINGS_ID})
     if not updated_config_doc:
@@ -130,10 +286,6 @@ async def update_question_set_endpoint(id_name: str, qset_update_data: QuestionS
                                        db: AsyncIOMotorDatabase = Depends(get_database)):
     question_set_collection = db.get_collection("question_sets")
 
-    existing_qset_doc = await question_set_collection.find_one({"id_name": id_name})
-    if not existing_qset_doc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Question set '{id_name}' not found.")
-
     update_data_dict = qset_update_data.model_dump(exclude_unset=True)
     if not update_data_dict:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No update data provided.")
@@ -143,15 +295,15 @@ async def update_question_set_endpoint(id_name: str, qset_update_data: QuestionS
         update_data_dict["questions"] = [Question(**q).model_dump() if isinstance(q, dict) else q.model_dump() for q in
                                          update_data_dict["questions"]]
 
-    result = await question_set_collection.update_one({"id_name": id_name}, {"$set": update_data_dict})
-
-    if result.modified_count == 0 and not (len(update_data_dict) == 1 and "updated_at" in update_data_dict):
-        pass
-
-    updated_doc = await question_set_collection.find_one({"id_name": id_name})
+    # The version bump tells every worker's snapshot cache to reload this set.
+    updated_doc = await question_set_collection.find_one_and_update(
+        {"id_name": id_name},
+        {"$set": update_data_dict, "$inc": {"version": 1}},
+        return_document=ReturnDocument.AFTER
+    )
     if not updated_doc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                            detail="Updated question set not found after update operation.")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Question set '{id_name}' not found.")
+    question_set_snapshot_cache.invalidate(id_name)
     if 'is_default_general' in updated_doc:
         del updated_doc['is_default_general']
     return QuestionSetPublic(**QuestionSetInDB(**updated_doc).model_dump())
@@ -175,6 +327,7 @@ async def delete_question_set(id_name: str, db: AsyncIOMotorDatabase = Depends(g
                                 detail=f"Cannot delete question set '{id_name}' as it is currently set as a default. Please change the default configuration first.")
 
     delete_result = await question_set_collection.delete_one({"id_name": id_name})
+    question_set_snapshot_cache.invalidate(id_name)
     if delete_result.deleted_count == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f"Question set '{id_name}' not found (delete operation failed).")
@@ -1,31 +1,57 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Header, status
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
 from datetime import datetime, timezone, date
+import asyncio
 import json
-from typing import Dict, Any, List, Optional,Literal
+from typing import Dict, Any, List, Optional, Literal, Sequence
 
-import google.generativeai as genai
-from google.generativeai.types import GenerationConfig
-
-from .. import globals as app_globals
+from ..analytics import record_rollup, record_rollup_once, stage_increments, completion_increments
+from ..ai_assessment import (
+    generate_answer_feedback, stream_answer_feedback, DEFERRED_FEEDBACK_PLACEHOLDER, FEEDBACK_PENDING_PLACEHOLDER,
+    FEEDBACK_ERROR_TEXT
+)
+from ..assessment_jobs import assessment_job_manager, batch_feedback_job_kind
+from ..concurrency import gather_isolated
+from ..config import settings
+from ..config_cache import default_qset_config_cache
 from ..db import get_database
+from ..idempotency import idempotency_store
+from ..llm_admission import llm_admission, LLMOverloadedError
+from ..search_index import (
+    SEARCH_ENTRIES_FIELD, feedback_search_entries, profile_search_text, search_entries
+)
+from ..question_set_cache import question_set_snapshot_cache, question_set_revision_cache, QuestionSetSnapshot
+from ..transcript import GENERAL_SECTION_HEADER, specialized_section_header, format_transcript_entry
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from ..models import (
     InterviewQuestionResponse, AnswerPayload, AIFeedbackResponse,
-    AnswerWithFeedback, OverallAssessment, Question, QuestionSetInDB,
+    AnswerWithFeedback, OverallAssessment, Question,
     InterviewInDB, SpecializedField, SelectFieldPayload, InterviewLifecycleStatus,
-    CandidateInfoPayload, SubmitCandidateInfoResponse, StrengthWeaknessDetail,
-    DefaultQuestionSetSettings
+    CandidateInfoPayload, SubmitCandidateInfoResponse, FinalAssessmentStatusResponse, FeedbackMode,
+    InterviewStatusView, InterviewStartView, InterviewAnswerState
 )
 router = APIRouter()
 
-DEFAULT_SETTINGS_ID = "default_question_set_config"
+_background_tasks = set()
+
+def resolve_feedback_mode(question_set: QuestionSetSnapshot) -> FeedbackMode:
+    return question_set.feedback_mode or settings.DEFAULT_FEEDBACK_MODE
+
+
+async def resolve_phase_questions(db: AsyncIOMotorDatabase, revision_hash: Optional[str],
+                                  embedded_snapshot: Optional[List[Question]]) -> Sequence[Question]:
+    # Interviews reference a question set revision; older ones embed a copy.
+    if embedded_snapshot:
+        return embedded_snapshot
+    if revision_hash:
+        return await question_set_revision_cache.get(db, revision_hash) or ()
+    return ()
 
 
 async def get_default_qset_id_name_from_config(db: AsyncIOMotorDatabase,
                                                qset_type: Literal["general", "developer", "designer"]) -> Optional[str]:
-    settings_collection = db.get_collection("settings")
-    config_doc = await settings_collection.find_one({"_id": DEFAULT_SETTINGS_ID})
+    config_doc = await default_qset_config_cache.get(db)
     if config_doc:
         if qset_type == "general":
             return config_doc.get("default_general_qset_id_name")
@@ -54,12 +80,14 @@ async def submit_candidate_info_endpoint(
         updated_at=current_time,
         start_time=current_time,
         desired_position_in_field=payload.interested_field,
+        search_profile_text=profile_search_text(candidate_info_to_save),
     )
 
     try:
         db_entry = new_interview_data.model_dump(by_alias=True, exclude_none=True)
         result = await interview_collection.insert_one(db_entry)
         interview_db_id = str(result.inserted_id)
+        await record_rollup(db, current_time, stage_increments("info_submitted"))
 
         return SubmitCandidateInfoResponse(
             interview_id=interview_db_id,
@@ -77,27 +105,41 @@ async def submit_candidate_info_endpoint(
 @router.post("/interviews/{interview_id}/start-general", response_model=AIFeedbackResponse)
 async def start_general_phase_endpoint(
         interview_id: str,
-        db: AsyncIOMotorDatabase = Depends(get_database)
+        db: AsyncIOMotorDatabase = Depends(get_database),
+        idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=255)
 ):
+    if not idempotency_key:
+        return await start_general_phase(interview_id, db)
+    return await idempotency_store.run(db, f"start-general:{interview_id}", idempotency_key, "", AIFeedbackResponse,
+                                       lambda: start_general_phase(interview_id, db))
+
+
+async def start_general_phase(interview_id: str, db: AsyncIOMotorDatabase) -> AIFeedbackResponse:
     interview_collection = db.get_collection("interviews")
-    question_set_collection = db.get_collection("question_sets")
 
     try:
         interview_oid = ObjectId(interview_id)
     except Exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid interview_id format.")
 
-    interview_doc = await interview_collection.find_one({"_id": interview_oid})
+    # Two questions are enough to know whether the first one is also the last.
+    interview_doc = await interview_collection.find_one(
+        {"_id": interview_oid},
+        {"lifecycle_status": 1, "is_completed": 1, "start_time": 1, "general_question_set_revision": 1,
+         "general_questions_snapshot": {"$slice": 2}}
+    )
     if not interview_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interview session not found.")
 
-    current_interview = InterviewInDB(**interview_doc)
+    current_interview = InterviewStartView(**interview_doc)
 
     if current_interview.lifecycle_status not in ["info_submitted", "awaiting_specialization", "completed",
                                                   "abandoned"]:
-        if current_interview.lifecycle_status == "general_in_progress" and current_interview.general_questions_snapshot:
-            first_q = current_interview.general_questions_snapshot[0]
-            is_last = len(current_interview.general_questions_snapshot) == 1
+        resumed_questions = await resolve_phase_questions(db, current_interview.general_question_set_revision,
+                                                          current_interview.general_questions_snapshot)
+        if current_interview.lifecycle_status == "general_in_progress" and resumed_questions:
+            first_q = resumed_questions[0]
+            is_last = len(resumed_questions) == 1
             return AIFeedbackResponse(
                 interview_db_id=interview_id,
                 feedback="Continuing interview session.",
@@ -114,18 +156,17 @@ async def start_general_phase_endpoint(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail="Default general question set ID name not configured in settings.")
 
-    default_general_qset_doc = await question_set_collection.find_one(
-        {"id_name": default_general_qset_id_name, "field_type": "none"})
-    if not default_general_qset_doc:
+    qset_from_cache = await question_set_snapshot_cache.get(db, default_general_qset_id_name)
+    if not qset_from_cache or qset_from_cache.field_type != "none":
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Configured default general question set '{default_general_qset_id_name}' not found or not a 'none' type.")
 
-    qset_from_db = QuestionSetInDB(**default_general_qset_doc)
-    general_questions_snapshot = qset_from_db.questions
+    general_questions_snapshot = qset_from_cache.questions
 
     if not general_questions_snapshot:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Default general question set '{default_general_qset_id_name}' has no questions.")
+    await question_set_revision_cache.store(db, qset_from_cache)
 
     current_time = datetime.now(timezone.utc)
 
@@ -133,14 +174,23 @@ async def start_general_phase_endpoint(
         "start_time": current_interview.start_time or current_time,
         "updated_at": current_time,
         "lifecycle_status": "general_in_progress",
-        "general_question_set_id_name": qset_from_db.id_name,
-        "general_questions_snapshot": [q.model_dump() for q in general_questions_snapshot],
+        "general_question_set_id_name": qset_from_cache.id_name,
+        "general_question_set_revision": qset_from_cache.revision_hash,
+        "general_questions_snapshot": [],
         "general_answers_and_feedback": [],
+        "general_feedback_mode": resolve_feedback_mode(qset_from_cache),
         "selected_field": "none",
         "specialized_question_set_id_name": None,
+        "specialized_question_set_revision": None,
         "specialized_questions_snapshot": None,
         "specialized_answers_and_feedback": [],
+        "specialized_feedback_mode": "per_answer",
+        "batch_feedback_jobs": {},
+        SEARCH_ENTRIES_FIELD: [],
+        "transcript_segments": [GENERAL_SECTION_HEADER],
         "overall_assessment": None,
+        "assessment_job_status": None,
+        "assessment_job_attempts": 0,
         "is_completed": False,
         "end_time": None
     }
@@ -149,6 +199,9 @@ async def start_general_phase_endpoint(
         {"_id": interview_oid},
         {"$set": update_data}
     )
+    # Restarts of an interview that already began are not a new funnel entry.
+    if current_interview.lifecycle_status == "info_submitted":
+        await record_rollup(db, update_data["start_time"], stage_increments("general_in_progress"))
 
     current_question_for_response = general_questions_snapshot[0]
     is_last_in_phase = (len(general_questions_snapshot) == 1)
@@ -171,18 +224,18 @@ async def start_general_phase_endpoint(
 @router.post("/select-field", response_model=AIFeedbackResponse)
 async def select_field_endpoint(payload: SelectFieldPayload, db: AsyncIOMotorDatabase = Depends(get_database)):
     interview_collection = db.get_collection("interviews")
-    question_set_collection = db.get_collection("question_sets")
 
     try:
         interview_oid = ObjectId(payload.interview_db_id)
     except Exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid interview_db_id format.")
 
-    interview_doc = await interview_collection.find_one({"_id": interview_oid})
+    interview_doc = await interview_collection.find_one({"_id": interview_oid},
+                                                        {"lifecycle_status": 1, "is_completed": 1, "start_time": 1})
     if not interview_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interview session not found.")
 
-    current_interview = InterviewInDB(**interview_doc)
+    current_interview = InterviewStatusView(**interview_doc)
 
     if current_interview.lifecycle_status != "awaiting_specialization":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
@@ -198,19 +251,18 @@ async def select_field_endpoint(payload: SelectFieldPayload, db: AsyncIOMotorDat
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Default question set ID name for field '{payload.field}' not configured in settings.")
 
-    specialized_qset_doc = await question_set_collection.find_one(
-        {"id_name": specialized_qset_id_name, "field_type": payload.field})
+    qset_specialized = await question_set_snapshot_cache.get(db, specialized_qset_id_name)
 
-    if not specialized_qset_doc:
+    if not qset_specialized or qset_specialized.field_type != payload.field:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Configured default specialized question set '{specialized_qset_id_name}' for '{payload.field}' not found or type mismatch.")
 
-    qset_specialized = QuestionSetInDB(**specialized_qset_doc)
     specialized_questions_snapshot = qset_specialized.questions
 
     if not specialized_questions_snapshot:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Default specialized question set for '{payload.field}' is empty.")
+    await question_set_revision_cache.store(db, qset_specialized)
 
     first_specialized_question = specialized_questions_snapshot[0]
     is_last_specialized = (len(specialized_questions_snapshot) == 1)
@@ -219,11 +271,18 @@ async def select_field_endpoint(payload: SelectFieldPayload, db: AsyncIOMotorDat
         "selected_field": payload.field,
         "lifecycle_status": "specialized_in_progress",
         "specialized_question_set_id_name": specialized_qset_id_name,
-        "specialized_questions_snapshot": [q.model_dump() for q in specialized_questions_snapshot],
+        "specialized_question_set_revision": qset_specialized.revision_hash,
+        "specialized_questions_snapshot": None,
         "specialized_answers_and_feedback": [],
+        "specialized_feedback_mode": resolve_feedback_mode(qset_specialized),
         "updated_at": datetime.now(timezone.utc)
     }
-    await interview_collection.update_one({"_id": interview_oid}, {"$set": update_fields})
+    update_result = await interview_collection.update_one(
+        {"_id": interview_oid, "lifecycle_status": "awaiting_specialization"}, {"$set": update_fields}
+    )
+    if update_result.modified_count:
+        await record_rollup_once(db, interview_oid, "specialized_in_progress", current_interview.start_time,
+                                 stage_increments("specialized_in_progress"))
 
     return AIFeedbackResponse(
         interview_db_id=payload.interview_db_id,
@@ -240,8 +299,61 @@ async def select_field_endpoint(payload: SelectFieldPayload, db: AsyncIOMotorDat
     )
 
 
-@router.post("/submit-answer", response_model=AIFeedbackResponse)
-async def submit_answer_endpoint(payload: AnswerPayload, db: AsyncIOMotorDatabase = Depends(get_database)):
+class AnswerSubmission:
+    def __init__(self, interview_oid: ObjectId, current_interview: InterviewAnswerState,
+                 questions_snapshot: Sequence[Question], answer_update_field_name: str, question_index: int, desired_position_update: Optional[str],
+                 phase: Literal["general", "specialized"], feedback_mode: FeedbackMode):
+        self.interview_oid = interview_oid
+        self.current_interview = current_interview
+        self.questions_snapshot = questions_snapshot
+        self.answer_update_field_name = answer_update_field_name
+        self.question_index = question_index
+        self.question_answered = questions_snapshot[question_index]
+        self.desired_position_update = desired_position_update
+        self.phase = phase
+        self.feedback_mode = feedback_mode
+
+    @property
+    def is_feedback_deferred(self) -> bool:
+        return self.feedback_mode == "deferred"
+
+    @property
+    def completes_interview(self) -> bool:
+        return self.phase == "specialized" and self.question_index == len(self.questions_snapshot) - 1
+
+
+async def load_interview_answer_state(interview_collection, interview_oid: ObjectId) -> Optional[InterviewAnswerState]:
+    # Reads only the current phase's question snapshot and the size of its
+    # answer array, instead of decoding and validating the whole interview.
+    def current_phase(specialized_value: Any, general_value: Any) -> Dict[str, Any]:
+        return {"$cond": [{"$eq": ["$lifecycle_status", "specialized_in_progress"]}, specialized_value, general_value]}
+
+    pipeline = [
+        {"$match": {"_id": interview_oid}},
+        {"$project": {
+            "_id": 0,
+            "lifecycle_status": 1,
+            "is_completed": 1,
+            "start_time": 1,
+            "selected_field": 1,
+            "desired_position_in_field": 1,
+            "question_set_revision": current_phase("$specialized_question_set_revision",
+                                                   "$general_question_set_revision"),
+            "questions_snapshot": current_phase("$specialized_questions_snapshot", "$general_questions_snapshot"),
+            "answer_count": {"$size": {"$ifNull": [
+                current_phase("$specialized_answers_and_feedback", "$general_answers_and_feedback"), []
+            ]}},
+            "feedback_mode": {"$ifNull": [
+                current_phase("$specialized_feedback_mode", "$general_feedback_mode"), "per_answer"
+            ]},
+        }},
+    ]
+    async for state_doc in interview_collection.aggregate(pipeline):
+        return InterviewAnswerState(**state_doc)
+    return None
+
+
+async def load_answer_submission(payload: AnswerPayload, db: AsyncIOMotorDatabase) -> AnswerSubmission:
     if not payload.interview_db_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="interview_db_id is required.")
 
@@ -251,70 +363,60 @@ async def submit_answer_endpoint(payload: AnswerPayload, db: AsyncIOMotorDatabas
     except Exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid interview_db_id format.")
 
-    interview_doc = await interview_collection.find_one({"_id": interview_oid})
-    if not interview_doc:
+    current_interview = await load_interview_answer_state(interview_collection, interview_oid)
+    if current_interview is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interview session not found.")
 
-    current_interview = InterviewInDB(**interview_doc)
-
     if current_interview.is_completed:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="This interview has already been completed.")
 
-    questions_snapshot: List[Question]
-    answers_list: List[AnswerWithFeedback]
-    answer_update_field_name: str
-
     if current_interview.lifecycle_status == "general_in_progress":
-        if not current_interview.general_questions_snapshot:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                                detail="General questions not loaded for this interview phase.")
-        questions_snapshot = current_interview.general_questions_snapshot
-        answers_list = current_interview.general_answers_and_feedback
         answer_update_field_name = "general_answers_and_feedback"
+        phase = "general"
     elif current_interview.lifecycle_status == "specialized_in_progress":
-        if not current_interview.specialized_questions_snapshot:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                                detail="Specialized questions not loaded for this interview phase.")
-        questions_snapshot = current_interview.specialized_questions_snapshot
-        answers_list = current_interview.specialized_answers_and_feedback
         answer_update_field_name = "specialized_answers_and_feedback"
+        phase = "specialized"
     else:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail=f"Cannot submit answer in lifecycle_status: {current_interview.lifecycle_status}")
 
-    current_question_index_in_list = len(answers_list)
+    questions_snapshot = await resolve_phase_questions(db, current_interview.question_set_revision,
+                                                       current_interview.questions_snapshot)
+    if not questions_snapshot:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"{phase.capitalize()} questions not loaded for this interview phase.")
+
+    current_question_index_in_list = current_interview.answer_count
     if current_question_index_in_list >= len(questions_snapshot) or \
             questions_snapshot[current_question_index_in_list].id != payload.question_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="Invalid question submission or out of order.")
 
-    question_answered = questions_snapshot[current_question_index_in_list]
-
     desired_position_update = current_interview.desired_position_in_field
     if current_interview.lifecycle_status == "specialized_in_progress" and current_question_index_in_list == 0:
         desired_position_update = payload.answer_text
 
-    ai_generated_feedback_for_answer = "Phản hồi AI đang được xử lý..."
-    if app_globals.gemini_model:
-        try:
-            prompt_for_individual_feedback = f"""Phân tích câu trả lời phỏng vấn sau đây một cách ngắn gọn (1-2 câu), tập trung vào sự rõ ràng và liên quan đến câu hỏi:
-Câu hỏi: "{question_answered.text}"
-Câu trả lời của ứng viên: "{payload.answer_text}"
-Nhận xét của bạn:"""
-            response_individual = await app_globals.gemini_model.generate_content_async(prompt_for_individual_feedback)
-            if response_individual.parts:
-                ai_generated_feedback_for_answer = response_individual.text.strip()
-            elif response_individual.prompt_feedback and response_individual.prompt_feedback.block_reason:
-                ai_generated_feedback_for_answer = f"Phản hồi AI bị chặn: {response_individual.prompt_feedback.block_reason_message or 'Safety reasons'}"
-            else:
-                ai_generated_feedback_for_answer = "AI không thể đưa ra nhận xét cho câu trả lời này."
-        except Exception as e:
-            print(f"ERROR calling Gemini for individual answer feedback: {str(e)}")
-            ai_generated_feedback_for_answer = "Lỗi khi AI xử lý câu trả lời này."
-    else:
-        print("WARNING: Gemini model not available for individual feedback.")
-        ai_generated_feedback_for_answer = "Phản hồi từ AI hiện không khả dụng."
+    return AnswerSubmission(
+        interview_oid=interview_oid,
+        current_interview=current_interview,
+        questions_snapshot=questions_snapshot,
+        answer_update_field_name=answer_update_field_name,
+        question_index=current_question_index_in_list,
+        desired_position_update=desired_position_update,
+        phase=phase,
+        feedback_mode=current_interview.feedback_mode
+    )
+
+
+async def save_answer_and_advance(submission: AnswerSubmission, payload: AnswerPayload,
+                                  ai_generated_feedback_for_answer: str,
+                                  db: AsyncIOMotorDatabase) -> AIFeedbackResponse:
+    interview_collection = db.get_collection("interviews")
+    current_interview = submission.current_interview
+    questions_snapshot = submission.questions_snapshot
+    question_answered = submission.question_answered
+    desired_position_update = submission.desired_position_update
 
     new_answer_with_feedback = AnswerWithFeedback(
         question_id=question_answered.id,
@@ -323,22 +425,29 @@ Nhận xét của bạn:"""
         ai_feedback_per_answer=ai_generated_feedback_for_answer,
         timestamp=datetime.now(timezone.utc)
     )
-    updated_answers_for_current_phase = answers_list + [new_answer_with_feedback]
 
     current_time_for_update = datetime.now(timezone.utc)
     update_fields_to_db: Dict[str, Any] = {
-        answer_update_field_name: [ans.model_dump() for ans in updated_answers_for_current_phase],
         "updated_at": current_time_for_update
     }
     if desired_position_update is not None:
         update_fields_to_db["desired_position_in_field"] = desired_position_update
 
+    new_transcript_segments: List[str] = []
+    if submission.answer_update_field_name == "specialized_answers_and_feedback" and submission.question_index == 0:
+        new_transcript_segments.append(
+            specialized_section_header(current_interview.selected_field, desired_position_update)
+        )
+    new_transcript_segments.append(
+        format_transcript_entry(submission.question_index, question_answered.text, payload.answer_text)
+    )
+
     next_question_to_send: Optional[InterviewQuestionResponse] = None
     response_lifecycle_status: InterviewLifecycleStatus = current_interview.lifecycle_status
     available_fields: Optional[List[SpecializedField]] = None
     is_final_assessment_now_ready = False
     final_assessment_payload: Optional[OverallAssessment] = None
-    next_question_index_in_phase = current_question_index_in_list + 1
+    next_question_index_in_phase = submission.question_index + 1
 
     if next_question_index_in_phase < len(questions_snapshot):
         next_q_object = questions_snapshot[next_question_index_in_phase]
@@ -349,125 +458,66 @@ Nhận xét của bạn:"""
             is_last_question=is_it_the_last_question_in_this_phase
         )
     else:
+        if submission.is_feedback_deferred:
+            # Feedback for the whole phase is produced by one batched LLM call.
+            update_fields_to_db[f"batch_feedback_jobs.{submission.phase}"] = {
+                "status": "pending", "attempts": 0, "next_attempt_at": current_time_for_update}
+
         if current_interview.lifecycle_status == "general_in_progress":
             response_lifecycle_status = "awaiting_specialization"
             available_fields = ["developer", "designer"]
             update_fields_to_db["lifecycle_status"] = "awaiting_specialization"
         elif current_interview.lifecycle_status == "specialized_in_progress":
             response_lifecycle_status = "completed"
-            is_final_assessment_now_ready = True
             update_fields_to_db["lifecycle_status"] = "completed"
             update_fields_to_db["is_completed"] = True
             update_fields_to_db["end_time"] = current_time_for_update
 
-            full_transcript = "Phần câu hỏi chung:\n"
-            answers_for_general_transcript = current_interview.general_answers_and_feedback
-            if answer_update_field_name == "general_answers_and_feedback":
-                answers_for_general_transcript = updated_answers_for_current_phase
-
-            for i, item in enumerate(answers_for_general_transcript):
-                full_transcript += f"  Câu hỏi {i + 1}: {item.question_text}\n  Trả lời: {item.candidate_answer}\n\n"
-
-            answers_for_specialized_transcript = current_interview.specialized_answers_and_feedback
-            if answer_update_field_name == "specialized_answers_and_feedback":
-                answers_for_specialized_transcript = updated_answers_for_current_phase
-
-            if answers_for_specialized_transcript:
-                full_transcript += f"Phần câu hỏi chuyên môn ({current_interview.selected_field}):\n"
-                actual_desired_position = desired_position_update if desired_position_update else (
-                        current_interview.desired_position_in_field or "Chưa rõ")
-                full_transcript += f"  Vị trí ứng tuyển mong muốn: {actual_desired_position}\n"
-                for i, item in enumerate(answers_for_specialized_transcript):
-                    full_transcript += f"  Câu hỏi {i + 1}: {item.question_text}\n  Trả lời: {item.candidate_answer}\n\n"
-
-            if app_globals.gemini_model:
-                raw_json_text_from_ai_for_error = "AI response not captured yet for error logging."
-                try:
-                    final_assessment_field = current_interview.selected_field if current_interview.selected_field != "none" else "Chung"
-                    final_desired_position = desired_position_update if desired_position_update else (
-                            current_interview.desired_position_in_field or "Chưa rõ")
-
-                    prompt_for_final_assessment = f"""Bạn là một chuyên gia tuyển dụng AI giàu kinh nghiệm. Nhiệm vụ của bạn là phân tích kỹ lưỡng TOÀN BỘ buổi phỏng vấn dưới đây và đưa ra đánh giá chi tiết, khách quan.
-Buổi phỏng vấn bao gồm:
-1. Phần câu hỏi chung.
-2. Phần câu hỏi chuyên môn cho lĩnh vực: '{final_assessment_field}'.
-Ứng viên mong muốn ứng tuyển vào vị trí: '{final_desired_position}'.
-
-Đây là toàn bộ nội dung buổi phỏng vấn (chỉ bao gồm câu hỏi và câu trả lời của ứng viên):
---- BEGIN INTERVIEW TRANSCRIPT ---
-{full_transcript}
---- END INTERVIEW TRANSCRIPT ---
-
-YÊU CẦU PHÂN TÍCH VÀ ĐÁNH GIÁ:
-Hãy xem xét TẤT CẢ các câu trả lời của ứng viên từ ĐẦU ĐẾN CUỐI buổi phỏng vấn.
-Đối với mỗi nhận định về điểm mạnh hoặc điểm yếu, hãy cố gắng chỉ ra nó được thể hiện qua câu trả lời cho câu hỏi nào hoặc qua tình huống nào trong buổi phỏng vấn.
-
-Hãy đưa ra đánh giá của bạn theo định dạng JSON sau. Đảm bảo output là một JSON object hợp lệ:
-
-{{
-  "overall_summary_comment": "Một đoạn nhận xét tổng quan (3-5 câu) về phong thái chung, khả năng giao tiếp, sự tự tin, và tư duy phản biện của ứng viên xuyên suốt buổi phỏng vấn. Nhận xét này phải dựa trên cảm nhận từ toàn bộ quá trình, không chỉ một vài câu hỏi.",
-  "strengths_analysis": [
-    {{
-      "point": "Mô tả điểm mạnh cụ thể (ví dụ: Kiến thức chuyên môn sâu về Java Spring Boot).",
-      "evidence": "Thể hiện qua câu trả lời cho câu hỏi về [Nêu tên/nội dung câu hỏi] ở phần [Chung/Chuyên môn], nơi ứng viên đã [Mô tả cách ứng viên trả lời, ví dụ: giải thích chi tiết về cách sử dụng annotation XYZ, hoặc đưa ra ví dụ dự án thực tế]."
-    }}
-  ],
-  "weaknesses_analysis": [
-    {{
-      "point": "Mô tả điểm yếu/cần cải thiện (ví dụ: Kinh nghiệm thực tế với Kubernetes còn hạn chế).",
-      "evidence": "Qua câu trả lời cho câu hỏi về [Nêu tên/nội dung câu hỏi], ứng viên có vẻ chưa tự tin hoặc kiến thức còn ở mức lý thuyết."
-    }}
-  ],
-  "status": "Đạt",
-  "suitability_for_field": "Phù hợp với lĩnh vực '{final_assessment_field}' do [lý do ngắn gọn dựa trên phân tích]",
-  "suggested_positions": ["Vị trí gợi ý 1 (cụ thể hơn nếu có thể, ví dụ: Junior Java Developer with Spring Focus)"],
-  "suggestions_if_not_pass": "Nếu không đạt, ứng viên nên tập trung vào [Nêu cụ thể kỹ năng/kiến thức cần cải thiện dựa trên điểm yếu đã phân tích]"
-}}
-
-JSON Output:
-"""
-                    response_final = await app_globals.gemini_model.generate_content_async(
-                        prompt_for_final_assessment,
-                        generation_config=GenerationConfig(response_mime_type="application/json")
-                    )
-                    if response_final.parts:
-                        raw_json_text_from_ai_for_error = response_final.text.strip()
-                        cleaned_json_text = raw_json_text_from_ai_for_error
-                        if cleaned_json_text.startswith("```json"):
-                            cleaned_json_text = cleaned_json_text[len("```json"):]
-                        if cleaned_json_text.endswith("```"):
-                            cleaned_json_text = cleaned_json_text[:-len("```")]
-                        cleaned_json_text = cleaned_json_text.strip()
-                        assessment_dict = json.loads(cleaned_json_text)
-                        final_assessment_payload = OverallAssessment(
-                            **assessment_dict,
-                            raw_ai_summary_text=raw_json_text_from_ai_for_error
-                        )
-                    elif response_final.prompt_feedback and response_final.prompt_feedback.block_reason:
-                        reason = response_final.prompt_feedback.block_reason_message or "Safety reasons"
-                        final_assessment_payload = OverallAssessment(status=f"Đánh giá bị chặn: {reason}",
-                                                                     raw_ai_summary_text=f"Blocked: {reason}")
-                    else:
-                        final_assessment_payload = OverallAssessment(status="AI không thể tạo đánh giá cuối cùng",
-                                                                     raw_ai_summary_text="No content returned by AI for final assessment.")
-                except json.JSONDecodeError as json_e:
-                    print(
-                        f"ERROR decoding JSON from Gemini final assessment: {json_e}. Raw text: {raw_json_text_from_ai_for_error}")
-                    final_assessment_payload = OverallAssessment(status="Lỗi định dạng JSON từ AI",
-                                                                 raw_ai_summary_text=f"JSON Decode Error. Raw text: {raw_json_text_from_ai_for_error}")
-                except Exception as e:
-                    print(f"ERROR calling Google Gemini API for final assessment: {str(e)}")
-                    final_assessment_payload = OverallAssessment(status="Lỗi gọi AI đánh giá cuối",
-                                                                 raw_ai_summary_text=str(e))
-
-                if final_assessment_payload:
-                    update_fields_to_db["overall_assessment"] = final_assessment_payload.model_dump()
-            else:
-                print("WARNING: Gemini model not available for final assessment.")
-                final_assessment_payload = OverallAssessment(status="Model AI không sẵn sàng để đánh giá cuối.")
-                update_fields_to_db["overall_assessment"] = final_assessment_payload.model_dump()
-
-    await interview_collection.update_one({"_id": interview_oid}, {"$set": update_fields_to_db})
+            # The final assessment is computed by the background job workers; the
+            # candidate polls GET /interviews/{id}/assessment for the result.
+            update_fields_to_db["overall_assessment"] = None
+            update_fields_to_db["assessment_job_status"] = "pending"
+            update_fields_to_db["assessment_job_attempts"] = 0
+            update_fields_to_db["assessment_job_next_attempt_at"] = current_time_for_update
+
+    # Append-only write, conditional on the state the answer was validated
+    # against: a concurrent submit of the same question cannot be lost or doubled.
+    answers_field = submission.answer_update_field_name
+    expected_state_filter: Dict[str, Any] = {
+        "_id": submission.interview_oid,
+        "lifecycle_status": current_interview.lifecycle_status,
+        f"{answers_field}.{submission.question_index}": {"$exists": False},
+    }
+    if submission.question_index > 0:
+        expected_state_filter[f"{answers_field}.{submission.question_index - 1}"] = {"$exists": True}
+
+    update_result = await interview_collection.update_one(
+        expected_state_filter,
+        {
+            "$set": update_fields_to_db,
+            "$push": {
+                answers_field: new_answer_with_feedback.model_dump(exclude={"question_text"}),
+                "transcript_segments": {"$each": new_transcript_segments},
+                SEARCH_ENTRIES_FIELD: {"$each": search_entries([payload.answer_text]) +
+                                                feedback_search_entries([ai_generated_feedback_for_answer])}
+            }
+        }
+    )
+    if update_result.matched_count == 0:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail="This answer was already submitted or the interview state has changed.")
+
+    if f"batch_feedback_jobs.{submission.phase}" in update_fields_to_db:
+        assessment_job_manager.enqueue(payload.interview_db_id, batch_feedback_job_kind(submission.phase))
+    if update_fields_to_db.get("assessment_job_status") == "pending":
+        assessment_job_manager.enqueue(payload.interview_db_id)
+
+    if update_fields_to_db.get("lifecycle_status") == "awaiting_specialization":
+        await record_rollup_once(db, submission.interview_oid, "awaiting_specialization",
+                                 current_interview.start_time, stage_increments("awaiting_specialization"))
+    elif update_fields_to_db.get("lifecycle_status") == "completed":
+        await record_rollup_once(db, submission.interview_oid, "completed", current_interview.start_time,
+                                 completion_increments(current_interview.start_time, current_time_for_update))
 
     return AIFeedbackResponse(
         interview_db_id=payload.interview_db_id,
@@ -477,4 +527,214 @@ JSON Output:
         available_fields_to_choose=available_fields,
         is_final_assessment_ready=is_final_assessment_now_ready,
         final_assessment=final_assessment_payload
-    )
\ No newline at end of file
+    )
+
+
+async def save_last_answer_with_feedback(submission: AnswerSubmission, payload: AnswerPayload,
+                                         feedback_coro, db: AsyncIOMotorDatabase) -> AIFeedbackResponse:
+    # The final assessment only needs the transcript, so the last answer is saved
+    # (queueing the assessment job) while its own feedback is still being generated.
+    # If the save fails, the feedback call is cancelled: the answer was not stored.
+    outcomes = await gather_isolated({
+        "feedback": feedback_coro,
+        "saved": save_answer_and_advance(submission, payload, FEEDBACK_PENDING_PLACEHOLDER, db),
+    }, fail_fast=["saved"])
+    response: AIFeedbackResponse = outcomes["saved"].unwrap()
+
+    feedback_field = f"{submission.answer_update_field_name}.{submission.question_index}.ai_feedback_per_answer"
+    feedback_outcome = outcomes["feedback"]
+    if isinstance(feedback_outcome.error, LLMOverloadedError):
+        # The answer is already saved, so a 503 would only make the retry "out of
+        # order": keep the placeholder and let the batch feedback job fill it in.
+        print(f"WARNING: LLM overloaded for last answer of interview {payload.interview_db_id}; "
+              f"feedback queued as a background job.")
+        phase_job_field = f"batch_feedback_jobs.{submission.phase}"
+        queued = await db.get_collection("interviews").update_one(
+            {"_id": submission.interview_oid, feedback_field: FEEDBACK_PENDING_PLACEHOLDER},
+            {"$set": {phase_job_field: {"status": "pending", "attempts": 0,
+                                        "next_attempt_at": datetime.now(timezone.utc)}}}
+        )
+        if queued.modified_count:
+            assessment_job_manager.enqueue(payload.interview_db_id, batch_feedback_job_kind(submission.phase))
+        return response
+
+    if feedback_outcome.ok:
+        ai_generated_feedback_for_answer = feedback_outcome.result
+    else:
+        print(f"ERROR generating feedback for last answer of interview {payload.interview_db_id}: "
+              f"{str(feedback_outcome.error)}")
+        ai_generated_feedback_for_answer = FEEDBACK_ERROR_TEXT
+
+    feedback_update: Dict[str, Any] = {"$set": {feedback_field: ai_generated_feedback_for_answer}}
+    new_search_entries = feedback_search_entries([ai_generated_feedback_for_answer])
+    if new_search_entries:
+        feedback_update["$push"] = {SEARCH_ENTRIES_FIELD: {"$each": new_search_entries}}
+    # Only replaces the placeholder this request wrote, never a concurrent writer's feedback.
+    await db.get_collection("interviews").update_one(
+        {"_id": submission.interview_oid, feedback_field: FEEDBACK_PENDING_PLACEHOLDER}, feedback_update
+    )
+    response.feedback = ai_generated_feedback_for_answer
+    return response
+
+
+def llm_overloaded_exception(error: LLMOverloadedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"AI service is busy, please retry shortly. ({error.reason})",
+        headers={"Retry-After": str(error.retry_after_seconds)}
+    )
+
+
+@router.post("/submit-answer", response_model=AIFeedbackResponse)
+async def submit_answer_endpoint(
+        payload: AnswerPayload,
+        db: AsyncIOMotorDatabase = Depends(get_database),
+        idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=255)
+):
+    # A retried submission with the same key gets the first response back
+    # instead of "out of order" or a second LLM call.
+    if not idempotency_key:
+        return await submit_answer(payload, db)
+    return await idempotency_store.run(db, f"submit-answer:{payload.interview_db_id}", idempotency_key,
+                                       payload.model_dump_json(), AIFeedbackResponse,
+                                       lambda: submit_answer(payload, db))
+
+
+async def submit_answer(payload: AnswerPayload, db: AsyncIOMotorDatabase) -> AIFeedbackResponse:
+    submission = await load_answer_submission(payload, db)
+    if submission.is_feedback_deferred:
+        return await save_answer_and_advance(submission, payload, DEFERRED_FEEDBACK_PLACEHOLDER, db)
+    if submission.completes_interview:
+        return await save_last_answer_with_feedback(
+            submission, payload,
+            generate_answer_feedback(submission.question_answered.id, submission.question_answered.text,
+                                     payload.answer_text),
+            db
+        )
+    try:
+        ai_generated_feedback_for_answer = await generate_answer_feedback(
+            submission.question_answered.id, submission.question_answered.text, payload.answer_text
+        )
+    except LLMOverloadedError as e:
+        raise llm_overloaded_exception(e)
+    return await save_answer_and_advance(submission, payload, ai_generated_feedback_for_answer, db)
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def collect_streamed_feedback(submission: AnswerSubmission, payload: AnswerPayload,
+                                   events: asyncio.Queue) -> str:
+    feedback_chunks: List[str] = []
+    async for delta in stream_answer_feedback(submission.question_answered.id,
+                                              submission.question_answered.text, payload.answer_text):
+        feedback_chunks.append(delta)
+        await events.put(("feedback", {"delta": delta}))
+    return "".join(feedback_chunks).strip() or "AI không thể đưa ra nhận xét cho câu trả lời này."
+
+
+async def stream_feedback_and_save(submission: AnswerSubmission, payload: AnswerPayload,
+                                   db: AsyncIOMotorDatabase, events: asyncio.Queue):
+    if submission.completes_interview and not submission.is_feedback_deferred:
+        try:
+            response = await save_last_answer_with_feedback(
+                submission, payload, collect_streamed_feedback(submission, payload, events), db
+            )
+            await events.put(("result", response.model_dump(mode="json")))
+        except HTTPException as e:
+            await events.put(("error", {"status_code": e.status_code, "detail": e.detail}))
+        except Exception as e:
+            print(f"ERROR saving streamed answer for interview {payload.interview_db_id}: {str(e)}")
+            await events.put(("error", {"detail": "Failed to save answer."}))
+        finally:
+            await events.put(None)
+        return
+
+    try:
+        if submission.is_feedback_deferred:
+            ai_generated_feedback_for_answer = DEFERRED_FEEDBACK_PLACEHOLDER
+        else:
+            ai_generated_feedback_for_answer = await collect_streamed_feedback(submission, payload, events)
+    except LLMOverloadedError as e:
+        # Nothing is saved so the client can simply retry the same answer.
+        await events.put(("error", {"status_code": status.HTTP_503_SERVICE_UNAVAILABLE,
+                                    "detail": f"AI service is busy, please retry shortly. ({e.reason})"}))
+        await events.put(None)
+        return
+    except Exception as e:
+        print(f"ERROR streaming LLM feedback for individual answer: {str(e)}")
+        ai_generated_feedback_for_answer = FEEDBACK_ERROR_TEXT
+
+    try:
+        response = await save_answer_and_advance(submission, payload, ai_generated_feedback_for_answer, db)
+        await events.put(("result", response.model_dump(mode="json")))
+    except HTTPException as e:
+        await events.put(("error", {"status_code": e.status_code, "detail": e.detail}))
+    except Exception as e:
+        print(f"ERROR saving streamed answer for interview {payload.interview_db_id}: {str(e)}")
+        await events.put(("error", {"detail": "Failed to save answer."}))
+    finally:
+        await events.put(None)
+
+
+@router.post("/submit-answer/stream")
+async def submit_answer_stream_endpoint(payload: AnswerPayload, db: AsyncIOMotorDatabase = Depends(get_database)):
+    submission = await load_answer_submission(payload, db)
+    if not submission.is_feedback_deferred:
+        try:
+            llm_admission.ensure_capacity()
+        except LLMOverloadedError as e:
+            raise llm_overloaded_exception(e)
+
+    # Generation and persistence run in their own task so the answer is still
+    # saved if the client disconnects mid-stream.
+    events: asyncio.Queue = asyncio.Queue()
+    producer_task = asyncio.create_task(stream_feedback_and_save(submission, payload, db, events))
+    _background_tasks.add(producer_task)
+    producer_task.add_done_callback(_background_tasks.discard)
+
+    async def event_generator():
+        while True:
+            item = await events.get()
+            if item is None:
+                break
+            event_name, data = item
+            yield format_sse_event(event_name, data)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/interviews/{interview_id}/assessment", response_model=FinalAssessmentStatusResponse)
+async def get_final_assessment_status_endpoint(
+        interview_id: str,
+        db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    interview_collection = db.get_collection("interviews")
+    try:
+        interview_oid = ObjectId(interview_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid interview_id format.")
+
+    interview_doc = await interview_collection.find_one(
+        {"_id": interview_oid},
+        {"lifecycle_status": 1, "assessment_job_status": 1, "overall_assessment": 1}
+    )
+    if not interview_doc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interview session not found.")
+
+    job_status = interview_doc.get("assessment_job_status")
+    assessment_doc = interview_doc.get("overall_assessment")
+    is_ready = assessment_doc is not None and job_status not in ("pending", "running")
+
+    return FinalAssessmentStatusResponse(
+        interview_db_id=interview_id,
+        interview_lifecycle_status=interview_doc.get("lifecycle_status", "info_submitted"),
+        assessment_job_status=job_status,
+        is_final_assessment_ready=is_ready,
+        final_assessment=OverallAssessment(**assessment_doc) if is_ready else None
+    )
@@ -0,0 +1,85 @@
+# backend/app/search_index.py
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional
+
+from .ai_assessment import DEFERRED_FEEDBACK_PLACEHOLDER, FEEDBACK_ERROR_TEXT, FEEDBACK_PENDING_PLACEHOLDER
+
+# Interviews carry their own search fields, covered by one text index
+# (see db_indexes.py): the candidate profile as one string, and one entry per
+# answer / AI feedback / assessment text, appended as they are written.
+SEARCH_PROFILE_FIELD = "search_profile_text"
+SEARCH_ENTRIES_FIELD = "search_entries"
+
+SEARCH_PROFILE_KEYS = (
+    "full_name", "email", "school_university", "major_specialization", "education_level",
+    "experience_field", "interested_field", "career_goal_short", "key_skills",
+)
+
+SEARCH_ENTRY_MAX_CHARS = 4000
+
+# Stand-in feedback texts that say nothing about the candidate.
+NON_SEARCHABLE_FEEDBACK = (DEFERRED_FEEDBACK_PLACEHOLDER, FEEDBACK_PENDING_PLACEHOLDER, FEEDBACK_ERROR_TEXT)
+
+
+def fold_search_text(text: str) -> str:
+    # Lowercase and strip Vietnamese diacritics ("Đại học Bách Khoa" -> "dai hoc bach khoa").
+    # Mongo's text index does not fold "đ" or the horn/breve letters, so both the
+    # stored text and the query go through this.
+    text = text.replace("đ", "d").replace("Đ", "D")
+    decomposed = unicodedata.normalize("NFD", text)
+    without_marks = "".join(char for char in decomposed if unicodedata.category(char) != "Mn")
+    return " ".join(without_marks.lower().split())
+
+
+def search_entry(text: Any) -> Optional[str]:
+    if not isinstance(text, str) or not text.strip():
+        return None
+    return fold_search_text(text[:SEARCH_ENTRY_MAX_CHARS])
+
+
+def search_entries(texts: Iterable[Any]) -> List[str]:
+    return [entry for entry in (search_entry(text) for text in texts) if entry]
+
+
+def profile_search_text(candidate_info: Optional[Dict[str, Any]]) -> str:
+    if not candidate_info:
+        return ""
+    parts: List[str] = []
+    for key in SEARCH_PROFILE_KEYS:
+        value = candidate_info.get(key)
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value)
+        elif value not in (None, ""):
+            parts.append(str(value))
+    return fold_search_text(" ".join(parts))
+
+
+def assessment_search_entries(assessment: Optional[Dict[str, Any]]) -> List[str]:
+    if not assessment:
+        return []
+    texts: List[Any] = [assessment.get("overall_summary_comment"), assessment.get("suitability_for_field"),
+                        assessment.get("suggestions_if_not_pass")]
+    for detail_key in ("strengths_analysis", "weaknesses_analysis"):
+        for detail in assessment.get(detail_key) or []:
+            texts.extend([detail.get("point"), detail.get("evidence")])
+    texts.extend(assessment.get("suggested_positions") or [])
+    return search_entries(texts)
+
+
+def feedback_search_entries(feedback_texts: Iterable[Any]) -> List[str]:
+    return search_entries(text for text in feedback_texts if text not in NON_SEARCHABLE_FEEDBACK)
+
+
+def build_search_fields(interview_doc: Dict[str, Any]) -> Dict[str, Any]:
+    # Full recomputation from a stored interview, for backfilling documents
+    # written before the search fields existed.
+    texts: List[Any] = []
+    for answers_field in ("general_answers_and_feedback", "specialized_answers_and_feedback"):
+        for answer in interview_doc.get(answers_field) or []:
+            texts.append(answer.get("candidate_answer"))
+            if answer.get("ai_feedback_per_answer") not in NON_SEARCHABLE_FEEDBACK:
+                texts.append(answer.get("ai_feedback_per_answer"))
+    return {
+        SEARCH_PROFILE_FIELD: profile_search_text(interview_doc.get("candidate_info_raw")),
+        SEARCH_ENTRIES_FIELD: search_entries(texts) + assessment_search_entries(interview_doc.get("overall_assessment")),
+    }
@@ -0,0 +1,35 @@
+# backend/app/transcript.py
+from typing import List
+
+from .models import InterviewInDB
+
+GENERAL_SECTION_HEADER = "Phần câu hỏi chung:\n"
+
+
+def specialized_section_header(selected_field: str, desired_position: str) -> str:
+    return (f"Phần câu hỏi chuyên môn ({selected_field}):\n"
+            f"  Vị trí ứng tuyển mong muốn: {desired_position or 'Chưa rõ'}\n")
+
+
+def format_transcript_entry(question_index: int, question_text: str, answer_text: str) -> str:
+    return f"  Câu hỏi {question_index + 1}: {question_text}\n  Trả lời: {answer_text}\n\n"
+
+
+def rebuild_transcript_segments(interview: InterviewInDB) -> List[str]:
+    # Fallback for interviews created before transcripts were stored incrementally.
+    segments = [GENERAL_SECTION_HEADER]
+    for i, item in enumerate(interview.general_answers_and_feedback):
+        segments.append(format_transcript_entry(i, item.question_text, item.candidate_answer))
+
+    if interview.specialized_answers_and_feedback:
+        segments.append(specialized_section_header(interview.selected_field, interview.desired_position_in_field))
+        for i, item in enumerate(interview.specialized_answers_and_feedback):
+            segments.append(format_transcript_entry(i, item.question_text, item.candidate_answer))
+    return segments
+
+
+def render_transcript(interview: InterviewInDB) -> str:
+    segments = interview.transcript_segments
+    if not segments or segments[0] != GENERAL_SECTION_HEADER:
+        segments = rebuild_transcript_segments(interview)
+    return "".join(segments)
@@ -0,0 +1,35 @@
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.search_index import SEARCH_PROFILE_FIELD, build_search_fields
+
+
+# Fills the admin search fields (search_profile_text / search_entries) on
+# interviews written before they existed. Safe to re-run; documents changed
+# while being backfilled are skipped and picked up by the next run.
+async def backfill_interview_search_fields():
+    client = AsyncIOMotorClient(settings.MONGODB_URL, uuidRepresentation="standard", tz_aware=True)
+    db = client[settings.DATABASE_NAME]
+    collection = db["interviews"]
+
+    count = 0
+    skipped = 0
+    async for doc in collection.find({SEARCH_PROFILE_FIELD: {"$exists": False}}):
+        try:
+            result = await collection.update_one(
+                {"_id": doc["_id"], "updated_at": doc.get("updated_at")},
+                {"$set": build_search_fields(doc)}
+            )
+            if result.modified_count:
+                count += 1
+            else:
+                skipped += 1
+                print(f"Skipped interview {doc['_id']} (changed during backfill)")
+        except Exception as e:
+            print(f"Error backfilling {doc['_id']}: {str(e)}")
+
+    print(f"Total interviews backfilled: {count}, skipped: {skipped}")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_interview_search_fields())
@@ -0,0 +1,36 @@
+import asyncio
+import json
+import sys
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.db import mongo_client_options, mongo_connection_uri
+from app.db_indexes import apply_index_registry, build_index_report
+
+USAGE = "Usage: python manage_indexes.py [report|apply]"
+
+
+async def main(command: str):
+    # Same URI options and pool settings as the app, so index reports see the data as the app does.
+    client = AsyncIOMotorClient(mongo_connection_uri(), **mongo_client_options())
+    db = client[settings.DATABASE_NAME]
+
+    if command == "apply":
+        result = await apply_index_registry(db)
+        print(json.dumps(result, indent=2))
+    elif command == "report":
+        report = await build_index_report(db)
+        print(json.dumps(report, indent=2, default=str))
+        for collection_name, collection_report in report.items():
+            if collection_report["missing"]:
+                print(f"[{collection_name}] missing: {[index['name'] for index in collection_report['missing']]}")
+            if collection_report["unused"]:
+                print(f"[{collection_name}] unused: {collection_report['unused']}")
+    else:
+        print(USAGE)
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "report"))
@@ -0,0 +1,87 @@
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.interview_archive import INTERVIEW_COLLECTIONS
+from app.models import Question
+from app.question_set_cache import (
+    QUESTION_REFERENCE_FIELDS, QUESTION_SET_REVISIONS_COLLECTION, compute_revision_hash
+)
+from datetime import datetime, timezone
+
+
+# Moves the question snapshots embedded in interviews (hot and archived) into the
+# content-addressed `question_set_revisions` collection and drops the copied
+# question text from answers. Safe to re-run; documents changed while being
+# migrated are skipped and picked up by the next run.
+#
+# transcript_segments is left as is on purpose: it is the rendered transcript
+# (one "question + answer" entry per answered question) that the final
+# assessment prompt reads without resolving revisions. Its size is bounded by
+# the number of questions answered, so it does not grow like the per-answer
+# copies and snapshots this migration removes.
+async def compact_interview_question_snapshots():
+    # Same UUID decoding as the app, so question ids compare as uuid.UUID.
+    client = AsyncIOMotorClient(settings.MONGODB_URL, uuidRepresentation="standard", tz_aware=True)
+    db = client[settings.DATABASE_NAME]
+    revisions_collection = db[QUESTION_SET_REVISIONS_COLLECTION]
+    for collection_name in INTERVIEW_COLLECTIONS:
+        await compact_collection(db[collection_name], revisions_collection)
+
+
+async def compact_collection(collection, revisions_collection):
+    embedded_snapshot_query = {"$or": [
+        {f"{snapshot_field}.0": {"$exists": True}}
+        for snapshot_field, _ in QUESTION_REFERENCE_FIELDS.values()
+    ]}
+
+    count = 0
+    skipped = 0
+    async for doc in collection.find(embedded_snapshot_query):
+        try:
+            update_fields = {}
+            for revision_field, (snapshot_field, answers_field) in QUESTION_REFERENCE_FIELDS.items():
+                snapshot = doc.get(snapshot_field)
+                if not snapshot:
+                    continue
+                questions = [Question(**q) for q in snapshot]
+                revision_hash = compute_revision_hash(questions)
+                await revisions_collection.update_one(
+                    {"_id": revision_hash},
+                    {"$setOnInsert": {"questions": [q.model_dump() for q in questions],
+                                      "source_id_name": doc.get(revision_field.replace("_revision", "_id_name")),
+                                      "created_at": datetime.now(timezone.utc)}},
+                    upsert=True
+                )
+
+                # Only drop question_text where the revision gives back exactly the same text.
+                texts_by_id = {q.id: q.text for q in questions}
+                compacted_answers = []
+                for answer in doc.get(answers_field) or []:
+                    answer = dict(answer)
+                    if texts_by_id.get(answer.get("question_id")) == answer.get("question_text"):
+                        answer.pop("question_text", None)
+                    compacted_answers.append(answer)
+
+                update_fields[revision_field] = revision_hash
+                update_fields[snapshot_field] = [] if snapshot_field == "general_questions_snapshot" else None
+                update_fields[answers_field] = compacted_answers
+
+            # Optimistic check: skip if the interview was written since it was read.
+            result = await collection.update_one(
+                {"_id": doc["_id"], "updated_at": doc.get("updated_at")},
+                {"$set": update_fields}
+            )
+            if result.modified_count:
+                count += 1
+                print(f"Compacted interview {doc['_id']}")
+            else:
+                skipped += 1
+                print(f"Skipped interview {doc['_id']} (changed during migration)")
+        except Exception as e:
+            print(f"Error compacting {doc['_id']}: {str(e)}")
+
+    print(f"[{collection.name}] Total interviews compacted: {count}, skipped: {skipped}")
+
+
+if __name__ == "__main__":
+    asyncio.run(compact_interview_question_snapshots())
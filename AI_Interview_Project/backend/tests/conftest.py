@@ -0,0 +1,16 @@
+# backend/tests/conftest.py
+# Run from backend/: python -m pytest tests
+import os
+import sys
+
+# Settings has required fields; tests never connect anywhere, so placeholders do.
+for env_name, placeholder in {
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "DATABASE_NAME": "ai_interview_test",
+    "ADMIN_USERNAME": "admin",
+    "ADMIN_PASSWORD_HASH": "not-a-real-hash",
+    "SECRET_KEY": "test-secret-key",
+}.items():
+    os.environ.setdefault(env_name, placeholder)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,75 @@
+# backend/tests/test_concurrency.py
+import asyncio
+
+from app.concurrency import gather_isolated
+
+
+async def finish_after(delay: float, value=None, error: Exception = None):
+    await asyncio.sleep(delay)
+    if error is not None:
+        raise error
+    return value
+
+
+def test_failure_does_not_cancel_siblings_by_default():
+    outcomes = asyncio.run(gather_isolated({
+        "broken": finish_after(0, error=ValueError("boom")),
+        "slow": finish_after(0.02, "done"),
+    }))
+
+    assert isinstance(outcomes["broken"].error, ValueError)
+    assert outcomes["slow"].ok and outcomes["slow"].result == "done"
+
+
+def test_fail_fast_child_cancels_running_siblings():
+    sibling_finished = []
+
+    async def sibling():
+        await asyncio.sleep(5)
+        sibling_finished.append(True)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        outcomes = await gather_isolated({
+            "saved": finish_after(0.01, error=RuntimeError("save failed")),
+            "feedback": sibling(),
+        }, fail_fast=["saved"])
+        return outcomes, loop.time() - started_at
+
+    outcomes, elapsed = asyncio.run(scenario())
+
+    assert isinstance(outcomes["saved"].error, RuntimeError)
+    assert isinstance(outcomes["feedback"].error, asyncio.CancelledError)
+    assert not sibling_finished
+    assert elapsed < 1
+
+
+def test_fail_fast_child_succeeding_lets_siblings_finish():
+    outcomes = asyncio.run(gather_isolated({
+        "saved": finish_after(0, "saved"),
+        "feedback": finish_after(0.02, "feedback"),
+    }, fail_fast=["saved"]))
+
+    assert outcomes["saved"].result == "saved"
+    assert outcomes["feedback"].result == "feedback"
+
+
+def test_failure_of_child_not_named_fail_fast_is_isolated():
+    outcomes = asyncio.run(gather_isolated({
+        "saved": finish_after(0.02, "saved"),
+        "feedback": finish_after(0, error=ValueError("llm down")),
+    }, fail_fast=["saved"]))
+
+    assert outcomes["saved"].result == "saved"
+    assert isinstance(outcomes["feedback"].error, ValueError)
+
+
+def test_children_still_running_at_timeout_get_timeout_error():
+    outcomes = asyncio.run(gather_isolated({
+        "quick": finish_after(0, "quick"),
+        "stuck": finish_after(5, "stuck"),
+    }, timeout=0.02))
+
+    assert outcomes["quick"].result == "quick"
+    assert isinstance(outcomes["stuck"].error, asyncio.TimeoutError)
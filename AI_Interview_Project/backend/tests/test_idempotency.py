@@ -0,0 +1,77 @@
+# backend/tests/test_idempotency.py
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.idempotency import IdempotencyStore
+
+
+class EchoResponse(BaseModel):
+    value: str
+
+
+def local_store() -> IdempotencyStore:
+    return IdempotencyStore(max_entries=10, ttl_seconds=60, lock_seconds=5, wait_seconds=1, use_mongo=False)
+
+
+def test_retry_replays_the_stored_response():
+    store = local_store()
+    calls = []
+
+    async def compute():
+        calls.append(True)
+        return EchoResponse(value="saved")
+
+    async def scenario():
+        first = await store.run(None, "answers", "key-1", "fp", EchoResponse, compute)
+        second = await store.run(None, "answers", "key-1", "fp", EchoResponse, compute)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == EchoResponse(value="saved")
+    assert len(calls) == 1
+    assert store.stats()["local_replays"] == 1
+
+
+def test_same_key_with_different_request_is_rejected():
+    store = local_store()
+
+    async def compute():
+        return EchoResponse(value="saved")
+
+    async def scenario():
+        await store.run(None, "answers", "key-1", "fp-a", EchoResponse, compute)
+        await store.run(None, "answers", "key-1", "fp-b", EchoResponse, compute)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(scenario())
+
+    assert exc_info.value.status_code == 422
+
+
+def test_cancelled_owner_gives_coalesced_waiter_a_retryable_conflict():
+    store = local_store()
+
+    async def slow_compute():
+        await asyncio.sleep(5)
+        return EchoResponse(value="never")
+
+    async def scenario():
+        owner = asyncio.create_task(store.run(None, "answers", "key-1", "fp", EchoResponse, slow_compute))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(store.run(None, "answers", "key-1", "fp", EchoResponse, slow_compute))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        owner_result, waiter_result = await asyncio.gather(owner, waiter, return_exceptions=True)
+        return owner_result, waiter_result
+
+    owner_result, waiter_result = asyncio.run(scenario())
+
+    assert isinstance(owner_result, asyncio.CancelledError)
+    assert isinstance(waiter_result, HTTPException)
+    assert waiter_result.status_code == 409
+    assert waiter_result.headers == {"Retry-After": "1"}
+    assert store.stats()["coalesced"] == 1 and store.stats()["in_flight"] == 0
@@ -0,0 +1,44 @@
+# backend/tests/test_interview_export.py
+import asyncio
+import csv
+import io
+
+from app.interview_export import CSV_FORMULA_PREFIXES, _csv_value, iter_csv_rows
+
+
+async def csv_rows(interview_docs, columns):
+    async def cursor():
+        for interview_doc in interview_docs:
+            yield interview_doc
+
+    chunks = [chunk async for chunk in iter_csv_rows(cursor(), columns)]
+    return list(csv.reader(io.StringIO("".join(chunks).lstrip("\ufeff"))))
+
+
+def test_formula_prefixed_strings_are_quoted():
+    for prefix in CSV_FORMULA_PREFIXES:
+        assert _csv_value(f"{prefix}HYPERLINK(\"http://x\")") == f"'{prefix}HYPERLINK(\"http://x\")"
+
+
+def test_plain_and_non_string_cells_are_unchanged():
+    assert _csv_value("Nguyễn Văn A") == "Nguyễn Văn A"
+    assert _csv_value("a=b") == "a=b"
+    assert _csv_value(3.5) == 3.5
+    assert _csv_value(None) == ""
+
+
+def test_formula_prefixed_list_cell_is_quoted():
+    assert _csv_value(["=1+1", "Designer"]) == "'=1+1; Designer"
+    assert _csv_value(["Developer", "=1+1"]) == "Developer; =1+1"
+
+
+def test_csv_export_quotes_candidate_controlled_cells():
+    interview_doc = {
+        "candidate_info_raw": {"full_name": "=cmd|' /C calc'!A0", "email": "a@example.com"},
+        "overall_assessment": {"suggested_positions": ["@SUM(A1)", "Tester"], "status": "Đạt"},
+    }
+    header, row = asyncio.run(csv_rows(
+        [interview_doc], ["candidate_full_name", "candidate_email", "assessment_suggested_positions"]))
+
+    assert header == ["candidate_full_name", "candidate_email", "assessment_suggested_positions"]
+    assert row == ["'=cmd|' /C calc'!A0", "a@example.com", "'@SUM(A1); Tester"]
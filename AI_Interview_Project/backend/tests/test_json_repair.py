@@ -0,0 +1,61 @@
+# backend/tests/test_json_repair.py
+from app.json_repair import IncrementalJSONExtractor, parse_json_object_lenient, strip_trailing_commas
+
+
+def test_fenced_object_with_prose_parses_without_repair():
+    raw = 'Đây là đánh giá:\n```json\n{"status": "Đạt", "tags": ["a", "b"]}\n```\nCảm ơn.'
+
+    parsed, repaired = parse_json_object_lenient(raw)
+
+    assert parsed == {"status": "Đạt", "tags": ["a", "b"]}
+    assert not repaired
+
+
+def test_trailing_commas_are_removed_outside_strings():
+    assert strip_trailing_commas('{"a": [1, 2,], "b": "x,}",}') == '{"a": [1, 2], "b": "x,}"}'
+
+    parsed, repaired = parse_json_object_lenient('{"a": [1, 2,],}')
+
+    assert parsed == {"a": [1, 2]}
+    assert repaired
+
+
+def test_object_truncated_inside_a_string_is_closed():
+    parsed, repaired = parse_json_object_lenient('{"status": "Đạt", "overall_summary_comment": "Ứng viên trả')
+
+    assert parsed == {"status": "Đạt", "overall_summary_comment": "Ứng viên trả"}
+    assert repaired
+
+
+def test_object_truncated_inside_nested_containers_keeps_complete_values():
+    parsed, repaired = parse_json_object_lenient(
+        '{"status": "Không Đạt", "strengths_analysis": [{"point": "Giao tiếp", "evidence": "Trả lờ'
+    )
+
+    assert parsed["status"] == "Không Đạt"
+    assert parsed["strengths_analysis"][0]["point"] == "Giao tiếp"
+    assert repaired
+
+
+def test_object_truncated_after_a_key_drops_the_dangling_key():
+    parsed, repaired = parse_json_object_lenient('{"status": "Đạt", "suggested_positions":')
+
+    assert parsed == {"status": "Đạt"}
+    assert repaired
+
+
+def test_chunked_feed_matches_single_feed_and_stops_at_first_object():
+    raw = '```json\n{"a": {"b": "}"}, "c": [1]}\n```\n{"ignored": true}'
+    extractor = IncrementalJSONExtractor()
+    completed_at = None
+    for index in range(0, len(raw), 3):
+        if extractor.feed(raw[index:index + 3]) and completed_at is None:
+            completed_at = index
+
+    assert extractor.complete
+    assert extractor.text == '{"a": {"b": "}"}, "c": [1]}'
+    assert completed_at is not None
+
+
+def test_text_without_an_object_returns_none():
+    assert parse_json_object_lenient("Xin lỗi, tôi không thể đánh giá.") == (None, False)
@@ -0,0 +1,151 @@
+# backend/tests/test_llm_providers.py
+import asyncio
+
+import pytest
+
+from app.llm_providers import (
+    FakeLLMProvider, LLMCircuitOpenError, LLMDeadlineExceededError, LLMProvider, LLMProviderError, LLMRouter
+)
+
+
+class StallingProvider(FakeLLMProvider):
+    # Sends its first chunk, then hangs past any deadline.
+    async def stream_text(self, prompt: str):
+        self.calls += 1
+        yield "first "
+        await asyncio.sleep(10)
+        yield "never"
+
+
+def make_router(providers, **router_options) -> LLMRouter:
+    return LLMRouter(providers, timeouts={"default": 1.0}, **router_options)
+
+
+async def collect(stream) -> str:
+    return "".join([chunk async for chunk in stream])
+
+
+def test_provider_missing_a_method_fails_at_construction():
+    class TextOnlyProvider(LLMProvider):
+        async def generate_text(self, prompt: str) -> str:
+            return ""
+
+    with pytest.raises(TypeError):
+        TextOnlyProvider()
+
+
+def test_routes_to_lowest_p95_once_both_providers_are_measured():
+    slow = FakeLLMProvider(name="slow", latency_seconds=0.05)
+    fast = FakeLLMProvider(name="fast")
+    router = make_router([slow, fast])
+
+    async def scenario():
+        # Unmeasured providers are explored first, in configured order.
+        await router.generate_text("q")
+        await router.generate_text("q")
+        assert (slow.calls, fast.calls) == (1, 1)
+        assert [p.name for p in router.ordered_providers("text")] == ["fast", "slow"]
+        await router.generate_text("q")
+
+    asyncio.run(scenario())
+    assert (slow.calls, fast.calls) == (1, 2)
+
+
+def test_unhealthy_error_rate_moves_provider_last():
+    broken = FakeLLMProvider(name="broken", fail=True)
+    healthy = FakeLLMProvider(name="healthy")
+    router = make_router([broken, healthy], min_samples_for_health=2, circuit_failure_threshold=100)
+
+    async def scenario():
+        for _ in range(3):
+            assert await router.generate_text("q") == healthy.text_response
+
+    asyncio.run(scenario())
+    # Tried first until it had enough samples to be judged unhealthy.
+    assert broken.calls == 2
+    assert healthy.calls == 3
+    assert not router.is_healthy(broken, "text")
+    assert [p.name for p in router.ordered_providers("text")] == ["healthy", "broken"]
+
+
+def test_stream_fails_over_when_first_chunk_errors():
+    broken = FakeLLMProvider(name="broken", fail=True)
+    healthy = FakeLLMProvider(name="healthy")
+    router = make_router([broken, healthy])
+
+    streamed = asyncio.run(collect(router.stream_text("q")))
+
+    assert streamed.strip() == healthy.text_response
+    assert router.stats["broken"]["text"].total_errors == 1
+    assert router.breakers["broken"].consecutive_failures == 1
+    assert router.stats["healthy"]["text"].total_calls == 1
+
+
+def test_stream_raises_when_every_provider_fails_before_first_chunk():
+    router = make_router([FakeLLMProvider(name="a", fail=True), FakeLLMProvider(name="b", fail=True)])
+
+    with pytest.raises(LLMProviderError):
+        asyncio.run(collect(router.stream_text("q")))
+
+
+def test_mid_stream_deadline_is_recorded_against_the_streaming_provider():
+    stalling = StallingProvider(name="stalling")
+    router = LLMRouter([stalling], timeouts={"default": 1.0}, deadlines={"default": 0.05},
+                       circuit_failure_threshold=1)
+    chunks = []
+
+    async def scenario():
+        async for chunk in router.stream_text("q"):
+            chunks.append(chunk)
+
+    with pytest.raises(LLMDeadlineExceededError):
+        asyncio.run(scenario())
+    assert chunks == ["first "]
+    stalling_stats = router.stats["stalling"]["text"]
+    assert stalling_stats.total_errors == 1
+    # The quick first chunk does not count as a fast success.
+    assert stalling_stats.percentile(95) is None
+    assert router.breakers["stalling"].state == "open"
+
+
+def test_circuit_opens_then_half_open_trial_closes_it():
+    flaky = FakeLLMProvider(name="flaky", fail=True)
+    router = make_router([flaky], circuit_failure_threshold=2, circuit_reset_seconds=0.05)
+    breaker = router.breakers["flaky"]
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(LLMProviderError):
+                await router.generate_text("q")
+        assert breaker.state == "open"
+
+        # Open: rejected without reaching the provider.
+        with pytest.raises(LLMCircuitOpenError):
+            await router.generate_text("q")
+        assert flaky.calls == 2
+
+        await asyncio.sleep(0.06)
+        assert breaker.is_available()
+        flaky.fail = False
+        await router.generate_text("q")
+
+    asyncio.run(scenario())
+    assert breaker.state == "closed"
+    assert breaker.consecutive_failures == 0
+
+
+def test_failed_half_open_trial_reopens_circuit():
+    flaky = FakeLLMProvider(name="flaky", fail=True)
+    router = make_router([flaky], circuit_failure_threshold=1, circuit_reset_seconds=0.05)
+    breaker = router.breakers["flaky"]
+
+    async def scenario():
+        with pytest.raises(LLMProviderError):
+            await router.generate_text("q")
+        await asyncio.sleep(0.06)
+        with pytest.raises(LLMProviderError):
+            await router.generate_text("q")
+
+    asyncio.run(scenario())
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
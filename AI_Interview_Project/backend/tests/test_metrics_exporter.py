@@ -0,0 +1,85 @@
+# backend/tests/test_metrics_exporter.py
+import asyncio
+import socket
+
+from app.metrics_exporter import WorkerMetricsExporter
+
+
+def free_port_range(size: int) -> int:
+    # Base of `size` consecutive ports that are free right now.
+    while True:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            base_port = probe.getsockname()[1]
+        if base_port + size > 65535:
+            continue
+        try:
+            for port in range(base_port, base_port + size):
+                with socket.socket() as probe:
+                    probe.bind(("127.0.0.1", port))
+        except OSError:
+            continue
+        return base_port
+
+
+async def scrape(port: int, path: str = "/metrics", token: str = None) -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    headers = f"Authorization: Bearer {token}\r\n" if token is not None else ""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.decode().partition("\r\n\r\n")
+    return int(head.split(" ")[1]), body
+
+
+def test_serves_worker_metrics_without_token():
+    async def scenario():
+        exporter = WorkerMetricsExporter("127.0.0.1", free_port_range(1), 1)
+        await exporter.start()
+        try:
+            metrics = await scrape(exporter.port)
+            missing = await scrape(exporter.port, path="/other")
+        finally:
+            await exporter.stop()
+        return metrics, missing
+
+    (status, body), (missing_status, _) = asyncio.run(scenario())
+
+    assert status == 200 and 'pid="' in body
+    assert missing_status == 404
+
+
+def test_scrape_token_is_required_when_configured():
+    async def scenario():
+        exporter = WorkerMetricsExporter("127.0.0.1", free_port_range(1), 1, scrape_token="s3cret")
+        await exporter.start()
+        try:
+            return (await scrape(exporter.port), await scrape(exporter.port, token="wrong"),
+                    await scrape(exporter.port, token="s3cret"), exporter.stats())
+        finally:
+            await exporter.stop()
+
+    no_token, wrong_token, right_token, stats = asyncio.run(scenario())
+
+    assert no_token[0] == 401 and wrong_token[0] == 401
+    assert right_token[0] == 200
+    assert stats["rejected_total"] == 2 and stats["scrapes_total"] == 1
+
+
+def test_each_worker_claims_its_own_port():
+    async def scenario():
+        base_port = free_port_range(2)
+        workers = [WorkerMetricsExporter("127.0.0.1", base_port, 2) for _ in range(3)]
+        for worker in workers:
+            await worker.start()
+        try:
+            return base_port, [worker.port for worker in workers]
+        finally:
+            for worker in workers:
+                await worker.stop()
+
+    base_port, ports = asyncio.run(scenario())
+
+    # The third worker finds the range full and exports nothing.
+    assert ports == [base_port, base_port + 1, None]
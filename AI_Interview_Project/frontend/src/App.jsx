@@ -5,6 +5,10 @@ import SequentialCandidateInfoCollector from './components/SequentialCandidateIn
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api/v1';
 
+// The final assessment is produced by a background job; poll its status endpoint.
+const ASSESSMENT_POLL_INTERVAL_MS = 3000;
+const ASSESSMENT_POLL_MAX_ATTEMPTS = 100;
+
 const defaultLang = 'vi';
 const translations = {
   vi: {
@@ -170,6 +174,7 @@ function App() {
   const [currentLang, setCurrentLang] = useState(defaultLang);
   const [interviewLifecycleStatus, setInterviewLifecycleStatus] = useState('pending_start');
   const [fieldsToChoose, setFieldsToChoose] = useState([]);
+  const [isAwaitingAssessment, setIsAwaitingAssessment] = useState(false);
 
   const messagesEndRef = useRef(null);
   const textareaRef = useRef(null);
@@ -191,6 +196,48 @@ function App() {
   useEffect(scrollToBottom, [messages, finalAssessment, interviewLifecycleStatus]);
   useEffect(adjustTextareaHeight, [userInput]);
 
+  useEffect(() => {
+    if (!isAwaitingAssessment || !interviewId) return;
+    let cancelled = false;
+    let timerId = null;
+    let attempts = 0;
+
+    const pollAssessment = async () => {
+      attempts += 1;
+      try {
+        const response = await axios.get(`${API_BASE_URL}/interviews/${interviewId}/assessment`);
+        if (cancelled) return;
+        const { is_final_assessment_ready, final_assessment: apiFinalAssessment } = response.data;
+        if (is_final_assessment_ready) {
+          setIsAwaitingAssessment(false);
+          if (apiFinalAssessment) {
+            setFinalAssessment(apiFinalAssessment);
+            addMessageWithAnimation({ type: 'info', text: t('interviewEndedAssessment', currentLang, apiFinalAssessment.status) });
+          } else {
+            addMessageWithAnimation({ type: 'error', text: t('errorReceivingFinalAssessment', currentLang) });
+          }
+          return;
+        }
+      } catch (error) {
+        // Transient errors are retried like a not-ready response.
+        console.error("Error polling final assessment:", error.response?.data || error.message);
+        if (cancelled) return;
+      }
+      if (attempts >= ASSESSMENT_POLL_MAX_ATTEMPTS) {
+        setIsAwaitingAssessment(false);
+        addMessageWithAnimation({ type: 'error', text: t('errorReceivingFinalAssessment', currentLang) });
+        return;
+      }
+      timerId = setTimeout(pollAssessment, ASSESSMENT_POLL_INTERVAL_MS);
+    };
+
+    timerId = setTimeout(pollAssessment, ASSESSMENT_POLL_INTERVAL_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timerId);
+    };
+  }, [isAwaitingAssessment, interviewId]);
+
   const addMessageWithAnimation = (newMessageContent) => {
     const messageWithAppearance = { ...newMessageContent, id: Date.now() + Math.random(), appeared: false };
     setMessages(prev => [...prev, messageWithAppearance]);
@@ -239,6 +286,7 @@ function App() {
         addMessageWithAnimation({ type: 'info', text: `${t('allQuestionsCompleted', currentLang)} ${t('waitingForFinalAssessment', currentLang)}` });
         setIsInterviewFinished(true);
         setCurrentQuestion(null);
+        setIsAwaitingAssessment(true);
     } else if (!next_question && newStatus !== "awaiting_specialization" && newStatus !== "completed" && newStatus !== "info_submitted" && newStatus !== "pending_start") {
         addMessageWithAnimation({ type: 'info', text: t('allQuestionsCompleted', currentLang) });
         setIsInterviewFinished(true);
@@ -252,6 +300,7 @@ function App() {
     setCurrentQuestion(null);
     setIsInterviewFinished(false);
     setFinalAssessment(null);
+    setIsAwaitingAssessment(false);
     setUserInput('');
     setFieldsToChoose([]);
     try {
@@ -334,6 +383,7 @@ function App() {
     setIsInterviewFinished(false);
     setInterviewId(null);
     setFinalAssessment(null);
+    setIsAwaitingAssessment(false);
     setUserInput('');
     setInterviewLifecycleStatus('pending_start');
     setFieldsToChoose([]);